@@ -1,3 +1,4 @@
+import io
 import os
 import json
 import datetime
@@ -6,11 +7,61 @@ from pathlib import Path
 import subprocess
 import shutil
 import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from utils.doc_writer import MarkdownWriter
+from utils.fragment_cache import FragmentCache, FRAGMENT_CACHE_DIRNAME, content_key
+from utils.markdown_generator import iter_markdown_sections
+from utils.repo_index import RepoIndex
+from utils.repo_stats import compute_repo_stats
+
+# Fragment cache namespace of converted HTML sections
+HTML_CHUNK_NAMESPACE = "html_chunks"
+# Documents with fewer sections are converted in-process: starting a
+# process pool costs more than converting a handful of sections
+PARALLEL_HTML_MIN_SECTIONS = 16
+
+# The HTML page around the converted sections
+HTML_PAGE_HEAD = """
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>C.O.R.I.A.N - Comprehensive Documentation</title>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <style>
+                    body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; margin: 0 auto; padding: 20px; max-width: 1200px; }
+                    code { background: #f4f4f4; padding: 2px 6px; border-radius: 3px; font-family: "Courier New", Courier, monospace; }
+                    pre { background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }
+                    table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+                    th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+                    th { background-color: #f2f2f2; }
+                    details { background: #fafafa; border: 1px solid #eee; border-radius: 5px; margin: 10px 0; }
+                    summary { padding: 10px; font-weight: bold; cursor: pointer; }
+                    pre, .git-info { background: #e8f4f8; padding: 15px; border-radius: 5px; margin: 10px 0; }
+                </style>
+            </head>
+            <body>
+                """
+HTML_PAGE_TAIL = """
+            </body>
+            </html>
+            """
+
+def markdown_to_html(markdown_text):
+    """Convert one markdown section to HTML (also run in worker processes)"""
+    return markdown.markdown(markdown_text, extensions=['tables', 'fenced_code'])
 
 class GitIntegratedDocumentationSaver:
     def __init__(self, output_dir="documentation_output"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        # Vendored trees left out of the structure listing: {path: reason}
+        self.skipped_dirs = {}
+        # Fragments rendered by earlier runs into this folder, keyed by their inputs
+        self.fragments = FragmentCache(str(self.output_dir / f".{FRAGMENT_CACHE_DIRNAME}"))
         print(f"📚 Documentation output directory set to: {self.output_dir.resolve()}")
 
     def extract_git_documentation(self, repo_path):
@@ -163,46 +214,104 @@ class GitIntegratedDocumentationSaver:
             print(f"❌ Failed to save markdown: {e}")
             return None
 
-    def save_html_documentation(self, markdown_content, filename="comprehensive_documentation.html"):
-        """Convert markdown to HTML and save"""
+    def write_markdown_documentation(self, enhanced_results, filename="comprehensive_documentation.md"):
+        """Stream comprehensive documentation to markdown, section by section"""
+        filepath = self.output_dir / filename
+        
         try:
-            html_content = markdown.markdown(markdown_content, extensions=['tables', 'fenced_code'])
-            
-            full_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>C.O.R.I.A.N - Comprehensive Documentation</title>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <style>
-                    body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; margin: 0 auto; padding: 20px; max-width: 1200px; }}
-                    code {{ background: #f4f4f4; padding: 2px 6px; border-radius: 3px; font-family: "Courier New", Courier, monospace; }}
-                    pre {{ background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }}
-                    table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-                    th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-                    th {{ background-color: #f2f2f2; }}
-                    details {{ background: #fafafa; border: 1px solid #eee; border-radius: 5px; margin: 10px 0; }}
-                    summary {{ padding: 10px; font-weight: bold; cursor: pointer; }}
-                    pre, .git-info {{ background: #e8f4f8; padding: 15px; border-radius: 5px; margin: 10px 0; }}
-                </style>
-            </head>
-            <body>
-                {html_content}
-            </body>
-            </html>
-            """
-            
+            # The timestamp only moves when the inputs change, so an
+            # unchanged repository regenerates identical bytes
+            generated_on = self.fragments.render(
+                "generated_on", enhanced_results,
+                datetime.datetime.now().strftime, '%Y-%m-%d %H:%M:%S'
+            )
+            with MarkdownWriter(filepath) as out:
+                write_comprehensive_documentation(enhanced_results, out, generated_on)
+            if out.changed:
+                print(f"✅ Comprehensive documentation saved to: {filepath}")
+            else:
+                print(f"✅ Comprehensive documentation unchanged: {filepath}")
+            return filepath
+        except Exception as e:
+            print(f"❌ Failed to save markdown: {e}")
+            return None
+
+    def save_html_documentation(self, markdown_source, filename="comprehensive_documentation.html", max_workers=None):
+        """
+        Convert markdown to HTML and save, section by section.
+
+        `markdown_source` is the markdown text or the path of a markdown
+        file, which is then read lazily. Each section (split at headings,
+        see iter_markdown_sections) is converted on its own: sections
+        converted before come from the fragment cache by their hash, the
+        rest are converted in parallel by worker processes (in-process
+        for short documents or max_workers=1), and the HTML is streamed
+        into the page template in document order.
+        """
+        try:
+            if isinstance(markdown_source, str):
+                source = io.StringIO(markdown_source)
+            else:
+                source = open(markdown_source, 'r', encoding='utf-8')
             filepath = self.output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(full_html)
+            with source, MarkdownWriter(filepath) as out:
+                out.write(HTML_PAGE_HEAD)
+                for i, html in enumerate(self._iter_html_sections(iter_markdown_sections(source), max_workers)):
+                    out.write("\n" if i else "", html)
+                out.write(HTML_PAGE_TAIL)
             
-            print(f"✅ HTML documentation saved to: {filepath}")
+            if out.changed:
+                print(f"✅ HTML documentation saved to: {filepath}")
+            else:
+                print(f"✅ HTML documentation unchanged: {filepath}")
             return filepath
         except Exception as e:
             print(f"❌ Failed to save HTML: {e}")
             return None
 
+    def _iter_html_sections(self, sections, max_workers=None):
+        """
+        Yield the HTML of each markdown section in order. Short documents
+        (fewer than PARALLEL_HTML_MIN_SECTIONS sections) are converted
+        in-process; otherwise a process pool is started on the first cache
+        miss, with about two sections per worker in flight.
+        """
+        workers = max_workers or os.cpu_count() or 1
+        sections = iter(sections)
+        head = list(islice(sections, PARALLEL_HTML_MIN_SECTIONS))
+        if len(head) < PARALLEL_HTML_MIN_SECTIONS:
+            workers = 1
+        executor = None
+        pending = deque()
+
+        def emit(key, html):
+            # Converted sections are stored as they are written
+            if not isinstance(html, str):
+                html = html.result()
+                self.fragments.put(HTML_CHUNK_NAMESPACE, key, html)
+            return html
+
+        try:
+            for section in chain(head, sections):
+                key = content_key(section)
+                html = self.fragments.get(HTML_CHUNK_NAMESPACE, key)
+                if html is None:
+                    if workers > 1:
+                        if executor is None:
+                            executor = ProcessPoolExecutor(max_workers=workers)
+                        html = executor.submit(markdown_to_html, section)
+                    else:
+                        html = markdown_to_html(section)
+                        self.fragments.put(HTML_CHUNK_NAMESPACE, key, html)
+                pending.append((key, html))
+                if len(pending) >= 2 * workers:
+                    yield emit(*pending.popleft())
+            while pending:
+                yield emit(*pending.popleft())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
     def save_json_metadata(self, enhanced_results, filename="enhanced_analysis_metadata.json"):
         """Save enhanced analysis metadata as JSON"""
         try:
@@ -228,14 +337,13 @@ class GitIntegratedDocumentationSaver:
             print(f"❌ Failed to save JSON metadata: {e}")
             return None
 
-    def save_repository_structure(self, repo_path, filename="repository_structure.txt"):
-        """Save repository file structure"""
+    def save_repository_structure(self, repo_path, filename="repository_structure.txt", index=None):
+        """Save repository file structure, streaming it line by line"""
         try:
-            structure = self._get_repository_structure(repo_path)
-            
             filepath = self.output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(structure)
+            with MarkdownWriter(filepath) as f:
+                for i, line in enumerate(self._iter_repository_structure(repo_path, index)):
+                    f.write(f"\n{line}" if i else line)
             
             print(f"✅ Repository structure saved to: {filepath}")
             return filepath
@@ -286,48 +394,44 @@ Open `comprehensive_documentation.html` in your browser for the best reading exp
             print(f"❌ Failed to save output README: {e}")
             return None
 
-    def _get_repository_structure(self, startpath):
+    def _get_repository_structure(self, startpath, index=None):
         """Generate directory structure string"""
-        structure = []
-        startpath = Path(startpath)
-        
-        # Use Path.glob for a more modern and robust iteration
-        for path in sorted(startpath.rglob('*')):
-            # Skip .git and other common ignored directories
-            if any(part.startswith('.') for part in path.parts) or \
-               '__pycache__' in path.parts or \
-               'node_modules' in path.parts:
-                continue
-                
-            if path.is_dir():
-                level = len(path.relative_to(startpath).parts)
-                indent = '  ' * (level - 1)
-                structure.append(f"{indent}📂 {path.name}/")
-            elif path.is_file():
-                level = len(path.relative_to(startpath).parts)
-                indent = '  ' * (level - 1)
-                structure.append(f"{indent}📄 {path.name}")
-                
-        # A simpler os.walk version (as you had)
-        # for root, dirs, files in os.walk(startpath):
-        #     # Skip .git directory and other common ignores
-        #     dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
-        #     files = [f for f in files if not f.startswith('.')]
-            
-        #     if '.git' in root.split(os.sep):
-        #         continue
-                
-        #     level = root.replace(str(startpath), '').count(os.sep)
-        #     indent = ' ' * 2 * level
-        #     structure.append(f"{indent}📂 {os.path.basename(root)}/")
-        #     subindent = ' ' * 2 * (level + 1)
-        #     for file in files:
-        #         structure.append(f"{subindent}📄 {file}")
-        
-        return '\n'.join(structure)
+        return '\n'.join(self._iter_repository_structure(startpath, index))
+
+    def _iter_repository_structure(self, startpath, index=None):
+        """
+        Yield the directory structure one line at a time.
+
+        Depth-first over the job's RepoIndex (built here without reading
+        file contents if none is given), entries sorted by name within
+        each directory. The index already leaves out what the shared
+        IgnoreMatcher ignores (built-in sets and .gitignore rules) and
+        vendored trees, which are recorded in self.skipped_dirs.
+        """
+        if index is None:
+            index = RepoIndex.build(str(startpath), read_contents=False)
+        self.skipped_dirs.update(index.skipped)
+        for entry, level in index.iter_tree():
+            indent = '  ' * level
+            if entry['kind'] == 'folder':
+                yield f"{indent}📂 {entry['name']}/"
+            else:
+                yield f"{indent}📄 {entry['name']}"
 
 def generate_comprehensive_documentation(enhanced_results):
     """Generate documentation combining analysis and Git data"""
+    buffer = io.StringIO()
+    write_comprehensive_documentation(enhanced_results, buffer)
+    return buffer.getvalue()
+
+def write_comprehensive_documentation(enhanced_results, out, generated_on=None):
+    """
+    Stream the documentation combining analysis and Git data, section by
+    section, to `out` (a MarkdownWriter or any text stream), so the
+    document is never built as one string. `generated_on` defaults to now.
+    """
+    if generated_on is None:
+        generated_on = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     git_info = enhanced_results.get('git_documentation', {})
     analysis_data = enhanced_results.get('analysis_data', {})
@@ -344,6 +448,22 @@ def generate_comprehensive_documentation(enhanced_results):
             lines.append(f"| {commit['hash']} | {commit['author']} | {commit['date']} | {message} |")
         return "\n".join(lines) + "\n"
 
+    # Helper to format per-language totals into a markdown table
+    def format_languages(languages):
+        if not languages:
+            return "No language statistics available.\n"
+        lines = ["| Language | Files | Lines | Bytes |",
+                 "|---|---|---|---|"]
+        for language, totals in languages.items():
+            lines.append(f"| {language} | {totals['files']:,} | {totals['lines']:,} | {totals['bytes']:,} |")
+        return "\n".join(lines) + "\n"
+
+    # Helper to list the vendored trees the statistics scan pruned
+    def format_skipped(skipped):
+        if not skipped:
+            return "None"
+        return ", ".join(f"`{path}` ({reason})" for path, reason in skipped.items())
+
     # Helper to format file stats into a markdown table
     def format_file_stats(stats):
         if not stats:
@@ -354,16 +474,22 @@ def generate_comprehensive_documentation(enhanced_results):
             lines.append(f"| `{file}` | {count} |")
         return "\n".join(lines) + "\n"
 
-    documentation = f"""
+    out.write(f"""
 # C.O.R.I.A.N - Comprehensive Documentation
-Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {generated_on}
 
 ## 1. Project Overview
 {analysis_data.get('component_summary', 'No component summary available.')}
 
 ### Analysis Summary
-- **Total Files Analyzed (Mock Data):** {analysis_data.get('file_count', 'N/A')}
-- **File Types (Mock Data):** `{json.dumps(analysis_data.get('file_types', {}))}`
+- **Total Files Analyzed:** {analysis_data.get('file_count', 'N/A')}
+- **Total Lines:** {analysis_data.get('total_lines', 'N/A')}
+- **File Types:** `{json.dumps(analysis_data.get('file_types', {}))}`
+- **Skipped Vendored Directories:** {format_skipped(analysis_data.get('skipped', {}))}
+
+""")
+    out.write(format_languages(analysis_data.get('languages', {})))
+    out.write("""
 
 ## 2. Repository Information
 
@@ -372,15 +498,21 @@ Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 <summary>Click to expand/collapse README</summary>
 
 ```
-{git_info.get('readme', 'No README found.')}
+""")
+    out.write(git_info.get('readme', 'No README found.'))
+    out.write("""
 ```
 </details>
 
 ### 2.2. Recent Commits
-{format_commits(git_info.get('recent_commits', []))}
+""")
+    out.write(format_commits(git_info.get('recent_commits', [])))
+    out.write("""
 
 ### 2.3. Most Active Files (Last Year)
-{format_file_stats(git_info.get('file_statistics', {}))}
+""")
+    out.write(format_file_stats(git_info.get('file_statistics', {})))
+    out.write(f"""
 
 ### 2.4. Branches
 <pre>
@@ -392,18 +524,21 @@ Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {git_info.get('tags', 'No tags found.')}
 </pre>
 
-## 3. Code Structure (Mock Data)
-This structure is from the mock analysis data, not the full repository scan.
+## 3. Code Structure
+Files, lines and bytes per top-level folder ("." is the repository root).
 <pre>
-{json.dumps(analysis_data.get('structure', {}), indent=2)}
+""")
+    json.dump(analysis_data.get('structure', {}), out, indent=2)
+    out.write("""
 </pre>
-"""
-    return documentation
+""")
 
-def save_results_pipeline(analysis_results, repo_path, output_dir="documentation_output"):
+def save_results_pipeline(analysis_results, repo_path, output_dir="documentation_output", index=None):
     """
     Runs the full documentation extraction and saving pipeline.
     This function was created to fix the original script.
+    Pass the RepoIndex the statistics were computed from as `index` so
+    the checkout is not walked again for the structure listing.
     """
     print(f"🚀 Starting documentation pipeline for repo at {repo_path}")
     print(f"📦 Output will be saved to {output_dir}")
@@ -423,21 +558,20 @@ def save_results_pipeline(analysis_results, repo_path, output_dir="documentation
         "git_documentation": git_info
     }
     
-    # 3. Generate comprehensive markdown
+    # 3. Stream comprehensive markdown straight to its file
     print("📝 Generating comprehensive markdown...")
-    comprehensive_md = generate_comprehensive_documentation(enhanced_results)
+    md_path = saver.write_markdown_documentation(enhanced_results)
     
     # 4. Save all artifacts
-    md_path = saver.save_markdown_documentation(comprehensive_md)
-    html_path = saver.save_html_documentation(comprehensive_md)
+    html_path = saver.save_html_documentation(md_path) if md_path else None
     meta_path = saver.save_json_metadata(enhanced_results)
-    struct_path = saver.save_repository_structure(repo_path)
+    struct_path = saver.save_repository_structure(repo_path, index=index)
     readme_path = saver.create_readme()
     
     # 5. Save raw git_info (as mentioned in create_readme)
     git_meta_path = saver.output_dir / "git_metadata.json"
     try:
-        with open(git_meta_path, 'w', encoding='utf-8') as f:
+        with MarkdownWriter(git_meta_path) as f:
             json.dump(git_info, f, indent=2, default=str)
         print(f"✅ Raw Git metadata saved to: {git_meta_path}")
     except Exception as e:
@@ -449,6 +583,7 @@ def save_results_pipeline(analysis_results, repo_path, output_dir="documentation
         "status": "Success",
         "repository_path": str(repo_path),
         "output_directory": str(saver.output_dir),
+        "skipped_vendored_dirs": saver.skipped_dirs,
         "files_generated": [
             str(p) for p in [md_path, html_path, meta_path, struct_path, readme_path, git_meta_path] if p
         ]
@@ -461,6 +596,8 @@ def save_results_pipeline(analysis_results, repo_path, output_dir="documentation
     except Exception as e:
         print(f"❌ Failed to save generation summary: {e}")
 
+    # Drop fragments no artifact of this run used
+    saver.fragments.prune()
     return summary
 
 def complete_pipeline_with_git():
@@ -468,32 +605,23 @@ def complete_pipeline_with_git():
     Example of complete pipeline with Git integration
     """
     # Your previous pipeline steps would go here...
-    # For demonstration, let's create mock analysis results
-    
-    analysis_results = {
-        'analysis_data': {
-            'file_count': 42,
-            'file_types': {'Python': 15, 'Markdown': 5, 'Other': 22},
-            'structure': {
-                'src': ['main.py', 'utils.py'],
-                'tests': ['test_main.py'],
-                'docs': ['README.md']
-            },
-            'component_summary': 'Core application with utility modules and tests. (This is mock data)'
-        },
-        'documentation': 'Auto-generated documentation content...'
-    }
-    
-
     repo_path = "/home/blackheart03/codebase_genius_collete/C.O.R.I.A.N" 
     print("="*50)
     print(f"⚠️  WARNING: Using current directory as repo_path: {os.path.abspath(repo_path)}")
     print("⚠️  Please update 'repo_path' in complete_pipeline_with_git() to your target repository if this is incorrect.")
     print("="*50)
+
+    # Real statistics from one indexed scan of the checkout, which the
+    # structure listing reuses
+    index = RepoIndex.build(repo_path)
+    analysis_results = {
+        'analysis_data': compute_repo_stats(repo_path, index=index),
+        'documentation': 'Auto-generated documentation content...'
+    }
     
     # Step 5: Save Results with Git integration
     try:
-        save_summary = save_results_pipeline(analysis_results, repo_path, "C.O.R.I.A.N_documentation")
+        save_summary = save_results_pipeline(analysis_results, repo_path, "C.O.R.I.A.N_documentation", index=index)
         if save_summary:
             print("🎉 Pipeline completed successfully!")
             print(json.dumps(save_summary, indent=2))
@@ -16,6 +16,11 @@ import base64
 import random
 from PIL import Image
 import io
+import sys
+
+# Share the backend's traversal rules (utils/ lives one level up)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.repo_index import RepoIndex
 
 # --- Language Translation Dictionary ---
 LANG_TEXT = {
@@ -290,6 +295,7 @@ def process_repository_real(repo_url, use_ai=True):
     repo_name = repo_url.split('/')[-1]
     temp_dir = tempfile.mkdtemp()
     files_data = []
+    skipped_dirs = {}
     
     try:
         # Ultra-fast shallow clone
@@ -300,21 +306,17 @@ def process_repository_real(repo_url, use_ai=True):
             single_branch=True
         )
         
-        # Collect all file paths first (except .git directory)
-        file_paths = []
-        for root, dirs, files in os.walk(temp_dir):
-            # Only skip .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
-                
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, temp_dir)
-                ext = Path(file).suffix.lower()
-                file_paths.append((file_path, relative_path, ext))
+        # One indexed walk of the clone, skipping what the shared matcher
+        # ignores (.git, .gitignore'd paths, ...) and vendored trees
+        index = RepoIndex.build(temp_dir, read_contents=False)
+        skipped_dirs.update(index.skipped)
+
+        def iter_file_paths():
+            for entry in index.files:
+                yield (entry['path'], index.relative(entry['path']), entry['extension'].lower())
         
         # Process files in parallel using ThreadPoolExecutor for speed
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
         
         def read_file(file_path, relative_path, ext):
             file_info = {
@@ -359,14 +361,14 @@ def process_repository_real(repo_url, use_ai=True):
                     file_info['content'] = f"[Error reading video: {e}]"
             else:
                 try:
-                    # Fast reading with buffering
+                    # Read the bytes once and decode from the same buffer
+                    with open(file_path, 'rb') as f:
+                        raw = f.read()
                     try:
-                        with open(file_path, 'r', encoding='utf-8', buffering=8192) as f:
-                            file_info["content"] = f.read()
+                        file_info["content"] = raw.decode('utf-8')
                     except UnicodeDecodeError:
                         try:
-                            with open(file_path, 'r', encoding='latin-1', buffering=8192) as f:
-                                file_info["content"] = f.read()
+                            file_info["content"] = raw.decode('latin-1')
                         except:
                             file_info["content"] = "[Binary file or non-UTF-8 content skipped]"
                     
@@ -381,20 +383,12 @@ def process_repository_real(repo_url, use_ai=True):
             
             return file_info
         
-        # Use aggressive parallel processing (up to 64 threads for faster I/O)
-        max_workers = min(64, len(file_paths)) if file_paths else 1
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all files for processing
-            futures = {executor.submit(read_file, fp, rp, ext): (fp, rp, ext) 
-                      for fp, rp, ext in file_paths}
-            
-            # Collect results as they complete
-            for future in as_completed(futures):
+        def collect(done, futures):
+            for future in done:
+                fp, rp, ext = futures.pop(future)
                 try:
-                    file_info = future.result()
-                    files_data.append(file_info)
+                    files_data.append(future.result())
                 except Exception as e:
-                    fp, rp, ext = futures[future]
                     files_data.append({
                         "path": rp,
                         "content": f"[Error processing file: {e}]",
@@ -404,6 +398,23 @@ def process_repository_real(repo_url, use_ai=True):
                         "metadata": {}
                     })
         
+        # Use aggressive parallel processing (up to 64 threads for faster I/O),
+        # but keep only a bounded window of reads in flight so pending
+        # buffers do not pile up on large repositories
+        max_workers = 64
+        max_in_flight = max_workers * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for fp, rp, ext in iter_file_paths():
+                if len(futures) >= max_in_flight:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    collect(done, futures)
+                futures[executor.submit(read_file, fp, rp, ext)] = (fp, rp, ext)
+            
+            # Collect the remaining results
+            done, _ = wait(futures)
+            collect(done, futures)
+        
         # Sort files by path for consistent ordering
         files_data.sort(key=lambda x: x['path'])
         
@@ -412,6 +423,7 @@ def process_repository_real(repo_url, use_ai=True):
             'repo_url': repo_url,
             'repo_name': repo_name,
             'files': files_data, 
+            'skipped_dirs': skipped_dirs,
             'analysis_time': round(time.time() - start_time, 1)
         }
 
@@ -519,6 +531,12 @@ def show_instant_documentation():
         with col3:
             st.metric("🎥 Videos", video_count)
         
+        if repo_data.get('skipped_dirs'):
+            st.caption(
+                f"Skipped {len(repo_data['skipped_dirs'])} vendored directories: " +
+                ", ".join(f"{path} ({reason})" for path, reason in sorted(repo_data['skipped_dirs'].items()))
+            )
+        
         st.markdown("---")
         st.markdown(f"### {texts['doc_display_content']} ({len(repo_data['files'])} files)")
         
@@ -32,8 +32,14 @@ def run_jac_agent(agent_file, env_vars=None):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-def generate_documentation(github_url, use_llm=True):
-    """Main pipeline orchestrator - replaces main.jac walker"""
+def generate_documentation(github_url, use_llm=True, parse_mode="full", graph_mode="nodes"):
+    """Main pipeline orchestrator - replaces main.jac walker
+    
+    parse_mode is "full" (with call graphs) or "outline" (signatures and
+    docstrings only, much faster on huge repositories).
+    graph_mode is "nodes" (one graph node per symbol) or "hybrid" (symbols
+    in per-file element tables, only cross-file relationships as edges).
+    """
     print("🚀 Starting Codebase Genius Pipeline...")
     
     # Extract repo name
@@ -47,7 +53,8 @@ def generate_documentation(github_url, use_llm=True):
     print("📁 Step 1/5: Repository Mapping...")
     map_result = run_jac_agent(
         "repo_mapper.jac",
-        {"GITHUB_URL": github_url, "REPO_NAME": repo_name, "USE_LLM": str(use_llm).lower()}
+        {"GITHUB_URL": github_url, "REPO_NAME": repo_name, "USE_LLM": str(use_llm).lower(),
+         "PARSE_MODE": parse_mode, "GRAPH_MODE": graph_mode}
     )
     
     if not map_result["success"]:
@@ -57,7 +64,8 @@ def generate_documentation(github_url, use_llm=True):
     print("🔍 Step 2/5: Code Analysis...")
     analysis_result = run_jac_agent(
         "code_analyzer.jac", 
-        {"GITHUB_URL": github_url, "REPO_NAME": repo_name, "USE_LLM": str(use_llm).lower()}
+        {"GITHUB_URL": github_url, "REPO_NAME": repo_name, "USE_LLM": str(use_llm).lower(),
+         "PARSE_MODE": parse_mode, "GRAPH_MODE": graph_mode}
     )
     
     if not analysis_result["success"]:
@@ -67,7 +75,8 @@ def generate_documentation(github_url, use_llm=True):
     print("📝 Step 3/5: Documentation Generation...")
     doc_result = run_jac_agent(
         "doc_genie.jac",
-        {"GITHUB_URL": github_url, "REPO_NAME": repo_name, "USE_LLM": str(use_llm).lower()}
+        {"GITHUB_URL": github_url, "REPO_NAME": repo_name, "USE_LLM": str(use_llm).lower(),
+         "GRAPH_MODE": graph_mode}
     )
     
     if not doc_result["success"]:
@@ -91,8 +100,10 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         github_url = sys.argv[1]
         use_llm = len(sys.argv) > 2 and sys.argv[2].lower() == "true"
-        result = generate_documentation(github_url, use_llm)
+        parse_mode = sys.argv[3] if len(sys.argv) > 3 else "full"
+        graph_mode = sys.argv[4] if len(sys.argv) > 4 else "nodes"
+        result = generate_documentation(github_url, use_llm, parse_mode, graph_mode)
         print(json.dumps(result, indent=2))
     else:
-        print("Usage: python main.py <github_url> [use_llm]")
+        print("Usage: python main.py <github_url> [use_llm] [full|outline] [nodes|hybrid]")
         print("Example: python main.py https://github.com/username/repo true")
\ No newline at end of file
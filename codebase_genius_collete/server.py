@@ -90,15 +90,16 @@ def generate_documentation_pipeline(github_url, use_llm=True):
         # Import our working pipeline
         try:
             from documentation_pipeline import complete_pipeline_with_git, save_results_pipeline
+            from utils.repo_index import RepoIndex
+            from utils.repo_stats import compute_repo_stats
             
-            # Create analysis results
+            # Create analysis results from one indexed scan of the clone,
+            # shared with the structure listing
+            index = RepoIndex.build(repo_path)
+            analysis_data = compute_repo_stats(repo_path, index=index)
+            analysis_data['component_summary'] = f"Documentation for {repo_name}: {analysis_data['component_summary']}"
             analysis_results = {
-                'analysis_data': {
-                    'file_count': 0,  # Will be filled by pipeline
-                    'file_types': {},
-                    'structure': {},
-                    'component_summary': f'Documentation for {repo_name}'
-                },
+                'analysis_data': analysis_data,
                 'documentation': f'# {repo_name}\n\nGenerated documentation'
             }
             
@@ -110,7 +111,8 @@ def generate_documentation_pipeline(github_url, use_llm=True):
             save_summary = save_results_pipeline(
                 analysis_results, 
                 repo_path, 
-                f"C.O.R.I.A.N_documentation_{repo_name}"
+                f"C.O.R.I.A.N_documentation_{repo_name}",
+                index=index
             )
             
             if save_summary:
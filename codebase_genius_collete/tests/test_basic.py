@@ -23,6 +23,7 @@ sys.path.insert(0, str(ROOT_DIR))
 from utils.error_handler import is_valid_github_url, handle_clone_error
 from utils.readme_parser import find_readme, summarize_readme
 from utils.python_parser import parse_file_by_extension, build_code_context_graph
+from utils.ccg import ColumnarCCG, build_columnar_ccg, NONE_ID, EDGE_CALLS, EDGE_INHERITS
 
 # --- Mock File System ---
 # We use pytest 'fixtures' to create temporary files for our tests
@@ -146,6 +147,69 @@ def test_python_parser(temp_py_file):
     assert data['relationships'][1]['type'] == 'calls'
     print("  ✓ Python Parser tests passed.")
 
+def test_python_parser_outline(temp_py_file):
+    """Tests outline mode: same signatures and docstrings, no call graph."""
+    print("\nTesting Python Parser (outline mode)...")
+    
+    full = parse_file_by_extension(temp_py_file)
+    outline = parse_file_by_extension(temp_py_file, mode="outline")
+    
+    assert outline['mode'] == "outline"
+    assert [f['name'] for f in outline['functions']] == [f['name'] for f in full['functions']]
+    assert outline['classes'] == full['classes']
+    assert outline['imports'] == full['imports']
+    assert all(f['calls'] == [] for f in outline['functions']), "Bodies should not be visited"
+    assert [r['type'] for r in outline['relationships']] == ['inherits']
+    assert 'error' in parse_file_by_extension(temp_py_file, mode="bogus")
+    print("  ✓ Outline parser tests passed.")
+
+def test_python_parser_fallbacks(tmp_path, monkeypatch):
+    """Tests binary/generated/oversized detection and the parse budgets."""
+    print("\nTesting parser fallbacks...")
+    import time
+    import utils.python_parser as python_parser
+    
+    binary = tmp_path / "blob.py"
+    binary.write_bytes(b"\x00\x01\x02" * 10)
+    assert 'error' in parse_file_by_extension(str(binary))
+    
+    generated = tmp_path / "service_pb2.py"
+    generated.write_text("# Generated by the protocol buffer compiler.  DO NOT EDIT!\ndef f():\n    g()\n")
+    data = parse_file_by_extension(str(generated))
+    assert data['fallback'] == "generated" and data['functions'][0]['calls'] == []
+    
+    source = "class Big(Base):\n    def method(self, a, b=1):\n        helper()\n\ndef top(x: int):\n    pass\n"
+    big = tmp_path / "big.py"
+    big.write_text(source)
+    monkeypatch.setattr(python_parser, "MAX_SOURCE_BYTES", 10)
+    data = parse_file_by_extension(str(big))
+    assert data['fallback'] == "oversized"
+    assert [(f['name'], f['params'], f.get('parent_class')) for f in data['functions']] == \
+        [("method", ["self", "a", "b"], "Big"), ("top", ["x"], None)]
+    assert data['classes'][0]['bases'] == ["Base"]
+    assert [f['line'] for f in data['functions']] == [2, 5] and data['classes'][0]['line'] == 1
+    
+    # The outline scan stays linear: 40k defs in well under a second
+    huge = tmp_path / "huge.py"
+    huge.write_text("".join(f"def f{i}(a):\n    return a\n\n" for i in range(40000)))
+    start = time.perf_counter()
+    data = parse_file_by_extension(str(huge))
+    assert time.perf_counter() - start < 5.0
+    assert data['fallback'] == "oversized" and len(data['functions']) == 40000
+    assert data['functions'][-1]['line'] == 3 * 39999 + 1
+    
+    # MAX_SOURCE_BYTES alone decides whether ast.parse runs
+    monkeypatch.setattr(python_parser, "MAX_SOURCE_BYTES", len(source))
+    data = parse_file_by_extension(str(big))
+    assert 'fallback' not in data and data['mode'] == "full"
+    monkeypatch.setattr(python_parser, "MAX_SOURCE_BYTES", 1 << 20)
+    
+    monkeypatch.setattr(python_parser, "PARSE_NODE_BUDGET", 5)
+    data = parse_file_by_extension(str(big))
+    assert data['fallback'].startswith("node budget") and data['mode'] == "outline"
+    assert [f['name'] for f in data['functions']] == ["method", "top"]
+    print("  ✓ Parser fallback tests passed.")
+
 def test_jac_parser(temp_jac_file):
     """Tests the `parse_file_by_extension` for a .jac file."""
     print("\nTesting Jac Parser...")
@@ -165,6 +229,41 @@ def test_jac_parser(temp_jac_file):
     assert len(data['imports']) == 1, "Should find 1 import"
     print("  ✓ Jac Parser tests passed.")
 
+def test_jac_parser_nested_bodies(tmp_path):
+    """Tests that Jac bodies with nested braces keep correct nesting and lines."""
+    print("\nTesting Jac Parser nesting...")
+    
+    jac_content = """walker outer {
+    \"\"\"Walks things.\"\"\"
+    has seen: dict = {};
+    can visit with entry {
+        if here { std.out("}"); }
+    }
+    has count: int = 0;
+}
+
+can standalone {
+    report 1;
+}
+"""
+    jac_file = tmp_path / "nested.jac"
+    jac_file.write_text(jac_content)
+    
+    data = parse_file_by_extension(str(jac_file))
+    
+    walker = data['walkers'][0]
+    assert walker['docstring'] == "Walks things."
+    assert walker['attributes'] == ["seen: dict", "count: int"], "Should see 'has' after a nested body"
+    assert (walker['line'], walker['line_end']) == (1, 8)
+    
+    abilities = {a['name']: a for a in data['abilities']}
+    assert len(data['abilities']) == 2, "Each ability should be found exactly once"
+    assert abilities['visit']['parent_walker'] == "outer"
+    assert abilities['visit']['line'] == 4
+    assert abilities['standalone']['parent_walker'] is None
+    assert abilities['standalone']['line'] == 10
+    print("  ✓ Jac Parser nesting tests passed.")
+
 def test_unsupported_file_parser(tmp_path):
     """Tests the parser on an unsupported file type."""
     print("\nTesting Unsupported File Parser...")
@@ -195,3 +294,576 @@ def test_ccg_builder(temp_py_file, temp_jac_file):
     assert len(ccg['relationships']) == 2, "CCG should aggregate relationships"
     print("  ✓ CCG Builder tests passed.")
 
+def test_columnar_ccg(temp_py_file, temp_jac_file, tmp_path):
+    """Tests the columnar CCG container and its dict-compatible views."""
+    print("\nTesting Columnar CCG...")
+    
+    py_data = parse_file_by_extension(temp_py_file)
+    jac_data = parse_file_by_extension(temp_jac_file)
+    ccg = build_columnar_ccg([py_data, jac_data])
+    
+    assert "MyClass" in ccg['classes']
+    assert "my_walker" in ccg['walkers']
+    assert "nope" not in ccg['functions']
+    assert [f['name'] for f in ccg.get('functions', [])] == [f['name'] for f in py_data['functions']]
+    
+    greet = next(f for f in ccg['functions'] if f['name'] == "greet")
+    assert greet['parent_class'] == "MyClass"
+    assert greet['file_path'] == temp_py_file
+    assert greet['calls'] == [c for f in py_data['functions'] if f['name'] == "greet" for c in f['calls']]
+    assert len(list(ccg['relationships'])) == len(py_data['relationships'])
+    
+    # Round-trip through the on-disk layout
+    snapshot = tmp_path / "graph.ccg"
+    ccg.save(str(snapshot))
+    loaded = ColumnarCCG.load(str(snapshot))
+    assert list(loaded['functions']) == list(ccg['functions'])
+    assert list(loaded['imports']) == list(ccg['imports'])
+    print("  ✓ Columnar CCG tests passed.")
+
+def test_ccg_spawn_records(temp_py_file, temp_jac_file):
+    """Tests the batched node-constructor records used for bulk spawning."""
+    print("\nTesting CCG spawn records...")
+    from utils.ccg import KIND_CLASS, KIND_FUNCTION
+    
+    ccg = build_columnar_ccg([parse_file_by_extension(temp_py_file), parse_file_by_extension(temp_jac_file)])
+    records = ccg.spawn_records()
+    
+    by_name = {r[4]['name']: r for r in records}
+    assert by_name['MyClass'][1] == KIND_CLASS
+    assert by_name['greet'][1] == KIND_FUNCTION and by_name['greet'][2] == by_name['MyClass'][0]
+    assert by_name['greet'][4]['signature'] == "greet(self)" and by_name['greet'][4]['returns'] == "void"
+    assert "my_walker" in by_name and "my_node" in by_name
+    # Parents always come before their children
+    seen = set()
+    for symbol_id, _, parent_id, _, _ in records:
+        assert parent_id == NONE_ID or parent_id in seen
+        seen.add(symbol_id)
+    assert {r[3] for r in ccg.spawn_records([temp_jac_file])} == {temp_jac_file}
+    print("  ✓ Spawn record tests passed.")
+
+def test_ccg_graph_links(temp_py_file):
+    """Tests that `build_code_context_graph` resolves relationships into CSR adjacency."""
+    print("\nTesting CCG linking...")
+    
+    ccg = build_code_context_graph([parse_file_by_extension(temp_py_file)])
+    ids = {f['name']: f['id'] for f in ccg['functions']}
+    class_id = ccg['classes'][0]['id']
+    
+    # greet() calls self.other_func(), which MyClass does not define, and
+    # print() is a builtin: neither produces a calls edge
+    assert ccg.graph.neighbours(ids['greet']) == []
+    assert ccg.symbol_dict(ids['greet'])['calls'] == ["self.other_func"]
+    # MyClass defines its methods
+    assert sorted(ccg.graph.neighbours(class_id)) == sorted([ids['__init__'], ids['greet']])
+    # AnotherClass is not defined anywhere, so no inherits edge is created
+    assert ccg.graph.num_edges == 2
+    print("  ✓ CCG linking tests passed.")
+
+def test_ccg_import_resolution(tmp_path):
+    """Tests qualified names and import-aware call resolution across files."""
+    print("\nTesting import-aware CCG linking...")
+    
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from .core import run\n")
+    (pkg / "core.py").write_text(
+        "class Base:\n    def run(self):\n        pass\n\n"
+        "class Job(Base):\n    def start(self):\n        self.run()\n\n"
+        "def run():\n    items = []\n    items.append(1)\n    print(len(items))\n"
+    )
+    (tmp_path / "app.py").write_text(
+        "import pkg\nfrom pkg.core import Job as J\n\n"
+        "class Runner:\n    def run(self):\n        pkg.run()\n        J()\n        missing()\n"
+    )
+    paths = [str(tmp_path / "app.py"), str(pkg / "__init__.py"), str(pkg / "core.py")]
+    ccg = build_code_context_graph([parse_file_by_extension(p) for p in paths])
+    index = ccg.index
+    
+    core_run = index.lookup("pkg.core.run")
+    base_run = index.lookup("pkg.core.Base.run")
+    runner_run = index.lookup("app.Runner.run")
+    assert NONE_ID not in (core_run, base_run, runner_run)
+    assert core_run != base_run != runner_run
+    assert index.qualified_name(base_run) == "pkg.core.Base.run"
+    
+    # Builtins and calls on locals are dropped by the parser
+    assert ccg.symbol_dict(core_run)['calls'] == []
+    # pkg.run() goes through the package re-export; J() is an aliased class
+    assert sorted(ccg.graph.neighbours(runner_run, EDGE_CALLS)) == sorted([core_run, index.lookup("pkg.core.Job")])
+    # self.run() in Job resolves through the base class, not to a same-named function
+    assert ccg.graph.neighbours(index.lookup("pkg.core.Job.start"), EDGE_CALLS) == [base_run]
+    assert ccg.graph.neighbours(index.lookup("pkg.core.Job"), EDGE_INHERITS) == [index.lookup("pkg.core.Base")]
+    print("  ✓ Import-aware linking tests passed.")
+
+def test_incremental_update(tmp_path):
+    """Tests git-diff driven re-parsing and CCG patching against a full rebuild."""
+    print("\nTesting incremental CCG update...")
+    import subprocess
+    from utils.incremental import plan_incremental_update, save_analysis_state, load_analysis_state
+    from utils.ccg import update_ccg
+    
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    def git(*args):
+        subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args],
+                       cwd=repo, check=True, capture_output=True)
+    
+    (repo / "a.py").write_text("def helper():\n    pass\n\ndef main():\n    helper()\n")
+    (repo / "b.py").write_text("import a\n\ndef other():\n    a.helper()\n")
+    (repo / "c.py").write_text("def gone():\n    pass\n")
+    git('init', '-q')
+    git('add', '.')
+    git('commit', '-q', '-m', 'A')
+    
+    def parse_all():
+        return [parse_file_by_extension(str(p)) for p in sorted(repo.glob('*.py'))]
+    
+    state_root = str(tmp_path / "outputs")
+    save_analysis_state("repo", "url", plan_incremental_update(str(repo), {})['commit'],
+                        build_code_context_graph(parse_all()), root=state_root)
+    
+    # Commit B: move helper() from a.py to a new file and delete c.py;
+    # b.py is unchanged but a.helper now resolves through a's import
+    (repo / "a.py").write_text("from d import helper\n\ndef main():\n    helper()\n")
+    (repo / "d.py").write_text("def helper():\n    return 1\n")
+    (repo / "c.py").unlink()
+    git('add', '-A')
+    git('commit', '-q', '-m', 'B')
+    
+    state = load_analysis_state("repo", root=state_root)
+    plan = plan_incremental_update(str(repo), state)
+    assert plan['mode'] == "incremental"
+    assert sorted(os.path.basename(p) for p in plan['reparse']) == ["a.py", "d.py"]
+    assert [os.path.basename(p) for p in plan['removed']] == ["c.py"]
+    
+    ccg = ColumnarCCG.load(state['ccg_path'])
+    update_ccg(ccg, [parse_file_by_extension(p) for p in plan['reparse']], plan['removed'])
+    full = build_code_context_graph(parse_all())
+    
+    def named_edges(graph_ccg):
+        return sorted(
+            (graph_ccg.file_of(s), graph_ccg.name_of(s), graph_ccg.name_of(t), kind)
+            for s, t, kind in graph_ccg.graph.edges()
+        )
+    
+    assert named_edges(ccg) == named_edges(full)
+    assert (str(repo / "b.py"), "other", "helper", EDGE_CALLS) in named_edges(ccg)
+    assert "gone" not in ccg['functions']
+    print("  ✓ Incremental update tests passed.")
+
+def test_parse_pipeline(temp_py_file, temp_jac_file, tmp_path):
+    """Tests the streaming parse pipeline against the batch CCG builder."""
+    print("\nTesting streaming parse pipeline...")
+    from utils.parse_pipeline import iter_parsed_files, run_parse_pipeline, CCGBuilderConsumer, ParseStatsConsumer
+    
+    broken = tmp_path / "broken.py"
+    broken.write_text("def broken(:\n")
+    paths = [temp_py_file, temp_jac_file, str(broken)]
+    
+    results = run_parse_pipeline(
+        iter_parsed_files(p for p in paths),
+        {'ccg': CCGBuilderConsumer(), 'stats': ParseStatsConsumer()},
+        queue_size=1
+    )
+    full = build_code_context_graph([parse_file_by_extension(p) for p in paths[:2]])
+    
+    assert list(results['errors']) == [str(broken)]
+    assert list(results['ccg']['functions']) == list(full['functions'])
+    assert list(results['ccg'].graph.edges()) == list(full.graph.edges())
+    assert results['stats']['files'] == 2
+    assert results['stats']['symbols']['walkers'] == len(full['walkers'])
+    assert results['stats']['lines'][temp_py_file] == len(Path(temp_py_file).read_text().split('\n'))
+    print("  ✓ Parse pipeline tests passed.")
+
+def test_repo_walker(tmp_path):
+    """Tests the batched scandir walk used by repo_mapper."""
+    print("\nTesting repository walker...")
+    from utils.repo_walker import iter_repo_batches
+    
+    deep = tmp_path
+    for i in range(40):
+        deep = deep / f"d{i}"
+    deep.mkdir(parents=True)
+    (deep / "leaf.py").write_text("x = 1\n")
+    (tmp_path / "main.jac").write_text("walker w {}\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("")
+    (tmp_path / ".hidden").write_text("")
+    
+    batches = list(iter_repo_batches(str(tmp_path), batch_size=7, max_workers=4))
+    records = [r for batch in batches for r in batch]
+    assert all(len(batch) <= 7 for batch in batches)
+    
+    seen = {str(tmp_path)}
+    for record in records:
+        assert record['parent'] in seen, "Parents must be yielded before their contents"
+        seen.add(record['path'])
+    files = {r['name']: r for r in records if r['kind'] == 'file'}
+    assert set(files) == {"leaf.py", "main.jac"}
+    assert files['leaf.py']['extension'] == ".py"
+    assert files['leaf.py']['size'] == 6
+    assert files['main.jac']['path'] == os.path.join(str(tmp_path), "main.jac")
+    assert sum(r['kind'] == 'folder' for r in records) == 40
+    print("  ✓ Repository walker tests passed.")
+
+def test_file_content_cache(tmp_path, monkeypatch):
+    """Tests the single-read file content service and its LRU bound."""
+    print("\nTesting file content cache...")
+    import utils.file_content as file_content
+    from utils.file_content import FileContentCache
+    
+    small = tmp_path / "small.py"
+    small.write_text("a = 1\nb = 2\n")
+    large = tmp_path / "large.py"
+    large.write_text("x = 1\n" * 100)
+    monkeypatch.setattr(file_content, "MMAP_THRESHOLD", 128)
+    
+    cache = FileContentCache(max_bytes=700)
+    entry = cache.get(str(small))
+    assert cache.get(str(small)) is entry and cache.hits == 1
+    assert entry.lines == 3 and entry.text == "a = 1\nb = 2\n"
+    # Decoded text is not kept on the entry, only the counted raw buffer
+    assert entry.text is not entry.text and not hasattr(entry, "_text")
+    
+    mapped = cache.get(str(large))
+    assert not isinstance(mapped.data, bytes), "Large files should be memory-mapped"
+    assert mapped.lines == len(large.read_text().split('\n'))
+    assert mapped.text.startswith("x = 1")
+    # 12 + 600 bytes fit the budget; a rewrite invalidates the entry
+    assert cache.total_bytes == 612
+    small.write_text("changed = True\n")
+    assert cache.get(str(small)).text == "changed = True\n" and cache.misses == 3
+    
+    # Adding another file over budget evicts the least recently used one
+    other = tmp_path / "other.py"
+    other.write_text("y" * 100)
+    cache.get(str(other))
+    assert str(large) not in cache.entries and cache.total_bytes <= 700
+    assert mapped.data.closed, "Evicted mapped buffers should be closed"
+    cache.clear()
+    assert not cache.entries and cache.total_bytes == 0
+    print("  ✓ File content cache tests passed.")
+
+def test_graph_snapshot(temp_py_file, tmp_path):
+    """Tests the on-disk repository graph and its memory-mapped reload."""
+    print("\nTesting graph snapshot...")
+    from types import SimpleNamespace
+    from utils.graph_snapshot import save_graph_snapshot, load_graph_snapshot
+    
+    folder = SimpleNamespace(name="pkg", path=str(tmp_path / "pkg"))
+    py_file = SimpleNamespace(name="test_script.py", path=temp_py_file, extension=".py")
+    readme = SimpleNamespace(name="README.md", path=str(tmp_path / "README.md"), extension=".md")
+    repo = SimpleNamespace(
+        repo_url="https://github.com/a/b", name="b", local_path=str(tmp_path), output_path="",
+        readme_summary={'title': "B"}, stats={'files': 2},
+        registry={'folder': [folder], 'file': [py_file, readme], 'code_file': [py_file]}
+    )
+    ccg = build_columnar_ccg([parse_file_by_extension(temp_py_file)])
+    path = str(tmp_path / "graph.bin")
+    save_graph_snapshot(path, repo, ccg, {temp_py_file: 15}, "abc123")
+    
+    assert load_graph_snapshot(path, commit="other") is None
+    # Without a known commit (e.g. git failed) nothing can be matched
+    assert load_graph_snapshot(path) is None and load_graph_snapshot(path, commit="") is None
+    # A snapshot of another parse mode is stale too
+    assert load_graph_snapshot(path, commit="abc123", parse_mode="outline") is None
+    save_graph_snapshot(path, repo, ccg, {temp_py_file: 15}, "abc123", parse_mode="outline")
+    assert load_graph_snapshot(path, commit="abc123", parse_mode="full") is None
+    load_graph_snapshot(path, commit="abc123", parse_mode="outline").close()
+    save_graph_snapshot(path, repo, ccg, {temp_py_file: 15}, "abc123")
+    snapshot = load_graph_snapshot(path, commit="abc123")
+    assert snapshot.stats == {'files': 2} and snapshot.readme_summary == {'title': "B"}
+    assert snapshot.node(0)['repo_url'] == "https://github.com/a/b"
+    
+    records = {fields['name']: (node_id, archetype, fields) for node_id, archetype, fields in snapshot.spawn_records()}
+    assert records['test_script.py'][1] == "code_file" and records['test_script.py'][2]['lines'] == 15
+    assert records['README.md'][1] == "file" and 'language' not in records['README.md'][2]
+    assert records['greet'][2]['params'] == ["self"] and records['greet'][2]['returns'] == "void"
+    assert records['other_func'][2]['params'] == []
+    
+    edges = set(snapshot.edges())
+    ids = {name: record[0] for name, record in records.items()}
+    assert (0, ids['pkg'], 'contains') in edges and (0, ids['README.md'], 'contains') in edges
+    assert (ids['greet'], ids['MyClass'], 'defines') in edges
+    assert (ids['MyClass'], ids['test_script.py'], 'defines') in edges
+    assert snapshot.neighbours(ids['__init__'], 'defines') == [ids['MyClass']]
+    snapshot.close()
+    print("  ✓ Graph snapshot tests passed.")
+
+def test_element_tables(tmp_path):
+    """Tests the hybrid-mode per-file element tables and promotion."""
+    print("\nTesting element tables...")
+    from utils.ccg import link_ccg
+    from utils.element_table import build_element_tables
+    
+    (tmp_path / "a.py").write_text(
+        "class Base:\n    pass\n\nclass Child(Base):\n    def run(self):\n        return helper()\n\n"
+        "def helper():\n    pass\n"
+    )
+    (tmp_path / "b.py").write_text("from a import helper\n\ndef main():\n    helper()\n")
+    paths = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    ccg = build_columnar_ccg([parse_file_by_extension(p) for p in paths])
+    link_ccg(ccg)
+    records = ccg.spawn_records()
+    tables, promoted = build_element_tables(ccg, records)
+    
+    a = tables[paths[0]]
+    assert len(a) == 4 and len(tables[paths[1]]) == 1
+    child = a.find("Child")[0]
+    assert [a.row(r)['name'] for r in a.methods(child)] == ["run"]
+    assert [a.row(r)['name'] for r in a.rows("function", top_level=True)] == ["helper"]
+    assert a.row(a.find("run")[0])['signature'] == "run(self)"
+    # Same-file relationships stay in the table...
+    assert a.bases[child] == a.find("Base")
+    assert a.calls[a.find("run")[0]] == a.find("helper")
+    # ...only cross-file endpoints are promoted to nodes
+    names = {r[4]['name'] for r in records if r[0] in promoted}
+    assert names == {"main", "helper"}
+    print("  ✓ Element table tests passed.")
+
+def test_repo_stats(tmp_path, monkeypatch):
+    """Tests the per-language and per-folder repository statistics."""
+    print("\nTesting repository statistics...")
+    import utils.file_content as file_content
+    from utils.repo_stats import compute_repo_stats
+    
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("import os\n\nprint(os.name)\n")
+    (tmp_path / "src" / "big.py").write_text("x = 1\n" * 100)
+    (tmp_path / "README.md").write_text("# Title\n")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\n\n\n")
+    monkeypatch.setattr(file_content, "MMAP_THRESHOLD", 128)
+    
+    stats = compute_repo_stats(str(tmp_path), max_workers=2)
+    assert stats['file_count'] == 4 and stats['folder_count'] == 1
+    assert stats['file_types'] == {'Python': 2, 'Markdown': 1, 'Other': 1}
+    # Same line convention as FileContent.lines; binary files are not opened
+    assert stats['languages']['Python']['lines'] == 4 + 101
+    assert stats['languages']['Other'] == {'files': 1, 'bytes': 7, 'lines': 0}
+    assert stats['structure']['src']['files'] == 2 and stats['structure']['.']['files'] == 2
+    assert stats['total_bytes'] == sum(p.stat().st_size for p in tmp_path.rglob('*') if p.is_file())
+    assert "mostly Python" in stats['component_summary']
+    print("  ✓ Repository statistics tests passed.")
+
+def test_repo_index(tmp_path):
+    """Tests the shared repository index and its per-commit persistence."""
+    print("\nTesting repository index...")
+    from utils.readme_parser import find_readme
+    from utils.repo_index import RepoIndex, get_repo_index, REPO_INDEX_FILENAME
+    
+    repo = tmp_path / "repo"
+    (repo / "docs" / "api").mkdir(parents=True)
+    (repo / "docs" / "README.md").write_text("# Docs\n")
+    (repo / "docs" / "api" / "ref.py").write_text("def f():\n    pass\n")
+    (repo / "b.py").write_text("x = 1\n")
+    (repo / "a.png").write_bytes(b"\x89PNG\x00\x00")
+    (repo / ".venv").mkdir()
+    (repo / "venv-backup").mkdir()
+    (repo / "venv-backup" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    
+    index = RepoIndex.build(str(repo), commit="abc")
+    assert [e['name'] for e in index.files if e['language'] == 'Python'] == ["b.py", "ref.py"]
+    ref = index.get(str(repo / "docs" / "api" / "ref.py"))
+    assert ref['lines'] == 3 and ref['digest'] and not ref['binary']
+    assert index.get(str(repo / "a.png"))['binary'] and index.skipped == {"venv-backup": "virtualenv (pyvenv.cfg)"}
+    tree = [("  " * depth) + e['name'] for e, depth in index.iter_tree()]
+    assert tree == ["a.png", "b.py", "docs", "  README.md", "  api", "    ref.py"]
+    # Folders come before their contents, as repo_mapper needs
+    seen = {str(repo)}
+    for entry in [e for batch in index.batches(batch_size=2) for e in batch]:
+        assert entry['parent'] in seen
+        seen.add(entry['path'])
+    assert find_readme(str(repo), index) == str(repo / "docs" / "README.md") == find_readme(str(repo))
+    
+    # Reloaded for the same commit, rebuilt for another
+    state = tmp_path / "state"
+    get_repo_index(str(repo), str(state), "abc")
+    (repo / "c.py").write_text("")
+    reloaded = get_repo_index(str(repo), str(state), "abc")
+    assert [e['path'] for e in reloaded.files] == [e['path'] for e in index.files]
+    assert reloaded.get(ref['path'])['digest'] == ref['digest'] and reloaded.skipped == index.skipped
+    assert len(get_repo_index(str(repo), str(state), "def").files) == len(index.files) + 1
+    assert (state / REPO_INDEX_FILENAME).exists()
+    print("  ✓ Repository index tests passed.")
+
+def test_vendored_dir_detection(tmp_path):
+    """Tests that renamed virtualenvs and package trees are pruned and reported."""
+    print("\nTesting vendored directory detection...")
+    from utils.file_tree import vendored_dir_reason
+    from utils.repo_walker import iter_repo_batches
+    
+    (tmp_path / "venv-backup-1").mkdir()
+    (tmp_path / "venv-backup-1" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    (tmp_path / "venv-backup-2" / "lib" / "python3.12" / "site-packages" / "pip").mkdir(parents=True)
+    (tmp_path / "venv-backup-2" / "lib" / "python3.12" / "site-packages" / "pip" / "x.py").write_text("")
+    (tmp_path / "src" / "pkg-1.0.dist-info").mkdir(parents=True)
+    (tmp_path / "src" / "app.py").write_text("x = 1\n")
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "util.py").write_text("y = 2\n")
+    
+    assert vendored_dir_reason(str(tmp_path / "venv-backup-1")) == "virtualenv (pyvenv.cfg)"
+    assert vendored_dir_reason(str(tmp_path / "venv-backup-2")).startswith("Python environment")
+    assert vendored_dir_reason(str(tmp_path / "lib")) is None
+    
+    skipped = {}
+    records = [r for batch in iter_repo_batches(str(tmp_path), skipped=skipped) for r in batch]
+    assert {r['name'] for r in records} == {"src", "app.py", "lib", "util.py"}
+    assert set(skipped) == {str(tmp_path / "venv-backup-1"), str(tmp_path / "venv-backup-2"),
+                            str(tmp_path / "src" / "pkg-1.0.dist-info")}
+    print("  ✓ Vendored directory detection tests passed.")
+
+def test_ignore_matcher(tmp_path):
+    """Tests the compiled .gitignore-aware matcher shared by the walkers."""
+    print("\nTesting ignore matcher...")
+    from utils.ignore_matcher import IgnoreMatcher
+    from utils.repo_walker import iter_repo_batches
+    
+    (tmp_path / ".gitignore").write_text(
+        "# build output\n*.log\n!keep.log\n/out/\ndocs/**/*.tmp\n**/cache\n"
+    )
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("secret.txt\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / ".gitignore").write_text("!debug.log\ngenerated_*.py\n")
+    
+    matcher = IgnoreMatcher(str(tmp_path))
+    ignored = lambda rel, is_dir=False: matcher.is_ignored(str(tmp_path / rel), is_dir)
+    # Built-in globs now match (they used to be compared literally)
+    assert ignored("mod.pyc") and ignored("node_modules", True) and ignored(".env")
+    assert ignored("a.log") and ignored("pkg/a.log") and not ignored("keep.log")
+    assert ignored("out", True) and not ignored("out") and not ignored("pkg/out", True)
+    assert ignored("docs/a/b/x.tmp") and ignored("docs/x.tmp") and not ignored("x.tmp")
+    assert ignored("a/b/cache", True) and ignored("cache")
+    assert ignored("secret.txt") and ignored("pkg/secret.txt")
+    # A deeper .gitignore overrides the root one
+    assert not ignored("pkg/debug.log") and ignored("pkg/generated_api.py") and not ignored("generated_api.py")
+    
+    (tmp_path / "pkg" / "debug.log").write_text("")
+    (tmp_path / "pkg" / "a.log").write_text("")
+    (tmp_path / "pkg" / "mod.pyc").write_bytes(b"")
+    (tmp_path / "pkg" / "mod.py").write_text("")
+    names = {r['name'] for batch in iter_repo_batches(str(tmp_path)) for r in batch}
+    assert names == {"pkg", "debug.log", "mod.py"}
+    print("  ✓ Ignore matcher tests passed.")
+
+def test_markdown_writer(tmp_path):
+    """Tests the streaming markdown writer's buffered, all-or-nothing output."""
+    print("\nTesting markdown writer...")
+    from utils.doc_writer import MarkdownWriter
+    
+    path = tmp_path / "docs.md"
+    with MarkdownWriter(str(path), buffer_size=16) as out:
+        out.write("# Title\n\n", "intro ")
+        out.write_lines(f"- item {i}" for i in range(1000))
+        # Nothing is visible at the target until the document is complete
+        assert not path.exists()
+    text = path.read_text(encoding="utf-8")
+    assert text.startswith("# Title\n\nintro - item 0\n") and text.endswith("- item 999\n")
+    assert out.chars_written == len(text)
+    
+    # A failed run leaves the previous document untouched
+    try:
+        with MarkdownWriter(str(path)) as out:
+            out.write("partial")
+            raise RuntimeError("render failed")
+    except RuntimeError:
+        pass
+    assert path.read_text(encoding="utf-8") == text
+    assert list(tmp_path.iterdir()) == [path]
+    print("  ✓ Markdown writer tests passed.")
+
+def test_parallel_api_blocks():
+    """Tests that API blocks rendered on a process pool match serial rendering, in order."""
+    print("\nTesting parallel API block rendering...")
+    from utils.markdown_generator import render_api_blocks, api_block_md
+    
+    def entry(i):
+        method = {'name': f"m{i}", 'params': ['self'], 'file_path': f"pkg/mod{i}.py"}
+        return {
+            'walkers': [{'name': f"W{i}"}] if i % 3 == 0 else [], 'nodes': [],
+            'classes': [{'name': f"C{i}", 'docstring': "A class."}], 'methods': {0: [method]},
+            'functions': [{'name': f"f{i}", 'params': ['x'], 'returns': 'int'}]
+        }
+    files = [(f"pkg/mod{i:03}.py", entry(i)) for i in range(50)]
+    
+    serial = list(render_api_blocks(files, max_workers=1))
+    parallel = list(render_api_blocks(iter(files), max_workers=2, shard_size=8))
+    assert parallel == serial == [api_block_md(path, e) for path, e in files]
+    assert serial[0].startswith("### `pkg/mod000.py`") and "#### Walkers" in serial[0]
+    assert "- `m7()`" in serial[7] and "#### Walkers" not in serial[7]
+    print("  ✓ Parallel API block tests passed.")
+
+def test_fragment_cache(tmp_path):
+    """Tests fragment reuse by input hash, pruning, and skipping unchanged rewrites."""
+    print("\nTesting documentation fragment cache...")
+    import os
+    from utils.doc_writer import write_if_changed
+    from utils.fragment_cache import FragmentCache, content_key
+    from utils.markdown_generator import render_api_blocks
+    
+    assert content_key({'a': 1, 'b': [2]}) == content_key({'b': [2], 'a': 1}) != content_key({'a': 2, 'b': [2]})
+    files = [(f"mod{i}.py", {'walkers': [], 'nodes': [], 'classes': [], 'methods': {},
+                             'functions': [{'name': f"f{i}"}]}) for i in range(10)]
+    first = FragmentCache(str(tmp_path / "fragments"))
+    blocks = list(render_api_blocks(files, max_workers=1, cache=first))
+    assert (first.hits, first.misses) == (0, 10)
+    
+    # Only the changed file is rendered again; the stale block is pruned
+    files[3][1]['functions'][0]['name'] = "renamed"
+    second = FragmentCache(str(tmp_path / "fragments"))
+    again = list(render_api_blocks(files, max_workers=1, cache=second))
+    assert (second.hits, second.misses) == (9, 1)
+    assert "renamed" in again[3] and again[:3] == blocks[:3]
+    assert second.prune() == 1 and len(os.listdir(tmp_path / "fragments" / "api_blocks")) == 10
+    calls = []
+    assert second.render("x", {'k': 1}, lambda: calls.append(1) or "text") == "text"
+    assert second.render("x", {'k': 1}, lambda: calls.append(1) or "other") == "text" and len(calls) == 1
+    
+    # Identical bytes keep the existing file and its mtime
+    doc = tmp_path / "docs.md"
+    assert write_if_changed(str(doc), "".join(again))
+    os.utime(doc, ns=(1, 1))
+    assert not write_if_changed(str(doc), "".join(again)) and doc.stat().st_mtime_ns == 1
+    assert write_if_changed(str(doc), "changed") and doc.read_text() == "changed"
+    print("  ✓ Fragment cache tests passed.")
+
+def test_markdown_sections():
+    """Tests splitting markdown into sections at headings outside code fences."""
+    print("\nTesting markdown section splitting...")
+    import io
+    from utils.markdown_generator import iter_markdown_sections
+    
+    doc = ("\n# Title\nIntro\n## A\n```python\n# a comment, not a heading\n```\n"
+           "#### Deep heading\n    # indented code\n### B\n#hashtag\n~~~\n## fenced\n~~~\n")
+    sections = list(iter_markdown_sections(io.StringIO(doc)))
+    assert "".join(sections) == doc
+    assert [s.split("\n", 1)[0] for s in sections] == ["", "# Title", "## A", "### B"]
+    assert "## fenced" in sections[3] and "#### Deep heading" in sections[2]
+    print("  ✓ Markdown section tests passed.")
+
+def test_html_sections_conversion(tmp_path, monkeypatch):
+    """Tests that pooled HTML conversion matches serial output, and when the pool is started."""
+    pytest.importorskip("markdown")
+    print("\nTesting HTML section conversion...")
+    import documentation_pipeline
+    from documentation_pipeline import GitIntegratedDocumentationSaver, PARALLEL_HTML_MIN_SECTIONS
+    
+    doc = "# Docs\n" + "".join(f"## Section {i}\n\n| a | b |\n|---|---|\n| {i} | x |\n\n```python\nf({i})\n```\n"
+                               for i in range(2 * PARALLEL_HTML_MIN_SECTIONS))
+    serial = GitIntegratedDocumentationSaver(str(tmp_path / "serial")).save_html_documentation(doc, max_workers=1)
+    pooled_saver = GitIntegratedDocumentationSaver(str(tmp_path / "pooled"))
+    pooled = pooled_saver.save_html_documentation(doc, max_workers=2)
+    assert serial and pooled and pooled.read_text() == serial.read_text()
+    assert "<table>" in serial.read_text() and "Section 31" in serial.read_text()
+    
+    # Short documents and fully cached ones never start a pool
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+    monkeypatch.setattr(documentation_pipeline, "ProcessPoolExecutor", no_pool)
+    short = GitIntegratedDocumentationSaver(str(tmp_path / "short")).save_html_documentation("# A\n## B\n", max_workers=2)
+    assert short and "<h2>B</h2>" in short.read_text()
+    hits = pooled_saver.fragments.hits
+    assert pooled_saver.save_html_documentation(doc, max_workers=2).read_text() == serial.read_text()
+    assert pooled_saver.fragments.hits - hits == 2 * PARALLEL_HTML_MIN_SECTIONS + 1
+    print("  ✓ HTML section conversion tests passed.")
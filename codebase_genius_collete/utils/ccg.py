@@ -0,0 +1,1065 @@
+"""
+Columnar Code Context Graph (CCG) Container.
+
+Stores the parsed elements of a whole repository as a struct-of-arrays
+instead of one dict per element:
+- Every string (names, paths, types, docstrings) is interned once in a
+  string table and referenced by integer ID
+- Every symbol (function, class, walker, node, edge, ability) gets an
+  integer symbol ID and one row in a set of `array`-backed columns
+- Variable-length lists (params, calls, bases, ...) are ragged columns
+  made of an offsets array and a values array
+
+`ElementView` objects give existing callers the same list-of-dicts
+interface the parser produces (`ccg['functions']`, `ccg.get('classes')`),
+materializing one dict at a time on access.
+
+Resolved relationships between symbols are held in a `CSRGraph`
+(compressed sparse row adjacency) built in linear time by `link_ccg`,
+which resolves call and base-class names through a `SymbolIndex` keyed
+by module-qualified name and each file's imports.
+"""
+
+import json
+import os
+from array import array
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+
+# --- Constants ---
+
+# Symbol kinds, stored as one byte per row
+KIND_FUNCTION = 0
+KIND_CLASS = 1
+KIND_WALKER = 2
+KIND_NODE = 3
+KIND_EDGE = 4
+KIND_ABILITY = 5
+
+KIND_NAMES = ['function', 'class', 'walker', 'node', 'edge', 'ability']
+
+# Parser result keys for each kind (e.g. parsed['functions'])
+KIND_KEYS = {
+    'functions': KIND_FUNCTION,
+    'classes': KIND_CLASS,
+    'walkers': KIND_WALKER,
+    'nodes': KIND_NODE,
+    'edges': KIND_EDGE,
+    'abilities': KIND_ABILITY
+}
+
+# Kinds spawned as graph nodes by code_analyzer (edges/abilities are not)
+SPAWNED_KINDS = (KIND_FUNCTION, KIND_CLASS, KIND_WALKER, KIND_NODE)
+
+# Sentinel for "no value" in integer columns
+NONE_ID = -1
+
+# Scalar integer columns, one entry per symbol
+SCALAR_COLUMNS = ('name', 'file', 'line', 'line_end', 'parent', 'docstring', 'returns', 'signature')
+
+# Ragged (list-valued) columns, one slice per symbol
+RAGGED_COLUMNS = ('params', 'decorators', 'calls', 'call_lines', 'bases', 'attributes', 'methods')
+
+# Per-import columns
+IMPORT_COLUMNS = ('file', 'module', 'alias', 'line')
+
+# Resolved edge types, stored as one byte per edge
+EDGE_CALLS = 0
+EDGE_INHERITS = 1
+EDGE_DEFINES = 2
+
+EDGE_NAMES = ['calls', 'inherits', 'defines']
+
+# Source extensions stripped to form module names
+MODULE_EXTENSIONS = ('.py', '.jac')
+
+# How many re-exports / base classes are followed when resolving a name
+MAX_RESOLVE_DEPTH = 8
+
+SNAPSHOT_MAGIC = b'CCG1'
+SNAPSHOT_VERSION = 1
+
+
+# --- Storage Helpers ---
+
+class StringTable:
+    """
+    Interns strings to dense integer IDs.
+
+    Each distinct string is stored exactly once; `None` maps to NONE_ID.
+    """
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        """Initialize the table, optionally from a saved list of strings."""
+        self.strings: List[str] = list(strings or [])
+        self.ids: Dict[str, int] = {s: i for i, s in enumerate(self.strings)}
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the ID for a string, adding it if it is new."""
+        if value is None:
+            return NONE_ID
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self.ids[value] = string_id
+        return string_id
+
+    def lookup(self, string_id: int) -> Optional[str]:
+        """Return the string for an ID (None for NONE_ID)."""
+        return None if string_id == NONE_ID else self.strings[string_id]
+
+    def find(self, value: str) -> int:
+        """Return the ID for a string without adding it (NONE_ID if absent)."""
+        return self.ids.get(value, NONE_ID)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class RaggedColumn:
+    """
+    A column of integer lists stored as offsets + values arrays.
+
+    Row i's list is values[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, typecode: str = 'i'):
+        """Initialize an empty column."""
+        self.offsets = array('q', [0])
+        self.values = array(typecode)
+
+    def append(self, items) -> None:
+        """Append one row."""
+        self.values.extend(items)
+        self.offsets.append(len(self.values))
+
+    def row(self, index: int) -> array:
+        """Return the values of one row."""
+        return self.values[self.offsets[index]:self.offsets[index + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+# --- Dict-Compatible Views ---
+
+class ElementView:
+    """
+    Read-only list-of-dicts view over one kind of symbol.
+
+    Behaves like the lists returned by the parser: supports len(),
+    iteration, indexing and `name in view` membership tests.
+    """
+
+    def __init__(self, ccg: 'ColumnarCCG', kind: int):
+        """Bind the view to a container and a symbol kind."""
+        self.ccg = ccg
+        self.kind = kind
+
+    def __len__(self) -> int:
+        return len(self.ccg.kind_rows[self.kind])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for symbol_id in self.ccg.kind_rows[self.kind]:
+            yield self.ccg.symbol_dict(symbol_id)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self.ccg.symbol_dict(self.ccg.kind_rows[self.kind][index])
+
+    def __contains__(self, item) -> bool:
+        if isinstance(item, str):
+            name_id = self.ccg.strings.find(item)
+            return name_id != NONE_ID and bool(self.ccg.symbols_named(name_id, self.kind))
+        return item in list(self)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f"<ElementView {KIND_NAMES[self.kind]} x{len(self)}>"
+
+
+class ImportView:
+    """Read-only list-of-dicts view over the import table."""
+
+    def __init__(self, ccg: 'ColumnarCCG'):
+        """Bind the view to a container."""
+        self.ccg = ccg
+
+    def __len__(self) -> int:
+        return len(self.ccg.imports['line'])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        columns = self.ccg.imports
+        lookup = self.ccg.strings.lookup
+        return {
+            'module': lookup(columns['module'][index]),
+            'alias': lookup(columns['alias'][index]),
+            'line': columns['line'][index],
+            'file_path': lookup(columns['file'][index])
+        }
+
+
+class RelationshipView:
+    """
+    Read-only view of 'inherits' and 'calls' relationships.
+
+    Relationships are not stored separately: they are derived from the
+    'bases' and 'calls' columns, so each call is kept exactly once.
+    """
+
+    def __init__(self, ccg: 'ColumnarCCG'):
+        """Bind the view to a container."""
+        self.ccg = ccg
+
+    def __len__(self) -> int:
+        ccg = self.ccg
+        return sum(
+            len(ccg.ragged['bases'].row(s)) if ccg.kinds[s] == KIND_CLASS else len(ccg.ragged['calls'].row(s))
+            for s in range(len(ccg.kinds))
+        )
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        ccg = self.ccg
+        lookup = ccg.strings.lookup
+        for symbol_id in range(len(ccg.kinds)):
+            from_name = lookup(ccg.columns['name'][symbol_id])
+            if ccg.kinds[symbol_id] == KIND_CLASS:
+                for base_id in ccg.ragged['bases'].row(symbol_id):
+                    yield {'from': from_name, 'to': lookup(base_id), 'type': 'inherits',
+                           'line': ccg.columns['line'][symbol_id]}
+            else:
+                calls = ccg.ragged['calls'].row(symbol_id)
+                lines = ccg.ragged['call_lines'].row(symbol_id)
+                for target_id, line in zip(calls, lines):
+                    yield {'from': from_name, 'to': lookup(target_id), 'type': 'calls', 'line': line}
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        for i, rel in enumerate(self):
+            if i == index:
+                return rel
+        raise IndexError(index)
+
+
+# --- Columnar CCG Container ---
+
+class ColumnarCCG:
+    """
+    Struct-of-arrays container for the Code Context Graph.
+
+    Symbols are rows identified by an integer symbol ID. All string data
+    is interned in `self.strings`; all per-symbol data lives in `array`
+    columns so a function costs a few dozen bytes instead of a dict.
+    """
+
+    def __init__(self):
+        """Initialize empty columns."""
+        self.strings = StringTable()
+        self.kinds = array('B')
+        self.columns: Dict[str, array] = {name: array('i') for name in SCALAR_COLUMNS}
+        self.ragged: Dict[str, RaggedColumn] = {name: RaggedColumn() for name in RAGGED_COLUMNS}
+        self.imports: Dict[str, array] = {name: array('i') for name in IMPORT_COLUMNS}
+        # Symbol IDs of each kind, in insertion order
+        self.kind_rows: List[array] = [array('i') for _ in KIND_NAMES]
+        # name ID -> list of symbol IDs (all kinds)
+        self.name_index: Dict[int, List[int]] = {}
+        # Resolved relationships and the index used to resolve them, set by link_ccg()
+        self.graph: Optional['CSRGraph'] = None
+        self.index: Optional['SymbolIndex'] = None
+
+    # --- Building ---
+
+    def add_parsed_file(self, parsed: Dict[str, Any], file_path: Optional[str] = None) -> List[int]:
+        """
+        Append one parser result (see python_parser) to the columns.
+
+        Args:
+            parsed: The dict returned by parse_file_by_extension.
+            file_path: Path to record; defaults to parsed['file_path'] or
+                the elements' own file_path.
+
+        Returns:
+            The symbol IDs added, in insertion order.
+        """
+        added = []
+        class_rows: Dict[str, int] = {}
+        walker_rows: Dict[str, int] = {}
+
+        def path_of(element):
+            return file_path or element.get('file_path') or parsed.get('file_path')
+
+        # Containers first so methods/abilities can point at their parent row
+        for cls in parsed.get('classes', []):
+            symbol_id = self._add_symbol(KIND_CLASS, cls, path_of(cls))
+            class_rows[cls['name']] = symbol_id
+            added.append(symbol_id)
+        for walker in parsed.get('walkers', []):
+            symbol_id = self._add_symbol(KIND_WALKER, walker, path_of(walker))
+            walker_rows[walker['name']] = symbol_id
+            added.append(symbol_id)
+        for func in parsed.get('functions', []):
+            parent = class_rows.get(func.get('parent_class'), NONE_ID)
+            added.append(self._add_symbol(KIND_FUNCTION, func, path_of(func), parent))
+        for key, kind in (('nodes', KIND_NODE), ('edges', KIND_EDGE)):
+            for element in parsed.get(key, []):
+                added.append(self._add_symbol(kind, element, path_of(element)))
+        for ability in parsed.get('abilities', []):
+            parent = walker_rows.get(ability.get('parent_walker'), NONE_ID)
+            added.append(self._add_symbol(KIND_ABILITY, ability, path_of(ability), parent))
+
+        intern = self.strings.intern
+        default_path = file_path or parsed.get('file_path')
+        for imp in parsed.get('imports', []):
+            self.imports['file'].append(intern(imp.get('file_path') or default_path))
+            self.imports['module'].append(intern(imp.get('module')))
+            self.imports['alias'].append(intern(imp.get('alias')))
+            self.imports['line'].append(imp.get('line') or 0)
+        return added
+
+    def _add_symbol(self, kind: int, element: Dict[str, Any], path: Optional[str], parent: int = NONE_ID) -> int:
+        """Append one element dict as a new row and return its symbol ID."""
+        intern = self.strings.intern
+        symbol_id = len(self.kinds)
+        line = element.get('line') or 0
+        name_id = intern(element.get('name'))
+
+        self.kinds.append(kind)
+        columns = self.columns
+        columns['name'].append(name_id)
+        columns['file'].append(intern(path))
+        columns['line'].append(line)
+        columns['line_end'].append(element.get('line_end') or line)
+        columns['parent'].append(parent)
+        columns['docstring'].append(intern(element.get('docstring') or None))
+        columns['returns'].append(intern(element.get('returns')))
+        columns['signature'].append(intern(element.get('signature') or element.get('ability_type')))
+
+        ragged = self.ragged
+        ragged['params'].append([intern(p) for p in element.get('params', [])])
+        ragged['decorators'].append([intern(d) for d in element.get('decorators', []) if d])
+        calls = element.get('calls', [])
+        ragged['calls'].append([intern(c) for c in calls])
+        ragged['call_lines'].append(element.get('call_lines') or [line] * len(calls))
+        ragged['bases'].append([intern(b) for b in element.get('bases', [])])
+        ragged['attributes'].append([intern(a) for a in element.get('attributes', [])])
+        ragged['methods'].append([intern(m if isinstance(m, str) else m['name']) for m in element.get('methods', [])])
+
+        self.kind_rows[kind].append(symbol_id)
+        self.name_index.setdefault(name_id, []).append(symbol_id)
+        return symbol_id
+
+    # --- Lookups ---
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def symbols_named(self, name_id: int, kind: Optional[int] = None) -> List[int]:
+        """Symbol IDs with the given interned name, optionally of one kind."""
+        rows = self.name_index.get(name_id, [])
+        if kind is None:
+            return rows
+        return [s for s in rows if self.kinds[s] == kind]
+
+    def name_of(self, symbol_id: int) -> str:
+        """The name of a symbol."""
+        return self.strings.strings[self.columns['name'][symbol_id]]
+
+    def file_of(self, symbol_id: int) -> Optional[str]:
+        """The file path a symbol was defined in."""
+        return self.strings.lookup(self.columns['file'][symbol_id])
+
+    def symbol_dict(self, symbol_id: int) -> Dict[str, Any]:
+        """
+        Materialize one symbol as the dict shape the parser produces.
+
+        Args:
+            symbol_id: The row to materialize.
+
+        Returns:
+            A new dict; mutating it does not change the container.
+        """
+        lookup = self.strings.lookup
+        strings = self.strings.strings
+        columns = self.columns
+        kind = self.kinds[symbol_id]
+        parent = columns['parent'][symbol_id]
+
+        data: Dict[str, Any] = {
+            'id': symbol_id,
+            'name': strings[columns['name'][symbol_id]],
+            'docstring': lookup(columns['docstring'][symbol_id]),
+            'line': columns['line'][symbol_id],
+            'line_end': columns['line_end'][symbol_id],
+            'file_path': lookup(columns['file'][symbol_id])
+        }
+        if kind == KIND_FUNCTION:
+            data['params'] = self._strings_of('params', symbol_id)
+            data['returns'] = lookup(columns['returns'][symbol_id])
+            data['calls'] = self._strings_of('calls', symbol_id)
+            data['decorators'] = self._strings_of('decorators', symbol_id)
+            if parent != NONE_ID:
+                data['parent_class'] = self.name_of(parent)
+        elif kind == KIND_CLASS:
+            data['bases'] = self._strings_of('bases', symbol_id)
+            data['methods'] = self._strings_of('methods', symbol_id)
+            data['attributes'] = self._strings_of('attributes', symbol_id)
+        elif kind == KIND_ABILITY:
+            signature = lookup(columns['signature'][symbol_id]) or ''
+            data['signature'] = signature
+            data['ability_type'] = 'test' if signature.startswith('test') else 'can'
+            data['parent_walker'] = self.name_of(parent) if parent != NONE_ID else None
+        else:
+            data['attributes'] = self._strings_of('attributes', symbol_id)
+            if kind in (KIND_NODE, KIND_EDGE):
+                data['kind'] = KIND_NAMES[kind]
+        return data
+
+    def spawn_records(self, paths: Optional[Iterable[str]] = None) -> List[tuple]:
+        """
+        Node-constructor arguments for spawnable symbols, in one column pass.
+
+        Only the fields graph nodes store are materialized (no calls,
+        bases or decorators), so this is much cheaper than iterating the
+        element views.
+
+        Args:
+            paths: Restrict to these files (e.g. a single file); all
+                files if omitted.
+
+        Returns:
+            (symbol_id, kind, parent_id, file_path, fields) tuples in
+            symbol ID order, so a parent always precedes its children.
+            `fields` are keyword arguments for the node archetype.
+        """
+        strings = self.strings.strings
+        lookup = self.strings.lookup
+        columns = self.columns
+        names, files, parents = columns['name'], columns['file'], columns['parent']
+        lines, line_ends = columns['line'], columns['line_end']
+        docstrings, returns = columns['docstring'], columns['returns']
+        wanted = None if paths is None else {self.strings.find(p) for p in paths}
+
+        records = []
+        for symbol_id, kind in enumerate(self.kinds):
+            if kind not in SPAWNED_KINDS or (wanted is not None and files[symbol_id] not in wanted):
+                continue
+            name = strings[names[symbol_id]]
+            fields = {
+                'name': name,
+                'docstring': lookup(docstrings[symbol_id]) or "",
+                'line_start': lines[symbol_id],
+                'line_end': line_ends[symbol_id]
+            }
+            if kind == KIND_FUNCTION:
+                params = self._strings_of('params', symbol_id)
+                fields['signature'] = f"{name}({', '.join(params)})"
+                fields['params'] = params
+                fields['returns'] = lookup(returns[symbol_id]) or "void"
+            records.append((symbol_id, kind, parents[symbol_id], strings[files[symbol_id]], fields))
+        return records
+
+    def _strings_of(self, column: str, symbol_id: int) -> List[str]:
+        """Decode one ragged row of string IDs."""
+        strings = self.strings.strings
+        return [strings[i] for i in self.ragged[column].row(symbol_id)]
+
+    # --- Dict-Compatible Interface ---
+
+    @property
+    def functions(self) -> ElementView:
+        return ElementView(self, KIND_FUNCTION)
+
+    @property
+    def classes(self) -> ElementView:
+        return ElementView(self, KIND_CLASS)
+
+    @property
+    def walkers(self) -> ElementView:
+        return ElementView(self, KIND_WALKER)
+
+    @property
+    def nodes(self) -> ElementView:
+        return ElementView(self, KIND_NODE)
+
+    @property
+    def edges(self) -> ElementView:
+        return ElementView(self, KIND_EDGE)
+
+    @property
+    def abilities(self) -> ElementView:
+        return ElementView(self, KIND_ABILITY)
+
+    @property
+    def relationships(self) -> RelationshipView:
+        return RelationshipView(self)
+
+    def keys(self) -> List[str]:
+        return list(KIND_KEYS) + ['imports', 'relationships']
+
+    def __getitem__(self, key: str):
+        if key in KIND_KEYS:
+            return ElementView(self, KIND_KEYS[key])
+        if key == 'imports':
+            return ImportView(self)
+        if key == 'relationships':
+            return RelationshipView(self)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys()
+
+    def get(self, key: str, default=None):
+        """dict.get() for the element lists, e.g. ccg.get('functions', [])."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    # --- Serialization ---
+
+    def _buffers(self) -> List[tuple]:
+        """(name, array) pairs for every column, in a fixed order."""
+        buffers = [('kinds', self.kinds)]
+        buffers += [(f"col.{name}", self.columns[name]) for name in SCALAR_COLUMNS]
+        for name in RAGGED_COLUMNS:
+            buffers.append((f"ragged.{name}.offsets", self.ragged[name].offsets))
+            buffers.append((f"ragged.{name}.values", self.ragged[name].values))
+        buffers += [(f"imports.{name}", self.imports[name]) for name in IMPORT_COLUMNS]
+        if self.graph is not None:
+            buffers.append(('graph.indptr', self.graph.indptr))
+            buffers.append(('graph.indices', self.graph.indices))
+            buffers.append(('graph.edge_types', self.graph.edge_types))
+        return buffers
+
+    def save(self, path: str) -> None:
+        """
+        Write the container to disk.
+
+        Layout: magic, header length, JSON header (version, string table,
+        column typecodes and lengths), then each column's raw bytes.
+        Columns are written straight from their array buffers via
+        memoryview, so no intermediate copies are made.
+        """
+        buffers = self._buffers()
+        header = json.dumps({
+            'version': SNAPSHOT_VERSION,
+            'strings': self.strings.strings,
+            'columns': [[name, arr.typecode, len(arr)] for name, arr in buffers]
+        }).encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for _, arr in buffers:
+                f.write(memoryview(arr))
+
+    @classmethod
+    def load(cls, path: str) -> 'ColumnarCCG':
+        """
+        Read a container written by save().
+
+        Raises:
+            ValueError: If the file is not a CCG snapshot of this version.
+        """
+        with open(path, 'rb') as f:
+            if f.read(4) != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a CCG snapshot: {path}")
+            header_len = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(header_len).decode('utf-8'))
+            if header.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported CCG snapshot version: {header.get('version')}")
+
+            ccg = cls()
+            ccg.strings = StringTable(header['strings'])
+            arrays = {}
+            for name, typecode, length in header['columns']:
+                arr = array(typecode)
+                arr.frombytes(f.read(length * arr.itemsize))
+                arrays[name] = arr
+
+        ccg.kinds = arrays['kinds']
+        for name in SCALAR_COLUMNS:
+            ccg.columns[name] = arrays[f"col.{name}"]
+        for name in RAGGED_COLUMNS:
+            ccg.ragged[name].offsets = arrays[f"ragged.{name}.offsets"]
+            ccg.ragged[name].values = arrays[f"ragged.{name}.values"]
+        for name in IMPORT_COLUMNS:
+            ccg.imports[name] = arrays[f"imports.{name}"]
+        if 'graph.indptr' in arrays:
+            ccg.graph = CSRGraph(arrays['graph.indptr'], arrays['graph.indices'], arrays['graph.edge_types'])
+        ccg._rebuild_indexes()
+        return ccg
+
+    def remove_files(self, paths) -> tuple:
+        """
+        Drop every symbol and import defined in the given files.
+
+        Surviving rows are compacted and renumbered; parent links and the
+        linked graph (if any) are remapped. Edges into removed symbols are
+        dropped and their sources reported so they can be re-resolved.
+
+        Args:
+            paths: File paths exactly as stored in the container.
+
+        Returns:
+            (remap, orphaned): remap[old_id] is the new symbol ID or
+            NONE_ID; orphaned is the set of new IDs that lost an edge.
+        """
+        file_ids = {self.strings.find(p) for p in paths} - {NONE_ID}
+        files = self.columns['file']
+        remap = array('i', bytes(4 * len(self.kinds)))
+        next_id = 0
+        for symbol_id in range(len(self.kinds)):
+            if files[symbol_id] in file_ids:
+                remap[symbol_id] = NONE_ID
+            else:
+                remap[symbol_id] = next_id
+                next_id += 1
+        keep = [s for s in range(len(self.kinds)) if remap[s] != NONE_ID]
+
+        self.kinds = array('B', (self.kinds[s] for s in keep))
+        for name in SCALAR_COLUMNS:
+            column = self.columns[name]
+            self.columns[name] = array('i', (column[s] for s in keep))
+        parents = self.columns['parent']
+        for i, parent in enumerate(parents):
+            if parent != NONE_ID:
+                parents[i] = remap[parent]
+        for name in RAGGED_COLUMNS:
+            old = self.ragged[name]
+            new = RaggedColumn(old.values.typecode)
+            for s in keep:
+                new.append(old.row(s))
+            self.ragged[name] = new
+
+        keep_imports = [i for i, f in enumerate(self.imports['file']) if f not in file_ids]
+        for name in IMPORT_COLUMNS:
+            column = self.imports[name]
+            self.imports[name] = array('i', (column[i] for i in keep_imports))
+
+        orphaned = set()
+        if self.graph is not None:
+            sources, targets, types = array('i'), array('i'), array('B')
+            for source, target, edge_type in self.graph.edges():
+                new_source, new_target = remap[source], remap[target]
+                if new_source == NONE_ID:
+                    continue
+                if new_target == NONE_ID:
+                    orphaned.add(new_source)
+                    continue
+                sources.append(new_source)
+                targets.append(new_target)
+                types.append(edge_type)
+            self.graph = CSRGraph.from_edges(len(self.kinds), sources, targets, types)
+
+        self.index = None
+        self._rebuild_indexes()
+        return remap, orphaned
+
+    def _rebuild_indexes(self) -> None:
+        """Recompute kind_rows and name_index from the columns."""
+        self.kind_rows = [array('i') for _ in KIND_NAMES]
+        self.name_index = {}
+        names = self.columns['name']
+        for symbol_id, kind in enumerate(self.kinds):
+            self.kind_rows[kind].append(symbol_id)
+            self.name_index.setdefault(names[symbol_id], []).append(symbol_id)
+
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers in bytes."""
+        total = sum(arr.itemsize * len(arr) for _, arr in self._buffers())
+        return total + sum(len(s) for s in self.strings.strings)
+
+
+# --- Qualified-Name Symbol Index ---
+
+class SymbolIndex:
+    """
+    Maps module-qualified names to symbol IDs and resolves references.
+
+    Module names are derived from file paths relative to the common root
+    of all files ('pkg/mod.py' -> 'pkg.mod', 'pkg/__init__.py' -> 'pkg').
+    Every trailing part of a module name is indexed too, so an import of
+    'utils.ccg' finds '<checkout>/utils/ccg.py' wherever it was cloned.
+
+    References are resolved the way Python binds names: definitions in
+    the same file, then the file's imports (following re-exports and
+    star imports), and for 'self.x' / 'cls.x' the enclosing class and
+    its resolved bases. Anything else is unresolvable.
+    """
+
+    def __init__(self, ccg: ColumnarCCG):
+        """Index every symbol and import of a container."""
+        self.ccg = ccg
+        strings = ccg.strings
+        names, files, parents = ccg.columns['name'], ccg.columns['file'], ccg.columns['parent']
+
+        file_ids = sorted(set(files) | set(ccg.imports['file']))
+        paths = [strings.lookup(f) or '' for f in file_ids]
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else ''
+
+        # file ID -> module parts; dotted module suffix -> file ID (NONE_ID if ambiguous)
+        self.module_parts: Dict[int, List[str]] = {}
+        self.is_package: Dict[int, bool] = {}
+        self.modules: Dict[str, int] = {}
+        for file_id, path in zip(file_ids, paths):
+            parts = _module_parts(os.path.relpath(os.path.abspath(path), root))
+            self.is_package[file_id] = os.path.basename(path).startswith('__init__.')
+            if self.is_package[file_id]:
+                parts = parts[:-1]
+            self.module_parts[file_id] = parts
+            for i in range(len(parts)):
+                suffix = '.'.join(parts[i:])
+                self.modules[suffix] = file_id if self.modules.get(suffix, file_id) == file_id else NONE_ID
+
+        # (file ID, 'Class.method' or 'name') -> symbol ID
+        self.members: Dict[tuple, int] = {}
+        for symbol_id in range(len(ccg)):
+            parent = parents[symbol_id]
+            local = strings.strings[names[symbol_id]]
+            if parent != NONE_ID:
+                local = f"{strings.strings[names[parent]]}.{local}"
+            self.members.setdefault((files[symbol_id], local), symbol_id)
+
+        # file ID -> {bound name: absolute dotted target}, and star-imported modules
+        self.bindings: Dict[int, Dict[str, str]] = {}
+        self.star_imports: Dict[int, List[str]] = {}
+        for file_id, module_id, alias_id in zip(ccg.imports['file'], ccg.imports['module'], ccg.imports['alias']):
+            module = strings.lookup(module_id)
+            if not module:
+                continue
+            target = self._absolute(file_id, module)
+            if target.endswith('.*'):
+                self.star_imports.setdefault(file_id, []).append(target[:-2])
+                continue
+            bound = self.bindings.setdefault(file_id, {})
+            alias = strings.lookup(alias_id)
+            if alias:
+                bound[alias] = target
+                continue
+            # Import columns do not record 'import a.b' vs 'from a import b',
+            # so bind both the first and (with priority) the last segment
+            head = module.split('.', 1)[0]
+            if head and '.' in module:
+                bound.setdefault(head, head)
+            bound[target.rsplit('.', 1)[-1]] = target
+
+    def _absolute(self, file_id: int, module: str) -> str:
+        """Expand a relative import ('..pkg.x') against the importing file."""
+        if not module.startswith('.'):
+            return module
+        level = len(module) - len(module.lstrip('.'))
+        package = self.module_parts.get(file_id, [])
+        if not self.is_package.get(file_id):
+            package = package[:-1]
+        base = package[:len(package) - (level - 1)] if level > 1 else package
+        return '.'.join(base + [module[level:]]) if module[level:] else '.'.join(base)
+
+    def qualified_name(self, symbol_id: int) -> str:
+        """Module-qualified name of a symbol (e.g. 'pkg.mod.Class.method')."""
+        ccg = self.ccg
+        name = ccg.name_of(symbol_id)
+        parent = ccg.columns['parent'][symbol_id]
+        if parent != NONE_ID:
+            name = f"{ccg.name_of(parent)}.{name}"
+        module = '.'.join(self.module_parts.get(ccg.columns['file'][symbol_id], []))
+        return f"{module}.{name}" if module else name
+
+    def lookup(self, qualified: str, depth: int = 0) -> int:
+        """
+        Symbol ID for a dotted module-qualified name, or NONE_ID.
+
+        The longest indexed module prefix wins; names a module merely
+        re-exports are followed through that module's imports.
+        """
+        if depth > MAX_RESOLVE_DEPTH:
+            return NONE_ID
+        parts = qualified.split('.')
+        for i in range(len(parts) - 1, 0, -1):
+            file_id = self.modules.get('.'.join(parts[:i]), NONE_ID)
+            if file_id == NONE_ID:
+                continue
+            return self.resolve_in_file(file_id, '.'.join(parts[i:]), depth + 1)
+        return NONE_ID
+
+    def resolve_in_file(self, file_id: int, ref: str, depth: int = 0) -> int:
+        """Resolve a name as seen from module scope of a file."""
+        symbol_id = self.members.get((file_id, ref))
+        if symbol_id is not None:
+            return symbol_id
+        if depth > MAX_RESOLVE_DEPTH:
+            return NONE_ID
+        head, _, rest = ref.partition('.')
+        target = self.bindings.get(file_id, {}).get(head)
+        if target is not None:
+            return self.lookup(f"{target}.{rest}" if rest else target, depth + 1)
+        for module in self.star_imports.get(file_id, []):
+            symbol_id = self.lookup(f"{module}.{ref}", depth + 1)
+            if symbol_id != NONE_ID:
+                return symbol_id
+        return NONE_ID
+
+    def resolve_method(self, class_id: int, name: str, depth: int = 0) -> int:
+        """Resolve 'self.name' in a class, searching its bases depth-first."""
+        ccg = self.ccg
+        file_id = ccg.columns['file'][class_id]
+        symbol_id = self.members.get((file_id, f"{ccg.name_of(class_id)}.{name}"))
+        if symbol_id is not None or depth > MAX_RESOLVE_DEPTH:
+            return NONE_ID if symbol_id is None else symbol_id
+        for base_id in ccg.ragged['bases'].row(class_id):
+            base = self.resolve_in_file(file_id, ccg.strings.strings[base_id])
+            if base != NONE_ID and ccg.kinds[base] == KIND_CLASS:
+                symbol_id = self.resolve_method(base, name, depth + 1)
+                if symbol_id != NONE_ID:
+                    return symbol_id
+        return NONE_ID
+
+    def resolve_call(self, symbol_id: int, call: str) -> int:
+        """Resolve a call recorded on a function to a function or class."""
+        ccg = self.ccg
+        head, _, rest = call.partition('.')
+        if head in ('self', 'cls'):
+            parent = ccg.columns['parent'][symbol_id]
+            if not rest or '.' in rest or parent == NONE_ID or ccg.kinds[parent] != KIND_CLASS:
+                return NONE_ID
+            target = self.resolve_method(parent, rest)
+        else:
+            target = self.resolve_in_file(ccg.columns['file'][symbol_id], call)
+        if target != NONE_ID and ccg.kinds[target] in (KIND_FUNCTION, KIND_CLASS):
+            return target
+        return NONE_ID
+
+
+def _module_parts(relative_path: str) -> List[str]:
+    """'pkg/mod.py' -> ['pkg', 'mod']."""
+    base, ext = os.path.splitext(relative_path)
+    if ext not in MODULE_EXTENSIONS:
+        base = relative_path
+    return [p for p in base.replace(os.sep, '/').split('/') if p and p != '.']
+
+
+# --- Compressed Sparse Row Graph ---
+
+class CSRGraph:
+    """
+    Directed graph over symbol IDs in compressed sparse row form.
+
+    The out-edges of node n are indices[indptr[n]:indptr[n + 1]] with
+    their types in the parallel `edge_types` array, so finding a node's
+    neighbours is two array reads regardless of graph size.
+    """
+
+    def __init__(self, indptr: array, indices: array, edge_types: array):
+        """Wrap prebuilt CSR arrays."""
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_types = edge_types
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, sources: array, targets: array, types: array) -> 'CSRGraph':
+        """
+        Build a CSR graph from parallel edge arrays with a counting sort.
+
+        Runs in O(num_nodes + num_edges); edges keep their input order
+        within each source node.
+        """
+        indptr = array('q', bytes(8 * (num_nodes + 1)))
+        for source in sources:
+            indptr[source + 1] += 1
+        for n in range(num_nodes):
+            indptr[n + 1] += indptr[n]
+
+        cursor = indptr[:-1]
+        indices = array('i', bytes(4 * len(sources)))
+        edge_types = array('B', bytes(len(sources)))
+        for source, target, edge_type in zip(sources, targets, types):
+            position = cursor[source]
+            indices[position] = target
+            edge_types[position] = edge_type
+            cursor[source] = position + 1
+        return cls(indptr, indices, edge_types)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def degree(self, node: int) -> int:
+        """Number of out-edges of a node."""
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def neighbours(self, node: int, edge_type: Optional[int] = None) -> List[int]:
+        """Targets of a node's out-edges, optionally of one edge type."""
+        start, end = self.indptr[node], self.indptr[node + 1]
+        if edge_type is None:
+            return self.indices[start:end].tolist()
+        types = self.edge_types
+        return [self.indices[i] for i in range(start, end) if types[i] == edge_type]
+
+    def edges(self) -> Iterator[tuple]:
+        """Yield every edge as (source, target, edge_type)."""
+        indptr, indices, types = self.indptr, self.indices, self.edge_types
+        for source in range(self.num_nodes):
+            for i in range(indptr[source], indptr[source + 1]):
+                yield source, indices[i], types[i]
+
+    def transpose(self) -> 'CSRGraph':
+        """The same graph with every edge reversed (incoming adjacency)."""
+        sources, targets, types = array('i'), array('i'), array('B')
+        for source, target, edge_type in self.edges():
+            sources.append(target)
+            targets.append(source)
+            types.append(edge_type)
+        return CSRGraph.from_edges(self.num_nodes, sources, targets, types)
+
+
+def link_ccg(ccg: ColumnarCCG, affected: Optional[set] = None) -> CSRGraph:
+    """
+    Resolve calls/inherits/defines relationships into a CSRGraph.
+
+    Call and base-class names are resolved through a SymbolIndex: a
+    definition in the same file, then the file's imports, and for
+    'self.x' the enclosing class and its bases. Unresolvable names
+    produce no edge. Each reference costs a few dict lookups, so linking
+    runs in time linear in symbols plus relationships.
+
+    Args:
+        ccg: The container to link; its `graph` and `index` are set.
+        affected: If given (and ccg.graph covers the surviving symbols),
+            only these symbol IDs are re-resolved; every other symbol
+            keeps its existing out-edges.
+
+    Returns:
+        The built CSRGraph.
+    """
+    files = ccg.columns['file']
+    parents = ccg.columns['parent']
+    kinds = ccg.kinds
+    previous = ccg.graph if affected is not None else None
+    index = SymbolIndex(ccg)
+    strings = ccg.strings.strings
+
+    sources, targets, types = array('i'), array('i'), array('B')
+    for symbol_id, kind in enumerate(kinds):
+        # 'defines' is stored on the child's row, so it is always cheap to emit
+        if parents[symbol_id] != NONE_ID:
+            sources.append(parents[symbol_id])
+            targets.append(symbol_id)
+            types.append(EDGE_DEFINES)
+
+        if previous is not None and symbol_id not in affected and symbol_id < previous.num_nodes:
+            indices, edge_types = previous.indices, previous.edge_types
+            for i in range(previous.indptr[symbol_id], previous.indptr[symbol_id + 1]):
+                if edge_types[i] != EDGE_DEFINES:
+                    sources.append(symbol_id)
+                    targets.append(indices[i])
+                    types.append(edge_types[i])
+            continue
+
+        if kind == KIND_CLASS:
+            for base_id in ccg.ragged['bases'].row(symbol_id):
+                target = index.resolve_in_file(files[symbol_id], strings[base_id])
+                if target != NONE_ID and kinds[target] == KIND_CLASS:
+                    sources.append(symbol_id)
+                    targets.append(target)
+                    types.append(EDGE_INHERITS)
+        elif kind == KIND_FUNCTION:
+            for call_id in ccg.ragged['calls'].row(symbol_id):
+                target = index.resolve_call(symbol_id, strings[call_id])
+                if target != NONE_ID:
+                    sources.append(symbol_id)
+                    targets.append(target)
+                    types.append(EDGE_CALLS)
+
+    ccg.graph = CSRGraph.from_edges(len(kinds), sources, targets, types)
+    ccg.index = index
+    return ccg.graph
+
+
+def _ref_name_id(strings: StringTable, ref_id: int) -> int:
+    """String ID of a reference's last segment ('mod.Base' -> 'Base')."""
+    ref = strings.strings[ref_id]
+    if '.' not in ref:
+        return ref_id
+    return strings.find(ref.rsplit('.', 1)[-1])
+
+
+def update_ccg(ccg: ColumnarCCG, parsed_files: List[Dict[str, Any]], removed_paths: List[str]) -> ColumnarCCG:
+    """
+    Patch a linked CCG in place after some files changed.
+
+    Symbols of removed and re-parsed files are dropped, the new parse
+    results are appended, and only the relationships that could have
+    changed are re-resolved: the new symbols, symbols that lost an edge,
+    and symbols referring to a name that was added or removed.
+
+    Args:
+        ccg: A container previously linked with link_ccg.
+        parsed_files: Fresh parse results for added/modified files.
+        removed_paths: Paths of deleted files (and old paths of renames).
+
+    Returns:
+        The same container, relinked.
+    """
+    parsed_files = [p for p in parsed_files if p and not p.get('error')]
+    stale_paths = set(removed_paths) | {p['file_path'] for p in parsed_files}
+    stale_file_ids = {ccg.strings.find(p) for p in stale_paths} - {NONE_ID}
+
+    names = ccg.columns['name']
+    files = ccg.columns['file']
+    changed_names = {names[s] for s in range(len(ccg)) if files[s] in stale_file_ids}
+    # Names re-exported by a changed module can change what they resolve to
+    strings = ccg.strings
+    for file_id, module_id, alias_id in zip(ccg.imports['file'], ccg.imports['module'], ccg.imports['alias']):
+        if file_id in stale_file_ids:
+            changed_names.add(alias_id if alias_id != NONE_ID else _ref_name_id(strings, module_id))
+
+    _, affected = ccg.remove_files(stale_paths)
+    for parsed in parsed_files:
+        for symbol_id in ccg.add_parsed_file(parsed):
+            affected.add(symbol_id)
+            changed_names.add(ccg.columns['name'][symbol_id])
+        for imp in parsed.get('imports', []):
+            name = imp.get('alias') or (imp.get('module') or '').rsplit('.', 1)[-1]
+            changed_names.add(strings.find(name))
+
+    for symbol_id, kind in enumerate(ccg.kinds):
+        if symbol_id in affected:
+            continue
+        if kind == KIND_FUNCTION:
+            refs = [_ref_name_id(strings, c) for c in ccg.ragged['calls'].row(symbol_id)]
+        elif kind == KIND_CLASS:
+            refs = [_ref_name_id(strings, b) for b in ccg.ragged['bases'].row(symbol_id)]
+        else:
+            continue
+        if any(ref in changed_names for ref in refs):
+            affected.add(symbol_id)
+
+    link_ccg(ccg, affected)
+    return ccg
+
+
+def build_columnar_ccg(parsed_files: List[Dict[str, Any]]) -> ColumnarCCG:
+    """
+    Build a ColumnarCCG from a list of parser results.
+
+    Args:
+        parsed_files: Results of parse_file_by_extension; entries with an
+            'error' key are skipped.
+
+    Returns:
+        The populated container.
+    """
+    ccg = ColumnarCCG()
+    for parsed in parsed_files:
+        if parsed and not parsed.get('error'):
+            ccg.add_parsed_file(parsed)
+    return ccg
@@ -0,0 +1,97 @@
+"""
+Streaming Markdown Writer.
+
+Writes a generated document section by section straight to its output
+file instead of concatenating every section into one string first:
+- Parts go through one large write buffer, so memory stays flat however
+  big the document gets and no text is copied more than once
+- The document is written next to its target and moved into place when
+  it is complete, so a failed run never leaves half a file behind
+- A document whose bytes did not change is not replaced, so the existing
+  file (and its mtime) stays valid for anything caching on it
+"""
+
+import filecmp
+import hashlib
+import os
+from typing import Iterable
+
+# --- Constants ---
+
+# Write buffer of the output file (bytes)
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+TEMP_SUFFIX = ".tmp"
+
+
+# --- Writer ---
+
+class MarkdownWriter:
+    """
+    A buffered, write-once output file.
+
+    Usable as a context manager: the file is moved into place when the
+    block finishes and discarded if it raises. Outside a `with` block,
+    call close() (or abort() on failure) yourself.
+    """
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """Start writing the document that will end up at `path`."""
+        self.path = str(path)
+        self.chars_written = 0
+        # Whether close() replaced the target (False if it was identical)
+        self.changed = False
+        self._hash = hashlib.sha1()
+        self._temp_path = self.path + TEMP_SUFFIX
+        self._file = open(self._temp_path, 'w', encoding='utf-8', buffering=buffer_size)
+
+    def write(self, *parts: str) -> None:
+        """Append text; several parts are written in order without joining them."""
+        for part in parts:
+            self._file.write(part)
+            self._hash.update(part.encode('utf-8', 'surrogatepass'))
+            self.chars_written += len(part)
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Append each line followed by a newline."""
+        for line in lines:
+            self.write(line, "\n")
+
+    def digest(self) -> str:
+        """SHA-1 of everything written so far."""
+        return self._hash.hexdigest()
+
+    def close(self) -> str:
+        """
+        Finish the document and move it into place, unless the target
+        already holds exactly these bytes; returns its path.
+        """
+        if not self._file.closed:
+            self._file.close()
+            if os.path.isfile(self.path) and filecmp.cmp(self._temp_path, self.path, shallow=False):
+                os.remove(self._temp_path)
+            else:
+                os.replace(self._temp_path, self.path)
+                self.changed = True
+        return self.path
+
+    def abort(self) -> None:
+        """Discard everything written so far; an existing document is kept."""
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self._temp_path)
+
+    def __enter__(self) -> 'MarkdownWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    """Write a whole document through a MarkdownWriter; True if the file changed."""
+    with MarkdownWriter(path) as out:
+        out.write(text)
+    return out.changed
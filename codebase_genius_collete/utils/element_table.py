@@ -0,0 +1,162 @@
+"""
+Per-File Element Tables.
+
+In the hybrid graph mode a code_file does not get one graph node (and
+one 'defines' edge) per function, class, walker and node_def. Its
+symbols are kept in a compact column table attached to the file node
+instead, and only the symbols at either end of a cross-file 'calls' or
+'inherits' relationship are promoted to real nodes so those edges can
+exist on the graph. Relationships inside one file stay in the table.
+
+Rows come back as plain dicts with the same fields the node archetypes
+in nodes.jac have, so walkers can render them like serialized nodes.
+"""
+
+from array import array
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+from utils.ccg import KIND_FUNCTION, KIND_CLASS, KIND_WALKER, KIND_NODE, EDGE_CALLS, EDGE_INHERITS
+
+# --- Constants ---
+
+GRAPH_MODE_NODES = "nodes"
+GRAPH_MODE_HYBRID = "hybrid"
+GRAPH_MODES = (GRAPH_MODE_NODES, GRAPH_MODE_HYBRID)
+
+# Node archetype named by each CCG symbol kind
+ELEMENT_KINDS = {KIND_FUNCTION: 'function', KIND_CLASS: 'class_def', KIND_WALKER: 'walker_def', KIND_NODE: 'node_def'}
+
+# Marks a top-level row in the parents column
+NO_PARENT = -1
+
+
+# --- Element Table ---
+
+class ElementTable:
+    """
+    The symbols of one file, one row per symbol in definition order.
+
+    Common fields are array/list columns; function-only fields
+    (signature, params, returns) are kept for function rows only.
+    """
+
+    def __init__(self, path: str):
+        """Create an empty table for the file at `path`."""
+        self.path = path
+        self.kinds = array('B')
+        self.symbol_ids = array('i')
+        self.parents = array('i')
+        self.line_starts = array('i')
+        self.line_ends = array('i')
+        self.names: List[str] = []
+        self.docstrings: List[str] = []
+        self.functions: Dict[int, Tuple[str, List[str], str]] = {}
+        # Same-file relationships: row -> target rows
+        self.calls: Dict[int, List[int]] = {}
+        self.bases: Dict[int, List[int]] = {}
+        self._rows_by_symbol: Dict[int, int] = {}
+        self._rows_by_name: Optional[Dict[str, List[int]]] = None
+
+    def add(self, symbol_id: int, kind: int, parent_id: int, fields: Dict[str, Any]) -> int:
+        """Append a CCG spawn record's symbol; returns its row."""
+        row = len(self.kinds)
+        self.kinds.append(kind)
+        self.symbol_ids.append(symbol_id)
+        self.parents.append(self._rows_by_symbol.get(parent_id, NO_PARENT))
+        self.line_starts.append(fields['line_start'])
+        self.line_ends.append(fields['line_end'])
+        self.names.append(fields['name'])
+        self.docstrings.append(fields['docstring'])
+        if kind == KIND_FUNCTION:
+            self.functions[row] = (fields['signature'], fields['params'], fields['returns'])
+        self._rows_by_symbol[symbol_id] = row
+        self._rows_by_name = None
+        return row
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def row_of(self, symbol_id: int) -> Optional[int]:
+        """The row of a CCG symbol ID, or None if it is not in this file."""
+        return self._rows_by_symbol.get(symbol_id)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """One symbol's fields, shaped like its serialized node."""
+        data = {
+            'kind': ELEMENT_KINDS[self.kinds[row]],
+            'name': self.names[row],
+            'docstring': self.docstrings[row],
+            'line_start': self.line_starts[row],
+            'line_end': self.line_ends[row],
+            'file_path': self.path
+        }
+        if row in self.functions:
+            data['signature'], data['params'], data['returns'] = self.functions[row]
+        return data
+
+    def rows(self, kind: Optional[str] = None, top_level: bool = False) -> Iterator[int]:
+        """
+        Rows in definition order.
+
+        Args:
+            kind: Only rows of this archetype ('function', 'class_def', ...).
+            top_level: Only rows not nested in a class.
+        """
+        for row, row_kind in enumerate(self.kinds):
+            if kind is not None and ELEMENT_KINDS[row_kind] != kind:
+                continue
+            if top_level and self.parents[row] != NO_PARENT:
+                continue
+            yield row
+
+    def methods(self, class_row: int) -> List[int]:
+        """Rows of the functions defined directly in a class."""
+        return [row for row, parent in enumerate(self.parents) if parent == class_row]
+
+    def find(self, name: str) -> List[int]:
+        """Rows of every symbol with this name."""
+        if self._rows_by_name is None:
+            self._rows_by_name = {}
+            for row, row_name in enumerate(self.names):
+                self._rows_by_name.setdefault(row_name, []).append(row)
+        return self._rows_by_name.get(name, [])
+
+
+# --- Building ---
+
+def build_element_tables(ccg, records: Iterable[tuple]) -> Tuple[Dict[str, ElementTable], set]:
+    """
+    Split a linked CCG's symbols into per-file tables.
+
+    Args:
+        ccg: The linked ColumnarCCG.
+        records: Its spawn records for the files on the graph
+            (ColumnarCCG.spawn_records).
+
+    Returns:
+        (tables, promoted): an ElementTable per file path, and the
+        symbol IDs that have a cross-file 'calls' or 'inherits' edge and
+        so must also be spawned as nodes.
+    """
+    tables: Dict[str, ElementTable] = {}
+    table_of: Dict[int, ElementTable] = {}
+    for symbol_id, kind, parent_id, file_path, fields in records:
+        table = tables.get(file_path)
+        if table is None:
+            table = tables[file_path] = ElementTable(file_path)
+        table.add(symbol_id, kind, parent_id, fields)
+        table_of[symbol_id] = table
+
+    promoted = set()
+    if ccg.graph is not None:
+        for source, target, edge_type in ccg.graph.edges():
+            if edge_type not in (EDGE_CALLS, EDGE_INHERITS) or source not in table_of or target not in table_of:
+                continue
+            table = table_of[source]
+            if table is table_of[target]:
+                links = table.calls if edge_type == EDGE_CALLS else table.bases
+                links.setdefault(table.row_of(source), []).append(table.row_of(target))
+            else:
+                promoted.add(source)
+                promoted.add(target)
+    return tables, promoted
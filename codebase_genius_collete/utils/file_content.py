@@ -0,0 +1,187 @@
+"""
+File Content Service.
+
+Reads each source file once and hands the same buffer to every consumer
+(pre-parse checks, parsing, line counting, hashing, README parsing):
+- Small files are read into a `bytes` object; large ones are mapped
+  with `mmap` so the OS pages them in on demand
+- Line counts and digests are derived lazily from that buffer and
+  cached on the entry; decoded text is produced on demand and not kept,
+  so the cache holds only the raw buffers its budget counts
+- Entries live in a bounded LRU keyed by path and invalidated when the
+  file's size or mtime changes; mapped buffers are closed on eviction
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+# --- Constants ---
+
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 256 * 1024
+
+# Total buffer bytes kept in the default cache
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+# --- File Content ---
+
+def count_newlines(data: Union[bytes, mmap.mmap]) -> int:
+    """
+    Count b'\\n' in a buffer with C-level bytes.count scans.
+
+    A mapped buffer is scanned in MMAP_THRESHOLD chunks instead of being
+    copied whole.
+    """
+    if isinstance(data, bytes):
+        return data.count(b'\n')
+    with memoryview(data) as view:
+        return sum(
+            view[i:i + MMAP_THRESHOLD].tobytes().count(b'\n')
+            for i in range(0, len(view), MMAP_THRESHOLD)
+        )
+
+
+class FileContent:
+    """
+    The contents of one file, read once.
+
+    `data` is a bytes-like buffer (bytes or a read-only mmap); it
+    supports len(), slicing and the buffer protocol.
+    """
+
+    def __init__(self, path: str, data: Union[bytes, mmap.mmap], stamp: tuple):
+        """Wrap a buffer read from `path` when it had the given (size, mtime)."""
+        self.path = path
+        self.data = data
+        self.stamp = stamp
+        self._lines: Optional[int] = None
+        self._digest: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def decode(self, errors: str = 'strict') -> str:
+        """The UTF-8 text, decoded on every call (keep it if you need it twice)."""
+        return str(self.data, 'utf-8', errors)
+
+    @property
+    def text(self) -> str:
+        """The strictly decoded UTF-8 text (raises UnicodeDecodeError)."""
+        return self.decode()
+
+    @property
+    def lines(self) -> int:
+        """Line count, matching len(text.split('\\n'))."""
+        if self._lines is None:
+            self._lines = count_newlines(self.data) + 1
+        return self._lines
+
+    @property
+    def digest(self) -> str:
+        """SHA-1 of the raw bytes (git-independent change detection)."""
+        if self._digest is None:
+            self._digest = hashlib.sha1(self.data).hexdigest()
+        return self._digest
+
+    def close(self) -> None:
+        """Unmap a memory-mapped buffer now instead of at garbage collection."""
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                # Still exported (e.g. a live memoryview); the GC unmaps it later
+                pass
+
+
+def _read(path: str, stamp: tuple) -> FileContent:
+    """Read or map a file into a FileContent."""
+    with open(path, 'rb') as f:
+        if stamp[0] >= MMAP_THRESHOLD:
+            # The mapping stays valid after the file object is closed
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    return FileContent(path, data, stamp)
+
+
+# --- LRU Cache ---
+
+class FileContentCache:
+    """
+    Bounded LRU of FileContent entries.
+
+    The budget counts raw buffer bytes, the only thing entries keep. A
+    file larger than the whole budget is still returned, just not kept.
+    Evicted, replaced and discarded entries are closed, so use an entry
+    before reading further files through the same cache. Safe to share
+    between threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """Create an empty cache holding at most `max_bytes` of buffers."""
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, FileContent]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> FileContent:
+        """
+        Return the contents of a file, reading it only on a miss.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.stamp == stamp:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        entry = _read(path, stamp)
+        with self._lock:
+            self.misses += 1
+            self._drop(path)
+            if entry.size <= self.max_bytes:
+                self.entries[path] = entry
+                self.total_bytes += entry.size
+                while self.total_bytes > self.max_bytes:
+                    self._drop(next(iter(self.entries)))
+        return entry
+
+    def _drop(self, path: str) -> None:
+        """Remove and close an entry; the caller holds the lock."""
+        old = self.entries.pop(path, None)
+        if old is not None:
+            self.total_bytes -= old.size
+            old.close()
+
+    def discard(self, path: str) -> None:
+        """Forget a file (e.g. after it was deleted or rewritten)."""
+        with self._lock:
+            self._drop(path)
+
+    def clear(self) -> None:
+        """Forget every file, closing their buffers."""
+        with self._lock:
+            for path in list(self.entries):
+                self._drop(path)
+
+
+# Process-wide cache shared by the parsers and agents
+DEFAULT_CACHE = FileContentCache()
+
+
+def read_file_content(path: str) -> FileContent:
+    """Read a file through the shared cache."""
+    return DEFAULT_CACHE.get(path)
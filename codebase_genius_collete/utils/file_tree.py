@@ -1,10 +1,13 @@
 """
 File Tree Generation Utilities.
 
-Provides constants for ignoring common directories/files and
-a helper function to generate a markdown file tree from the graph.
+Provides constants for ignoring common directories/files, detection of
+vendored dependency trees, and a helper function to generate a markdown
+file tree from the graph.
 """
+import glob
 import os
+from typing import Optional
 
 # --- Constants (Imported by Jac) ---
 
@@ -25,7 +28,8 @@ IGNORE_DIRS = {
     '.jac_cache'
 }
 
-# Files to ignore during repository mapping
+# Files to ignore during repository mapping (names or glob patterns,
+# matched by utils.ignore_matcher)
 IGNORE_FILES = {
     '.DS_Store', 
     '.env', 
@@ -36,6 +40,54 @@ IGNORE_FILES = {
 }
 
 
+# Directory names that always hold installed third-party packages
+VENDORED_DIR_NAMES = {
+    'site-packages': "site-packages",
+    'dist-packages': "site-packages",
+    'node_modules': "node_modules",
+    'bower_components': "bower_components",
+}
+
+# Installed-package metadata directories
+VENDORED_DIR_SUFFIXES = ('.dist-info', '.egg-info')
+
+
+# --- Vendored Tree Detection ---
+
+def vendored_dir_reason(dir_path: str, name: Optional[str] = None) -> Optional[str]:
+    """
+    Tell whether a directory is a vendored dependency tree.
+
+    Detection uses markers rather than names, so renamed environments
+    (e.g. 'venv-backup-2025...') are caught too:
+    - a pyvenv.cfg file (virtualenv / venv)
+    - a conda-meta folder (conda environment)
+    - a lib/python*/site-packages layout (venv without pyvenv.cfg)
+    - site-packages, node_modules and similar install folders
+    - *.dist-info / *.egg-info package metadata
+
+    Args:
+        dir_path: Path of the directory.
+        name: Its base name, if already known.
+
+    Returns:
+        A short reason to report, or None if the directory is not vendored.
+    """
+    name = name if name is not None else os.path.basename(dir_path)
+    if name in VENDORED_DIR_NAMES:
+        return VENDORED_DIR_NAMES[name]
+    if name.endswith(VENDORED_DIR_SUFFIXES):
+        return "package metadata"
+    if os.path.isfile(os.path.join(dir_path, 'pyvenv.cfg')):
+        return "virtualenv (pyvenv.cfg)"
+    if os.path.isdir(os.path.join(dir_path, 'conda-meta')):
+        return "conda environment"
+    lib = os.path.join(dir_path, 'lib')
+    if os.path.isdir(lib) and glob.glob(os.path.join(glob.escape(lib), 'python*', 'site-packages')):
+        return "Python environment (lib/python*/site-packages)"
+    return None
+
+
 # --- Helper Function (Imported by Jac) ---
 
 def generate_file_tree_md(repo_node) -> str:
@@ -0,0 +1,116 @@
+"""
+Documentation Fragment Cache.
+
+Keeps rendered pieces of the generated documentation (per-file API
+blocks, diagram sections, HTML of markdown chunks, ...) on disk, keyed
+by a hash of the inputs they were rendered from, so regenerating the
+docs after a small commit only re-renders what those inputs changed:
+- Fragments live in one folder per namespace, one file per fragment
+- A fragment is looked up by content_key(inputs); identical inputs give
+  the same key in every run
+- prune() drops the fragments of touched namespaces that the current
+  run did not use, so the cache does not grow with every commit
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Set
+
+# --- Constants ---
+
+FRAGMENT_CACHE_DIRNAME = "fragments"
+FRAGMENT_SUFFIX = ".frag"
+
+
+# --- Keys ---
+
+def content_key(*inputs: Any) -> str:
+    """A stable hash of JSON-like inputs (dict key order does not matter)."""
+    data = json.dumps(inputs, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+# --- Cache ---
+
+class FragmentCache:
+    """
+    Rendered text fragments stored under `directory`, by namespace and key.
+
+    Only the process that owns the cache reads and writes it; worker
+    processes return rendered text and the owner stores it.
+    """
+
+    def __init__(self, directory: str):
+        """Use (and create if needed) the cache folder `directory`."""
+        self.directory = str(directory)
+        self.hits = 0
+        self.misses = 0
+        self._used: Dict[str, Set[str]] = {}
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.directory, namespace, key + FRAGMENT_SUFFIX)
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """The fragment stored for a key, or None (counted as a miss)."""
+        self._used.setdefault(namespace, set()).add(key)
+        try:
+            with open(self._path(namespace, key), 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def put(self, namespace: str, key: str, text: str) -> None:
+        """Store a fragment; a failed write only costs a re-render next time."""
+        self._used.setdefault(namespace, set()).add(key)
+        path = self._path(namespace, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"  ! Warning: Could not cache fragment {namespace}/{key}. Error: {e}")
+
+    def render(self, namespace: str, inputs: Any, render: Callable[..., str], *args: Any, **kwargs: Any) -> str:
+        """
+        The fragment for `inputs`, calling render(*args, **kwargs) only on a miss.
+
+        Args:
+            namespace: The kind of fragment (one folder per namespace).
+            inputs: Everything the fragment depends on (see content_key).
+            render: Produces the fragment text.
+        """
+        key = content_key(inputs)
+        text = self.get(namespace, key)
+        if text is None:
+            text = render(*args, **kwargs)
+            self.put(namespace, key, text)
+        return text
+
+    def prune(self) -> int:
+        """
+        Remove the fragments this run did not use, in the namespaces it used.
+
+        Returns:
+            The number of fragments removed.
+        """
+        removed = 0
+        for namespace, used in self._used.items():
+            folder = os.path.join(self.directory, namespace)
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith(FRAGMENT_SUFFIX) and name[:-len(FRAGMENT_SUFFIX)] not in used:
+                    try:
+                        os.remove(os.path.join(folder, name))
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
@@ -0,0 +1,322 @@
+"""
+Repository Graph Snapshots.
+
+Saves the graph built by repo_mapper and code_analyzer (everything in
+nodes.jac) to one versioned binary file, and reloads it without
+re-mapping or re-analyzing the repository:
+- One node table per kind, made of `array` columns (strings are
+  interned once in a shared string table)
+- All edges in one CSR adjacency over global node IDs
+- Reload memory-maps the file: columns are zero-copy views into the
+  mapping and a node's dict is only built when it is accessed
+"""
+
+import json
+import mmap
+import os
+from array import array
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from utils.ccg import StringTable, CSRGraph, KIND_FUNCTION, KIND_CLASS, KIND_WALKER, KIND_NODE, EDGE_CALLS, EDGE_INHERITS, NONE_ID
+from utils.ccg import SNAPSHOT_VERSION as CCG_VERSION
+from utils.element_table import GRAPH_MODE_NODES
+from utils.python_parser import PARSE_MODE_FULL
+
+# --- Constants ---
+
+GRAPH_SNAPSHOT_MAGIC = b'CGG1'
+GRAPH_SNAPSHOT_VERSION = 2
+GRAPH_SNAPSHOT_FILENAME = "graph.bin"
+
+# Column types: 's' interned string, 'i' integer, 'l' list of strings
+NODE_TABLES = {
+    'repository': (('repo_url', 's'), ('name', 's'), ('local_path', 's'), ('output_path', 's')),
+    'folder': (('name', 's'), ('path', 's')),
+    # Analyzed files (code_file nodes) carry a language; others have none
+    'file': (('name', 's'), ('path', 's'), ('extension', 's'), ('lines', 'i'), ('language', 's')),
+    'function': (('name', 's'), ('signature', 's'), ('params', 'l'), ('returns', 's'),
+                 ('docstring', 's'), ('line_start', 'i'), ('line_end', 'i')),
+    'class_def': (('name', 's'), ('docstring', 's'), ('line_start', 'i'), ('line_end', 'i')),
+    'walker_def': (('name', 's'), ('docstring', 's'), ('line_start', 'i'), ('line_end', 'i')),
+    'node_def': (('name', 's'), ('docstring', 's'), ('line_start', 'i'), ('line_end', 'i')),
+}
+NODE_KINDS = tuple(NODE_TABLES)
+
+# Node archetype for each CCG symbol kind spawned by code_analyzer
+SYMBOL_TABLES = {KIND_FUNCTION: 'function', KIND_CLASS: 'class_def', KIND_WALKER: 'walker_def', KIND_NODE: 'node_def'}
+
+GRAPH_EDGE_TYPES = ('contains', 'defines', 'calls', 'inherits')
+_CONTAINS, _DEFINES, _CALLS, _INHERITS = range(len(GRAPH_EDGE_TYPES))
+
+# Separator for list columns (params); never part of an identifier
+_LIST_SEPARATOR = '\x1f'
+
+# Column data starts on this boundary so mapped views are aligned
+_ALIGNMENT = 8
+
+
+# --- Saving ---
+
+def save_graph_snapshot(path: str, repo_node, ccg, file_lines: Dict[str, int], commit: Optional[str],
+                        parse_mode: str = PARSE_MODE_FULL, graph_mode: str = GRAPH_MODE_NODES) -> None:
+    """
+    Write the repository graph to a snapshot file.
+
+    Structure nodes come from the repository node's registries; symbol
+    nodes and their edges come from the linked CCG exactly as
+    code_analyzer spawns them ('defines' from a symbol to its class or
+    file, 'contains' from a folder to its entries).
+
+    Args:
+        path: Snapshot file to write.
+        repo_node: The repository node (registries, stats, README data).
+        ccg: The linked ColumnarCCG the symbols were spawned from.
+        file_lines: Line count per analyzed (code_file) path.
+        commit: The commit the graph describes.
+        parse_mode: The parse mode the CCG was built with ('outline'
+            graphs have no call edges).
+        graph_mode: The graph mode the symbols were spawned in.
+    """
+    strings = StringTable()
+    intern = strings.intern
+    tables = {kind: {field: array('i') for field, _ in fields} for kind, fields in NODE_TABLES.items()}
+
+    def add_row(kind: str, values: Dict[str, Any]) -> int:
+        table = tables[kind]
+        for field, column_type in NODE_TABLES[kind]:
+            value = values.get(field)
+            if column_type == 'i':
+                table[field].append(value or 0)
+            elif column_type == 'l':
+                table[field].append(intern(_LIST_SEPARATOR.join(value or [])))
+            else:
+                table[field].append(intern(value))
+        return len(table[NODE_TABLES[kind][0][0]]) - 1
+
+    registry = getattr(repo_node, 'registry', {}) or {}
+    add_row('repository', {f: getattr(repo_node, f, None) for f, _ in NODE_TABLES['repository']})
+    folder_rows = {}
+    for folder in registry.get('folder', []):
+        folder_rows[folder.path] = add_row('folder', {'name': folder.name, 'path': folder.path})
+    code_paths = {f.path for f in registry.get('code_file', [])}
+    file_rows = {}
+    for file in registry.get('file', []):
+        is_code = file.path in code_paths
+        file_rows[file.path] = add_row('file', {
+            'name': file.name, 'path': file.path, 'extension': file.extension,
+            'lines': file_lines.get(file.path, 0) if is_code else 0,
+            'language': ("python" if file.extension == ".py" else "jac") if is_code else None
+        })
+    symbol_rows = {}
+    records = ccg.spawn_records(list(file_rows))
+    for symbol_id, kind, _, _, fields in records:
+        symbol_rows[symbol_id] = (SYMBOL_TABLES[kind], add_row(SYMBOL_TABLES[kind], fields))
+
+    # Global node ID = offset of the kind's table + row
+    counts = [len(tables[kind][NODE_TABLES[kind][0][0]]) for kind in NODE_KINDS]
+    offsets = {kind: sum(counts[:i]) for i, kind in enumerate(NODE_KINDS)}
+
+    def gid(kind: str, row: int) -> int:
+        return offsets[kind] + row
+
+    sources, targets, types = array('i'), array('i'), array('B')
+
+    def add_edge(source: int, target: int, edge_type: int) -> None:
+        sources.append(source)
+        targets.append(target)
+        types.append(edge_type)
+
+    for folder_path, row in folder_rows.items():
+        parent = folder_rows.get(os.path.dirname(folder_path))
+        add_edge(gid('folder', parent) if parent is not None else 0, gid('folder', row), _CONTAINS)
+    for file_path, row in file_rows.items():
+        parent = folder_rows.get(os.path.dirname(file_path))
+        add_edge(gid('folder', parent) if parent is not None else 0, gid('file', row), _CONTAINS)
+    for symbol_id, _, parent_id, file_path, _ in records:
+        kind, row = symbol_rows[symbol_id]
+        owner = symbol_rows.get(parent_id)
+        add_edge(gid(kind, row), gid(*owner) if owner else gid('file', file_rows[file_path]), _DEFINES)
+    if ccg.graph is not None:
+        for source, target, edge_type in ccg.graph.edges():
+            if edge_type in (EDGE_CALLS, EDGE_INHERITS) and source in symbol_rows and target in symbol_rows:
+                add_edge(gid(*symbol_rows[source]), gid(*symbol_rows[target]),
+                         _CALLS if edge_type == EDGE_CALLS else _INHERITS)
+    graph = CSRGraph.from_edges(sum(counts), sources, targets, types)
+
+    buffers = [(f"{kind}.{field}", tables[kind][field]) for kind, fields in NODE_TABLES.items() for field, _ in fields]
+    buffers += [('edges.indptr', graph.indptr), ('edges.indices', graph.indices), ('edges.types', graph.edge_types)]
+    header = json.dumps({
+        'version': GRAPH_SNAPSHOT_VERSION,
+        'commit': commit,
+        # Everything besides the commit that shapes the graph
+        'parse_mode': parse_mode,
+        'graph_mode': graph_mode,
+        'ccg_version': CCG_VERSION,
+        'counts': dict(zip(NODE_KINDS, counts)),
+        'readme_summary': getattr(repo_node, 'readme_summary', {}) or {},
+        'stats': getattr(repo_node, 'stats', {}) or {},
+        'strings': strings.strings,
+        'columns': [[name, arr.typecode, len(arr)] for name, arr in buffers]
+    }).encode('utf-8')
+
+    with open(path, 'wb') as f:
+        f.write(GRAPH_SNAPSHOT_MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for _, arr in buffers:
+            f.write(bytes(-f.tell() % _ALIGNMENT))
+            f.write(memoryview(arr))
+
+
+# --- Loading ---
+
+class GraphSnapshot:
+    """
+    A memory-mapped, read-only repository graph.
+
+    Node IDs are global: the node tables are laid out one after another
+    in NODE_KINDS order. Node dicts are materialized on first access
+    and then cached.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+
+        Raises:
+            ValueError: If the file is not a graph snapshot of this version.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:4] != GRAPH_SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a graph snapshot: {path}")
+        header_len = int.from_bytes(self._mmap[4:12], 'little')
+        header = json.loads(self._mmap[12:12 + header_len].decode('utf-8'))
+        if header.get('version') != GRAPH_SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported graph snapshot version: {header.get('version')}")
+
+        self.commit: Optional[str] = header['commit']
+        self.parse_mode: str = header['parse_mode']
+        self.graph_mode: str = header['graph_mode']
+        self.ccg_version: int = header['ccg_version']
+        self.counts: Dict[str, int] = header['counts']
+        self.readme_summary: Dict[str, Any] = header['readme_summary']
+        self.stats: Dict[str, Any] = header['stats']
+        self.strings: List[str] = header['strings']
+        self.offsets: Dict[str, int] = {}
+        total = 0
+        for kind in NODE_KINDS:
+            self.offsets[kind] = total
+            total += self.counts[kind]
+
+        # Zero-copy column views into the mapping
+        view = memoryview(self._mmap)
+        self._columns: Dict[str, memoryview] = {}
+        position = 12 + header_len
+        for name, typecode, length in header['columns']:
+            position += -position % _ALIGNMENT
+            size = length * array(typecode).itemsize
+            self._columns[name] = view[position:position + size].cast(typecode)
+            position += size
+        self.graph = CSRGraph(self._columns['edges.indptr'], self._columns['edges.indices'],
+                              self._columns['edges.types'])
+        self._cache: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self.graph.num_nodes
+
+    def kind_of(self, node_id: int) -> Tuple[str, int]:
+        """(kind, row) of a global node ID."""
+        for kind in reversed(NODE_KINDS):
+            if node_id >= self.offsets[kind] and self.counts[kind]:
+                return kind, node_id - self.offsets[kind]
+        raise IndexError(node_id)
+
+    def node(self, node_id: int) -> Dict[str, Any]:
+        """The fields of one node (built on first access)."""
+        data = self._cache.get(node_id)
+        if data is None:
+            kind, row = self.kind_of(node_id)
+            data = {'id': node_id, 'kind': kind}
+            for field, column_type in NODE_TABLES[kind]:
+                value = self._columns[f"{kind}.{field}"][row]
+                if column_type == 'i':
+                    data[field] = value
+                elif value == NONE_ID:
+                    data[field] = [] if column_type == 'l' else None
+                elif column_type == 'l':
+                    data[field] = self.strings[value].split(_LIST_SEPARATOR) if self.strings[value] else []
+                else:
+                    data[field] = self.strings[value]
+            self._cache[node_id] = data
+        return data
+
+    def nodes(self, kind: str) -> Iterator[Dict[str, Any]]:
+        """Every node of one kind, materialized as it is reached."""
+        offset = self.offsets[kind]
+        for row in range(self.counts[kind]):
+            yield self.node(offset + row)
+
+    def edges(self) -> Iterator[Tuple[int, int, str]]:
+        """Every edge as (source ID, target ID, edge type name)."""
+        for source, target, edge_type in self.graph.edges():
+            yield source, target, GRAPH_EDGE_TYPES[edge_type]
+
+    def neighbours(self, node_id: int, edge_type: Optional[str] = None) -> List[int]:
+        """Out-neighbours of a node, optionally of one edge type."""
+        if edge_type is None:
+            return self.graph.neighbours(node_id)
+        return self.graph.neighbours(node_id, GRAPH_EDGE_TYPES.index(edge_type))
+
+    def spawn_records(self) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """
+        (node ID, archetype name, constructor kwargs) for every node but
+        the repository, parents before children. Analyzed files come
+        out as 'code_file'; other files as plain 'file'.
+        """
+        for kind in NODE_KINDS[1:]:
+            for data in self.nodes(kind):
+                fields = {k: v for k, v in data.items() if k not in ('id', 'kind')}
+                archetype = kind
+                if kind == 'file':
+                    if fields['language']:
+                        archetype = 'code_file'
+                    else:
+                        del fields['lines'], fields['language']
+                yield data['id'], archetype, fields
+
+    def close(self) -> None:
+        """Release the mapping (views must no longer be used)."""
+        for column in self._columns.values():
+            column.release()
+        self.graph = None
+        self._mmap.close()
+
+
+def load_graph_snapshot(path: str, commit: Optional[str] = None, parse_mode: Optional[str] = None,
+                        graph_mode: str = GRAPH_MODE_NODES) -> Optional[GraphSnapshot]:
+    """
+    Map a snapshot if it exists and describes the given commit, built
+    with the given parse and graph modes by the current CCG format.
+
+    Returns:
+        The snapshot, or None if it is missing, unreadable or stale.
+        Without a commit nothing is reused.
+    """
+    if not commit or not os.path.exists(path):
+        return None
+    try:
+        snapshot = GraphSnapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"  ! Ignoring unreadable graph snapshot: {e}")
+        return None
+    stale = (
+        snapshot.commit != commit
+        or (parse_mode is not None and snapshot.parse_mode != parse_mode)
+        or snapshot.graph_mode != graph_mode
+        or snapshot.ccg_version != CCG_VERSION
+    )
+    if stale:
+        snapshot.close()
+        return None
+    return snapshot
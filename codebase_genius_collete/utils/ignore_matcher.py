@@ -0,0 +1,221 @@
+"""
+Repository Ignore Matcher.
+
+One place that decides whether a path inside a checkout is skipped, used
+by every traversal (repo walker, structure writer, README search,
+frontend reader):
+- The built-in sets from file_tree: IGNORE_DIRS (directory names),
+  IGNORE_FILES (names and glob patterns such as '*.pyc') and hidden
+  entries
+- The repository's .gitignore files (the root one and any nested ones)
+  and .git/info/exclude, with git's precedence: deeper files win over
+  shallower ones, later lines over earlier ones, '!' re-includes
+
+Every .gitignore is compiled once into a single regex (one named group
+per rule, last rule first), so checking an entry is one fullmatch per
+.gitignore level instead of one fnmatch per pattern.
+"""
+
+import fnmatch
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from utils.file_tree import IGNORE_DIRS, IGNORE_FILES
+
+# --- Constants ---
+
+GITIGNORE_FILENAME = ".gitignore"
+GIT_EXCLUDE_PATH = os.path.join(".git", "info", "exclude")
+
+
+# --- Pattern Compilation ---
+
+def _translate_glob(glob: str) -> str:
+    """Translate one gitignore glob (without '!', anchors or a trailing '/') to a regex."""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == '*':
+            if glob.startswith('**', i) and (i == 0 or glob[i - 1] == '/') and (i + 2 == n or glob[i + 2] == '/'):
+                if i + 2 == n:
+                    out.append('.*')  # 'dir/**': everything inside
+                    i += 2
+                else:
+                    out.append('(?:.*/)?')  # '**/': zero or more directories
+                    i += 3
+                continue
+            while i < n and glob[i] == '*':
+                i += 1
+            out.append('[^/]*')
+            continue
+        if c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i + 1
+            if j < n and glob[j] in '!^':
+                j += 1
+            if j < n and glob[j] == ']':
+                j += 1
+            j = glob.find(']', j)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:j].replace('\\', '\\\\')
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def compile_gitignore_rule(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Compile one .gitignore line.
+
+    Returns:
+        (regex, negated, dir_only), where the regex fullmatches paths
+        relative to the .gitignore's directory, or None for blank and
+        comment lines.
+    """
+    line = line.rstrip('\n').rstrip('\r')
+    # Trailing spaces are dropped unless escaped
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    if not line or line.startswith('#'):
+        return None
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to this directory
+    anchored = '/' in line
+    regex = _translate_glob(line.lstrip('/'))
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return regex, negated, dir_only
+
+
+class GitignoreRules:
+    """The compiled rules of one ignore file, relative to `base` ('' = repo root)."""
+
+    def __init__(self, base: str, lines: List[str]):
+        """Compile the lines of an ignore file found in directory `base`."""
+        self.base = base
+        rules = [rule for rule in map(compile_gitignore_rule, lines) if rule]
+        self.negated = {f"r{i}" for i, rule in enumerate(rules) if rule[1]}
+        # Last rule first, so the first alternative to match is the one git applies
+        ordered = list(enumerate(rules))[::-1]
+        self.any_regex = self._combine([(i, r) for i, r in ordered])
+        self.file_regex = self._combine([(i, r) for i, r in ordered if not r[2]])
+
+    @staticmethod
+    def _combine(rules: list) -> Optional["re.Pattern"]:
+        if not rules:
+            return None
+        return re.compile('|'.join(f"(?P<r{i}>{rule[0]})" for i, rule in rules), re.DOTALL)
+
+    def __bool__(self) -> bool:
+        return self.any_regex is not None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by '!', None if no rule matches."""
+        regex = self.any_regex if is_dir else self.file_regex
+        if regex is None:
+            return None
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        m = regex.fullmatch(rel_path)
+        if m is None:
+            return None
+        return m.lastgroup not in self.negated
+
+
+def _read_lines(path: str) -> List[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.readlines()
+    except OSError:
+        return []
+
+
+# --- Matcher ---
+
+class IgnoreMatcher:
+    """
+    Decides, per directory entry, whether a walk should skip it.
+
+    Walkers must not descend into ignored directories: a path below an
+    ignored directory is not re-checked against its ancestors. Nested
+    .gitignore files are loaded the first time their directory is
+    looked at and cached. Safe to share between threads.
+    """
+
+    def __init__(self, root: str, use_gitignore: bool = True, hidden: bool = True):
+        """
+        Args:
+            root: The repository checkout.
+            use_gitignore: Honour .gitignore files and .git/info/exclude.
+            hidden: Skip names starting with '.' (the walkers' long-standing rule).
+        """
+        self.root = root
+        self._prefix = os.path.join(root, '')
+        self.use_gitignore = use_gitignore
+        self.hidden = hidden
+        self._dir_names = re.compile('|'.join(map(re.escape, sorted(IGNORE_DIRS))))
+        self._file_names = re.compile('|'.join(fnmatch.translate(p) for p in sorted(IGNORE_FILES)))
+        self._chains: Dict[str, Tuple[GitignoreRules, ...]] = {}
+        self._exclude = GitignoreRules('', _read_lines(os.path.join(root, GIT_EXCLUDE_PATH)) if use_gitignore else [])
+
+    def _relative(self, path: str) -> str:
+        if path.startswith(self._prefix):
+            rel = path[len(self._prefix):]
+        else:
+            rel = os.path.relpath(path, self.root)
+        return rel.replace(os.sep, '/') if os.sep != '/' else rel
+
+    def _chain(self, dir_rel: str) -> Tuple[GitignoreRules, ...]:
+        """The .gitignore rules that apply inside a directory, deepest first."""
+        chain = self._chains.get(dir_rel)
+        if chain is None:
+            parent = self._chain(dir_rel.rpartition('/')[0]) if dir_rel else ()
+            own = GitignoreRules(dir_rel, _read_lines(os.path.join(self.root, dir_rel, GITIGNORE_FILENAME)))
+            chain = ((own,) if own else ()) + parent
+            self._chains[dir_rel] = chain
+        return chain
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """
+        Whether one entry (given by its full path under the root) is skipped.
+
+        Args:
+            path: The entry's path (root-joined, as scandir/os.walk give it).
+            is_dir: Whether the entry is a directory.
+        """
+        rel = self._relative(path)
+        name = rel.rpartition('/')[2]
+        if self.hidden and name.startswith('.'):
+            return True
+        if (is_dir and self._dir_names.fullmatch(name)) or self._file_names.fullmatch(name):
+            return True
+        if not self.use_gitignore:
+            return False
+        for rules in self._chain(rel.rpartition('/')[0]):
+            decision = rules.match(rel, is_dir)
+            if decision is not None:
+                return decision
+        return bool(self._exclude.match(rel, is_dir))
@@ -0,0 +1,207 @@
+"""
+Incremental Analysis Utilities.
+
+Remembers the last analyzed commit of every repository together with a
+snapshot of its Code Context Graph (CCG). On the next run the change set
+between the two commits is taken from `git diff --name-status`, so only
+added, modified and renamed files need to be parsed again and the stored
+CCG can be patched instead of rebuilt.
+"""
+
+import json
+import os
+import subprocess
+import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# --- Constants ---
+
+# Root folder for per-repository analysis state
+ANALYSIS_STATE_ROOT = "./outputs"
+
+STATE_FILENAME = "analysis_state.json"
+CCG_SNAPSHOT_FILENAME = "ccg.bin"
+
+# Only these files are parsed, so only their changes matter
+ANALYZED_EXTENSIONS = ('.py', '.jac')
+
+
+# --- Git Helpers ---
+
+def get_head_commit(repo_path: str) -> Optional[str]:
+    """
+    Return the full SHA of HEAD in a local repository.
+
+    Args:
+        repo_path: Path to the git working tree.
+
+    Returns:
+        The commit SHA, or None if it cannot be determined.
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=repo_path, capture_output=True, text=True, timeout=30
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+    except Exception as e:
+        print(f"  ! Could not read HEAD commit: {e}")
+        return None
+
+
+def diff_name_status(repo_path: str, old_commit: str, new_commit: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    List the files that changed between two commits.
+
+    Args:
+        repo_path: Path to the git working tree.
+        old_commit: The previously analyzed commit (A).
+        new_commit: The commit to analyze now (B).
+
+    Returns:
+        A list of {'status', 'path', 'old_path'} dicts (status is the
+        first letter of git's code: A, M, D, R, C, T), or None if the
+        diff failed (e.g. commit A is not in this clone).
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--name-status', '-M', f'{old_commit}..{new_commit}'],
+            cwd=repo_path, capture_output=True, text=True, timeout=60,
+            encoding='utf-8', errors='ignore'
+        )
+    except Exception as e:
+        print(f"  ! git diff failed: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+
+    changes = []
+    for line in result.stdout.splitlines():
+        parts = line.split('\t')
+        if len(parts) < 2:
+            continue
+        status = parts[0][:1]
+        if status in ('R', 'C') and len(parts) >= 3:
+            changes.append({'status': status, 'path': parts[2], 'old_path': parts[1]})
+        else:
+            changes.append({'status': status, 'path': parts[1], 'old_path': None})
+    return changes
+
+
+# --- Analysis State ---
+
+def get_state_dir(repo_name: str, root: str = ANALYSIS_STATE_ROOT) -> Path:
+    """Directory holding the analysis state of one repository."""
+    return Path(root) / repo_name / ".analysis"
+
+
+def load_analysis_state(repo_name: str, root: str = ANALYSIS_STATE_ROOT) -> Dict[str, Any]:
+    """
+    Load the last recorded analysis state of a repository.
+
+    Returns:
+        The state dict ({'repo_url', 'commit', 'ccg_path', 'parse_mode',
+        'file_lines', 'updated'}),
+        or an empty dict if none was recorded.
+    """
+    state_file = get_state_dir(repo_name, root) / STATE_FILENAME
+    if not state_file.exists():
+        return {}
+    try:
+        return json.loads(state_file.read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f"  ! Ignoring unreadable analysis state: {e}")
+        return {}
+
+
+def save_analysis_state(repo_name: str, repo_url: str, commit: Optional[str], ccg,
+                        root: str = ANALYSIS_STATE_ROOT, parse_mode: str = "full",
+                        file_lines: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """
+    Record the analyzed commit and snapshot its CCG.
+
+    Args:
+        repo_name: Repository name (state folder name).
+        repo_url: Remote URL, stored for reference.
+        commit: The commit the CCG was built from.
+        ccg: The linked ColumnarCCG to snapshot.
+        parse_mode: The parse mode the CCG was built with.
+        file_lines: Line count of every analyzed file, so unchanged
+            files need not be read again on the next run.
+
+    Returns:
+        The state dict that was written.
+    """
+    state_dir = get_state_dir(repo_name, root)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    ccg_path = state_dir / CCG_SNAPSHOT_FILENAME
+    ccg.save(str(ccg_path))
+
+    state = {
+        'repo_url': repo_url,
+        'commit': commit,
+        'ccg_path': str(ccg_path),
+        'parse_mode': parse_mode,
+        'file_lines': file_lines or {},
+        'updated': datetime.datetime.now().isoformat()
+    }
+    (state_dir / STATE_FILENAME).write_text(json.dumps(state, indent=2), encoding='utf-8')
+    return state
+
+
+# --- Planning ---
+
+def plan_incremental_update(repo_path: str, state: Dict[str, Any], parse_mode: str = "full") -> Dict[str, Any]:
+    """
+    Decide between a full and an incremental analysis.
+
+    Args:
+        repo_path: Path to the checked-out repository.
+        state: The dict returned by load_analysis_state.
+        parse_mode: The parse mode of this job; a snapshot built in a
+            different mode cannot be patched and forces a full run.
+
+    Returns:
+        {'mode': 'full' | 'incremental' | 'unchanged', 'commit': HEAD,
+         'reparse': [paths to parse], 'removed': [paths to drop],
+         'reason': str}. Paths are joined onto repo_path the same way
+        repo_mapper builds file node paths.
+    """
+    head = get_head_commit(repo_path)
+    plan = {'mode': 'full', 'commit': head, 'reparse': [], 'removed': [], 'reason': ''}
+
+    previous = state.get('commit')
+    if not head:
+        plan['reason'] = 'not a git checkout'
+        return plan
+    if not previous or not state.get('ccg_path') or not os.path.exists(state['ccg_path']):
+        plan['reason'] = 'no previous analysis'
+        return plan
+    if state.get('parse_mode', 'full') != parse_mode:
+        plan['reason'] = f"previous analysis used {state.get('parse_mode', 'full')} mode"
+        return plan
+    if previous == head:
+        plan['mode'] = 'unchanged'
+        plan['reason'] = f'already analyzed {head[:7]}'
+        return plan
+
+    changes = diff_name_status(repo_path, previous, head)
+    if changes is None:
+        plan['reason'] = f'cannot diff {previous[:7]}..{head[:7]}'
+        return plan
+
+    for change in changes:
+        path, old_path = change['path'], change['old_path']
+        if change['status'] == 'D':
+            if path.endswith(ANALYZED_EXTENSIONS):
+                plan['removed'].append(os.path.join(repo_path, path))
+            continue
+        if change['status'] == 'R' and old_path.endswith(ANALYZED_EXTENSIONS):
+            plan['removed'].append(os.path.join(repo_path, old_path))
+        if path.endswith(ANALYZED_EXTENSIONS):
+            plan['reparse'].append(os.path.join(repo_path, path))
+
+    plan['mode'] = 'incremental'
+    plan['reason'] = f'{previous[:7]}..{head[:7]}: {len(changes)} changed paths'
+    return plan
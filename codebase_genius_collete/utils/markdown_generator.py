@@ -3,12 +3,29 @@ Markdown Generation Utilities.
 
 Provides helper functions to convert the Code Context Graph (CCG) data
 into well-formatted Markdown, including Mermaid diagrams.
+
+The per-symbol renderers are pure functions of serialized node dicts,
+so the API reference is rendered file by file on a process pool
+(render_api_blocks) and written back in the order the files came in;
+blocks of files whose symbols did not change come from the fragment
+cache instead.
 """
 
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+from utils.fragment_cache import FragmentCache, content_key
+
 # --- Constants ---
 MAX_MERMAID_NODES = 25  # Max nodes for function call graph
 MAX_CLASS_ATTRIBUTES = 7 # Max attributes to show in class diagram
 MAX_CLASS_METHODS = 7   # Max methods to show in class diagram
+API_SHARD_SIZE = 64     # Files rendered per worker task
+API_BLOCK_NAMESPACE = "api_blocks"  # Fragment cache namespace of API blocks
+SECTION_HEADING_LEVELS = 3  # Headings up to '###' start a new section
 
 
 # --- Jac-Exportable Functions ---
@@ -51,12 +68,14 @@ def function_md(func_data: dict) -> str:
     return md
 
 
-def class_md(class_data: dict) -> str:
+def class_md(class_data: dict, methods: Optional[list] = None) -> str:
     """
     Generate markdown documentation for a single class.
     
     Args:
         class_data: The dictionary for a class node from the CCG.
+        methods: The serialized function nodes the class defines; the
+            class's own 'methods' names are listed if omitted.
         
     Returns:
         A formatted markdown string.
@@ -80,7 +99,10 @@ def class_md(class_data: dict) -> str:
         md += "\n"
     
     # Show methods
-    methods = class_data.get('methods', [])
+    if methods is not None:
+        methods = [m.get('name', 'unnamed_method') for m in methods]
+    else:
+        methods = class_data.get('methods', [])
     if methods:
         md += "**Methods:**\n\n"
         for method in methods:
@@ -141,6 +163,186 @@ def walker_md(walker_data: dict) -> str:
     return md
 
 
+def node_md(node_data: dict) -> str:
+    """
+    Generate markdown documentation for a Jac node definition.
+    
+    Args:
+        node_data: The dictionary for a node_def node from the CCG.
+        
+    Returns:
+        A formatted markdown string.
+    """
+    md = f"### Node: `{node_data.get('name', 'UnnamedNode')}`\n\n"
+    
+    if node_data.get('docstring'):
+        md += f"```text\n{node_data['docstring']}\n```\n\n"
+
+    # Show attributes
+    attributes = node_data.get('attributes', [])
+    if attributes:
+        md += "**Attributes (has):**\n\n"
+        for attr in attributes:
+            md += f"- `{attr}`\n"
+        md += "\n"
+    
+    md += f"*Defined in: `{node_data.get('file_path', 'N/A')}` (Line {node_data.get('line', 0)})*\n"
+    md += "\n---\n\n"
+    return md
+
+
+# --- API Reference Blocks ---
+
+def api_block_md(relative_path: str, entry: Dict[str, Any]) -> str:
+    """
+    Generate the API reference block of one file.
+    
+    Args:
+        relative_path: The file's path relative to the repository root.
+        entry: The file's symbols, serialized and grouped as
+            {walkers, nodes, classes, methods (by class index), functions}.
+        
+    Returns:
+        A formatted markdown string.
+    """
+    parts = [f"### `{relative_path}`\n\n"]
+
+    # --- Jac Walkers ---
+    if entry["walkers"]:
+        parts.append("#### Walkers\n\n")
+        parts.extend(walker_md(w) for w in entry["walkers"])
+
+    # --- Jac Nodes ---
+    if entry["nodes"]:
+        parts.append("#### Node Definitions\n\n")
+        parts.extend(node_md(n) for n in entry["nodes"])
+
+    # --- Python/Jac Classes ---
+    if entry["classes"]:
+        parts.append("#### Classes\n\n")
+        parts.extend(class_md(c, entry["methods"].get(i, [])) for i, c in enumerate(entry["classes"]))
+
+    # --- Python/Jac Functions ---
+    # Only top-level functions; methods were grouped by class
+    if entry["functions"]:
+        parts.append("#### Functions\n\n")
+        parts.extend(function_md(f) for f in entry["functions"])
+
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _render_api_shard(shard: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+    """Worker task: the blocks of one shard of files, in order."""
+    return [api_block_md(relative_path, entry) for relative_path, entry in shard]
+
+
+def render_api_blocks(files: Iterable[Tuple[str, Dict[str, Any]]], max_workers: Optional[int] = None,
+                      shard_size: int = API_SHARD_SIZE, cache: Optional[FragmentCache] = None) -> Iterator[str]:
+    """
+    Render API reference blocks on a process pool.
+
+    Files are cut into shards of `shard_size` and each shard is rendered
+    by a worker; blocks come back in the order the files came in (pass
+    them sorted by path). Only about two shards per worker are in flight
+    at a time, so a lazy `files` iterable is consumed as blocks are
+    written. Inputs of a single shard are rendered in-process.
+
+    Args:
+        files: (relative path, api entry) pairs, one per file.
+        max_workers: Worker processes; defaults to the CPU count.
+        shard_size: Files per worker task.
+        cache: Reuse blocks rendered earlier from identical inputs (and
+            store the new ones) under the API_BLOCK_NAMESPACE namespace;
+            only files whose path or symbols changed are rendered.
+
+    Yields:
+        One markdown block per file.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    files = iter(files)
+
+    def lookup(shard):
+        # Split a shard into cached blocks (by position) and files to render
+        keys = [content_key(path, entry) for path, entry in shard] if cache else []
+        cached = {}
+        for i, key in enumerate(keys):
+            block = cache.get(API_BLOCK_NAMESPACE, key)
+            if block is not None:
+                cached[i] = block
+        return keys, cached, [item for i, item in enumerate(shard) if i not in cached]
+
+    def assemble(size, keys, cached, rendered):
+        # Blocks of a shard in input order, storing the newly rendered ones
+        rendered = iter(rendered)
+        for i in range(size):
+            if i in cached:
+                yield cached[i]
+                continue
+            block = next(rendered)
+            if cache:
+                cache.put(API_BLOCK_NAMESPACE, keys[i], block)
+            yield block
+
+    shard = list(islice(files, shard_size))
+    if workers == 1 or len(shard) < shard_size:
+        while shard:
+            keys, cached, todo = lookup(shard)
+            yield from assemble(len(shard), keys, cached, _render_api_shard(todo))
+            shard = list(islice(files, shard_size))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while shard:
+            keys, cached, todo = lookup(shard)
+            pending.append((len(shard), keys, cached, executor.submit(_render_api_shard, todo) if todo else None))
+            if len(pending) >= 2 * workers:
+                size, keys, cached, future = pending.popleft()
+                yield from assemble(size, keys, cached, future.result() if future else [])
+            shard = list(islice(files, shard_size))
+        while pending:
+            size, keys, cached, future = pending.popleft()
+            yield from assemble(size, keys, cached, future.result() if future else [])
+
+
+# --- Section Splitting ---
+
+def iter_markdown_sections(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Split a markdown document into independently convertible sections.
+
+    A section starts at each heading of level 1 to SECTION_HEADING_LEVELS
+    that is not inside a fenced code block, so a lazily read file is
+    handed on one section at a time and sections can be converted (and
+    cached) separately.
+
+    Args:
+        lines: The document's lines, with their line endings (a text
+            file object works).
+
+    Yields:
+        The text of each section, in order; joined they give the document.
+    """
+    section: List[str] = []
+    fence = None
+    for line in lines:
+        stripped = line.lstrip()
+        if fence is None:
+            if stripped.startswith(('```', '~~~')):
+                fence = stripped[:3]
+            elif stripped.startswith('#') and section and len(line) - len(stripped) < 4:
+                level = len(stripped) - len(stripped.lstrip('#'))
+                if level <= SECTION_HEADING_LEVELS and stripped[level:level + 1] in (' ', '\n', ''):
+                    yield ''.join(section)
+                    section = []
+        elif stripped.startswith(fence):
+            fence = None
+        section.append(line)
+    if section:
+        yield ''.join(section)
+
+
 def generate_mermaid_class_diagram(class_nodes: list) -> str:
     """
     Generate a Mermaid.js class diagram from all class nodes.
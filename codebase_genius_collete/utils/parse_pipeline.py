@@ -0,0 +1,181 @@
+"""
+Streaming Parse Pipeline.
+
+Parses source files one at a time and hands each result to a set of
+downstream consumers (CCG builder, statistics, writers) through bounded
+queues. No stage ever holds more than `queue_size` parse results per
+consumer, so peak memory stays flat regardless of repository size.
+
+A consumer is any object with:
+- consume(parsed: dict) -> None   called once per successfully parsed file
+- finish() -> Any                 called once at the end; its return value
+                                  is reported under the consumer's name
+"""
+
+import queue
+import threading
+from typing import Dict, Any, Iterable, Iterator, Callable, Optional
+
+from utils.ccg import ColumnarCCG, link_ccg
+
+# --- Constants ---
+
+# Parse results buffered per consumer before the parser blocks
+DEFAULT_QUEUE_SIZE = 32
+
+# Marks the end of the stream on a consumer queue
+_END_OF_STREAM = object()
+
+
+# --- Sources ---
+
+def iter_parsed_files(paths: Iterable[str], parse: Optional[Callable[..., Dict[str, Any]]] = None,
+                      mode: str = "full") -> Iterator[Dict[str, Any]]:
+    """
+    Lazily parse files, yielding one result at a time.
+
+    Args:
+        paths: Any iterable of file paths (a generator works).
+        parse: Parser to use; defaults to parse_file_by_extension.
+        mode: Parse mode passed to the parser ('full' or 'outline').
+
+    Yields:
+        Parser results. Each always carries 'file_path'; failures carry
+        'error' instead of elements.
+    """
+    if parse is None:
+        from utils.python_parser import parse_file_by_extension
+        parse = parse_file_by_extension
+    for path in paths:
+        try:
+            parsed = parse(path, mode=mode)
+        except Exception as e:
+            parsed = {'error': str(e)}
+        parsed['file_path'] = path
+        yield parsed
+
+
+# --- Consumers ---
+
+class CCGBuilderConsumer:
+    """Appends each result to a ColumnarCCG and links it at the end."""
+
+    def __init__(self, ccg: Optional[ColumnarCCG] = None):
+        """Start from an empty (or given) container."""
+        self.ccg = ccg if ccg is not None else ColumnarCCG()
+
+    def consume(self, parsed: Dict[str, Any]) -> None:
+        self.ccg.add_parsed_file(parsed)
+
+    def finish(self) -> ColumnarCCG:
+        link_ccg(self.ccg)
+        return self.ccg
+
+
+class ParseStatsConsumer:
+    """Counts parsed files and symbols without keeping the results."""
+
+    def __init__(self):
+        """Initialize zeroed counters."""
+        self.stats: Dict[str, Any] = {
+            'files': 0,
+            'symbols': {'functions': 0, 'classes': 0, 'walkers': 0, 'nodes': 0, 'edges': 0, 'abilities': 0},
+            'parsed_paths': [],
+            'fallbacks': {},
+            'lines': {}
+        }
+
+    def consume(self, parsed: Dict[str, Any]) -> None:
+        self.stats['files'] += 1
+        self.stats['parsed_paths'].append(parsed['file_path'])
+        if 'lines' in parsed:
+            self.stats['lines'][parsed['file_path']] = parsed['lines']
+        if parsed.get('fallback'):
+            self.stats['fallbacks'][parsed['file_path']] = parsed['fallback']
+        for key in self.stats['symbols']:
+            self.stats['symbols'][key] += len(parsed.get(key, []))
+
+    def finish(self) -> Dict[str, Any]:
+        return self.stats
+
+
+class CollectConsumer:
+    """Keeps every result; only for small inputs such as a diff's files."""
+
+    def __init__(self):
+        """Initialize an empty list."""
+        self.results = []
+
+    def consume(self, parsed: Dict[str, Any]) -> None:
+        self.results.append(parsed)
+
+    def finish(self) -> list:
+        return self.results
+
+
+# --- Pipeline ---
+
+def run_parse_pipeline(source: Iterable[Dict[str, Any]], consumers: Dict[str, Any],
+                       queue_size: int = DEFAULT_QUEUE_SIZE) -> Dict[str, Any]:
+    """
+    Fan a stream of parse results out to consumers over bounded queues.
+
+    Each consumer runs on its own thread. The producer (this thread)
+    blocks when any consumer's queue is full, so a slow consumer applies
+    back-pressure instead of letting results pile up in memory.
+
+    Args:
+        source: Iterable of parse results, e.g. iter_parsed_files(paths).
+        consumers: Mapping of name -> consumer object.
+        queue_size: Maximum buffered results per consumer.
+
+    Returns:
+        {name: consumer.finish() for each consumer}, plus 'errors':
+        {file_path: message} for results that failed to parse.
+
+    Raises:
+        Exception: The first exception raised by a consumer.
+    """
+    queues = {name: queue.Queue(maxsize=queue_size) for name in consumers}
+    failures: Dict[str, BaseException] = {}
+
+    def drain(name: str, consumer: Any) -> None:
+        q = queues[name]
+        while True:
+            item = q.get()
+            if item is _END_OF_STREAM:
+                return
+            if name in failures:
+                continue  # Keep draining so the producer never blocks
+            try:
+                consumer.consume(item)
+            except BaseException as e:
+                failures[name] = e
+
+    threads = [
+        threading.Thread(target=drain, args=(name, consumer), name=f"parse-consumer-{name}", daemon=True)
+        for name, consumer in consumers.items()
+    ]
+    for thread in threads:
+        thread.start()
+
+    errors: Dict[str, str] = {}
+    try:
+        for parsed in source:
+            if parsed.get('error'):
+                errors[parsed.get('file_path', '?')] = parsed['error']
+                continue
+            for q in queues.values():
+                q.put(parsed)
+    finally:
+        for q in queues.values():
+            q.put(_END_OF_STREAM)
+        for thread in threads:
+            thread.join()
+
+    if failures:
+        raise next(iter(failures.values()))
+
+    results = {name: consumer.finish() for name, consumer in consumers.items()}
+    results['errors'] = errors
+    return results
@@ -2,7 +2,7 @@
 Python and Jac Parser Utility - AST-based Code Analysis
 
 This module uses Python's Abstract Syntax Tree (AST) module to parse
-Python source files and regex-based parsing for Jac files to extract:
+Python source files and a single-pass lexer for Jac files to extract:
 - Functions (with parameters, return types, docstrings)
 - Classes (with methods, attributes, inheritance)
 - Walkers, Nodes, Edges (Jac constructs)
@@ -13,8 +13,102 @@ The extracted data is used to build the Code Context Graph (CCG).
 """
 
 import ast
+import builtins
+import inspect
 import re
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional
+
+from utils.ccg import ColumnarCCG, build_columnar_ccg, link_ccg
+from utils.file_content import read_file_content
+
+# --- Parse Modes ---
+
+# 'full' visits every statement and expression to collect calls;
+# 'outline' only records signatures, decorators and docstrings, so
+# function bodies are never walked and no call relationships are made.
+PARSE_MODE_FULL = "full"
+PARSE_MODE_OUTLINE = "outline"
+PARSE_MODES = (PARSE_MODE_FULL, PARSE_MODE_OUTLINE)
+
+# Names that resolve to builtins unless the module rebinds them
+BUILTIN_NAMES = frozenset(dir(builtins))
+
+# Receivers of attribute calls that refer to the enclosing class
+SELF_NAMES = ('self', 'cls')
+
+# Compound statements whose bodies may hold imports or definitions
+# at module/class level (e.g. `if TYPE_CHECKING:` or `try: import x`)
+_OUTLINE_BLOCK_STATEMENTS = (ast.If, ast.Try, ast.With)
+
+# --- Pre-parse Checks and Parse Budgets ---
+
+# Only the first few KB are inspected for binary content and markers
+SNIFF_BYTES = 8192
+
+# Files above this size are never handed to ast.parse; a line scan
+# extracts their top-level outline instead. ast.parse cannot be
+# interrupted, so this size cap is what bounds its cost
+MAX_SOURCE_BYTES = 2 * 1024 * 1024
+
+# Average line length (over the sniffed head) that marks minified code
+MAX_AVG_LINE_LENGTH = 200
+
+# Header markers left by code generators (protoc, grpc, swig, ...)
+GENERATED_MARKERS = (
+    b'generated by the protocol buffer compiler',
+    b'do not edit',
+    b'@generated',
+    b'autogenerated',
+    b'auto-generated',
+    b'this file was automatically generated',
+)
+
+# Per-file budgets for a full parse; exceeding either one falls back
+# to an outline of the already parsed tree
+PARSE_TIME_BUDGET = 5.0
+PARSE_NODE_BUDGET = 500_000
+
+# Budget checks read the clock only every this many visited nodes
+_BUDGET_CHECK_INTERVAL = 1024
+
+# def/class headers for the line-scan outline of oversized files
+_OUTLINE_SCAN_PATTERN = re.compile(
+    r'^([ \t]*)(?:async[ \t]+)?(def|class)[ \t]+(\w+)[ \t]*(?:\(([^)]*)\))?', re.M
+)
+
+
+class ParseBudgetExceeded(Exception):
+    """Raised by CodeVisitor when a file exceeds its parse budget."""
+
+
+def classify_source(raw: bytes) -> Optional[str]:
+    """
+    Cheaply decide whether a file should skip the full parse.
+    
+    Args:
+        raw: The file contents (bytes or a read-only mmap)
+        
+    Returns:
+        'binary', 'oversized', 'generated' or 'minified', or None for
+        an ordinary source file
+    """
+    head = raw[:SNIFF_BYTES]
+    if b'\x00' in head:
+        return 'binary'
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the sniff boundary is fine
+        if e.start < len(head) - 3:
+            return 'binary'
+    if len(raw) > MAX_SOURCE_BYTES:
+        return 'oversized'
+    if any(marker in head.lower() for marker in GENERATED_MARKERS):
+        return 'generated'
+    if len(head) / (head.count(b'\n') + 1) > MAX_AVG_LINE_LENGTH:
+        return 'minified'
+    return None
 
 # --- Python AST Parsing (CodeVisitor) ---
 
@@ -24,21 +118,51 @@ class CodeVisitor(ast.NodeVisitor):
     
     This class extends ast.NodeVisitor to traverse the Abstract Syntax Tree
     and collect information about functions, classes, and their relationships.
+    
+    In outline mode only module- and class-level statements are visited;
+    function bodies are skipped entirely, so 'calls' stays empty.
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, outline: bool = False,
+                 node_budget: Optional[int] = None, deadline: Optional[float] = None):
         """Initialize empty data structures for collected information."""
         self.file_path = file_path
+        self.outline = outline
+        self.node_budget = node_budget
+        self.deadline = deadline
+        self.visited = 0
         self.functions: List[Dict[str, Any]] = []
         self.classes: List[Dict[str, Any]] = []
         self.imports: List[Dict[str, Any]] = []
         self.relationships: List[Dict[str, Any]] = []
         self.current_func: Optional[Dict[str, Any]] = None
         self.current_class: Optional[Dict[str, Any]] = None
+        # Names bound by imports and definitions anywhere in the module
+        self.bound_names = set()
+
+    def visit(self, node: ast.AST):
+        """Visit a node, enforcing the node and wall-clock budgets"""
+        if self.node_budget is not None or self.deadline is not None:
+            self.visited += 1
+            if self.node_budget is not None and self.visited > self.node_budget:
+                raise ParseBudgetExceeded(f'node budget of {self.node_budget} exceeded')
+            if (self.deadline is not None and self.visited % _BUDGET_CHECK_INTERVAL == 0
+                    and time.perf_counter() > self.deadline):
+                raise ParseBudgetExceeded('time budget exceeded')
+        return super().visit(node)
+
+    def visit_Module(self, node: ast.Module):
+        """Visit the module root"""
+        if self.outline:
+            self._visit_outline_body(node.body)
+        else:
+            self.generic_visit(node)
+        self._drop_unresolvable_calls()
 
     def visit_Import(self, node: ast.Import):
         """Visit an import statement (e.g., import os, import sys)"""
         for alias in node.names:
+            self.bound_names.add(alias.asname or alias.name.split('.')[0])
             self.imports.append({
                 'module': alias.name,
                 'alias': alias.asname,
@@ -48,9 +172,11 @@ class CodeVisitor(ast.NodeVisitor):
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
         """Visit a from-import statement (e.g., from os import path)"""
-        module_name = node.module or "UNKNOWN"
+        # Relative imports keep their leading dots (from ..pkg import x -> '..pkg.x')
+        module_name = '.' * node.level + (node.module or '')
         for alias in node.names:
-            full_module = f"{module_name}.{alias.name}"
+            full_module = f"{module_name}.{alias.name}" if node.module else f"{module_name}{alias.name}"
+            self.bound_names.add(alias.asname or alias.name)
             self.imports.append({
                 'module': full_module,
                 'alias': alias.asname,
@@ -68,8 +194,10 @@ class CodeVisitor(ast.NodeVisitor):
             'line': node.lineno,
             'file_path': self.file_path,
             'calls': [],
+            'call_lines': [],
             'decorators': [self._get_decorator_name(dec) for dec in node.decorator_list]
         }
+        self.bound_names.add(node.name)
         
         if self.current_class:
             func_info['parent_class'] = self.current_class['name']
@@ -79,7 +207,8 @@ class CodeVisitor(ast.NodeVisitor):
         self.current_func = func_info
         
         self.functions.append(func_info)
-        self.generic_visit(node) # Visit children (like calls inside)
+        if not self.outline:
+            self.generic_visit(node) # Visit children (like calls inside)
         
         # Restore parent function context
         self.current_func = parent_func
@@ -95,6 +224,7 @@ class CodeVisitor(ast.NodeVisitor):
             'line': node.lineno,
             'file_path': self.file_path
         }
+        self.bound_names.add(node.name)
         
         # Add inheritance relationships
         for base in class_info['bases']:
@@ -123,7 +253,10 @@ class CodeVisitor(ast.NodeVisitor):
                 if isinstance(item.target, ast.Name):
                     class_info['attributes'].append(item.target.id)
 
-        self.generic_visit(node) # Visit children (like methods)
+        if self.outline:
+            self._visit_outline_body(node.body)
+        else:
+            self.generic_visit(node) # Visit children (like methods)
         
         # Restore parent class context
         self.current_class = parent_class
@@ -135,6 +268,7 @@ class CodeVisitor(ast.NodeVisitor):
         if func_name and self.current_func:
             # Add to the function's list of calls
             self.current_func['calls'].append(func_name)
+            self.current_func['call_lines'].append(node.lineno)
             
             # Add to the global relationships list
             self.relationships.append({
@@ -148,13 +282,57 @@ class CodeVisitor(ast.NodeVisitor):
 
     # --- Helper Methods for AST Visitor ---
 
+    def _visit_outline_body(self, body: List[ast.stmt]):
+        """Visit only definitions and imports in a statement list"""
+        for item in body:
+            if isinstance(item, (ast.FunctionDef, ast.ClassDef, ast.Import, ast.ImportFrom)):
+                self.visit(item)
+            elif isinstance(item, _OUTLINE_BLOCK_STATEMENTS):
+                self._visit_outline_body(item.body)
+                for handler in getattr(item, 'handlers', []):
+                    self._visit_outline_body(handler.body)
+                self._visit_outline_body(getattr(item, 'orelse', []))
+                self._visit_outline_body(getattr(item, 'finalbody', []))
+
+    def _drop_unresolvable_calls(self):
+        """
+        Remove calls that can never resolve to a definition in the repo.
+        
+        Builtins (unless rebound in the module) and attribute calls on
+        receivers that are neither self/cls nor a module-level name
+        (e.g. 'my_list.append', where my_list is a local) are dropped.
+        """
+        def keep(call: str) -> bool:
+            root = call.split('.', 1)[0]
+            if root in self.bound_names:
+                return True
+            if '.' in call:
+                return root in SELF_NAMES
+            return root not in BUILTIN_NAMES
+
+        for func in self.functions:
+            if not func['calls']:
+                continue
+            kept = [(c, l) for c, l in zip(func['calls'], func['call_lines']) if keep(c)]
+            func['calls'] = [c for c, _ in kept]
+            func['call_lines'] = [l for _, l in kept]
+        self.relationships = [
+            rel for rel in self.relationships
+            if rel['type'] != 'calls' or keep(rel['to'])
+        ]
+
     def _get_call_name(self, node: ast.AST) -> Optional[str]:
-        """Extract function name from a Call node"""
+        """
+        Extract the dotted call target from a Call node.
+        
+        'f()' -> 'f', 'mod.f()' -> 'mod.f', 'self.m()' -> 'self.m';
+        calls on computed receivers ('f().g()', 'x[0].g()') -> None.
+        """
         if isinstance(node, ast.Name):
             return node.id
         elif isinstance(node, ast.Attribute):
-            # This gets the method name (e.g., 'append' from 'my_list.append')
-            return node.attr
+            receiver = self._get_call_name(node.value)
+            return f"{receiver}.{node.attr}" if receiver else None
         return None
 
     def _get_base_name(self, node: ast.AST) -> Optional[str]:
@@ -187,205 +365,574 @@ class CodeVisitor(ast.NodeVisitor):
         return None
 
 
-# --- Jac Regex-Based Parsing ---
+# --- Jac Lexer-Based Parsing ---
+
+# A single master pattern tokenizes a Jac source in one left-to-right pass.
+# Whitespace, newlines and comments are consumed by the lexer but never
+# emitted; strings are emitted whole so braces inside them are ignored.
+JAC_TOKEN_PATTERN = re.compile(r'''
+    (?P<newline>\n)
+  | (?P<space>[ \t\r\f\v]+)
+  | (?P<block_comment>\#\*[\s\S]*?\*\#)
+  | (?P<comment>\#[^\n]*)
+  | (?P<docstring>"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\')
+  | (?P<string>"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<number>\d[\w.]*)
+  | (?P<op>->|::|.)
+''', re.VERBOSE)
+
+# Keywords that open a construct we record
+JAC_ARCHETYPE_KEYWORDS = {'walker', 'node', 'edge'}
+JAC_ABILITY_KEYWORDS = {'can', 'test'}
+
+# Tokens after which a new statement starts
+_JAC_STATEMENT_BOUNDARIES = {None, ';', '{', '}'}
+
+_JAC_OPENERS = {'{', '(', '['}
+_JAC_CLOSERS = {'}', ')', ']'}
+
+
+def tokenize_jac(content: str) -> List[tuple]:
+    """
+    Split Jac source into significant tokens in a single O(n) pass.
+    
+    Args:
+        content: The full text of a Jac file.
+        
+    Returns:
+        A list of (kind, text, line, start_offset, end_offset) tuples.
+        Whitespace and comments are dropped; line numbers are 1-based.
+    """
+    tokens = []
+    line = 1
+    for match in JAC_TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'newline':
+            line += 1
+            continue
+        if kind == 'space' or kind == 'comment':
+            continue
+        text = match.group()
+        if kind == 'block_comment':
+            line += text.count('\n')
+            continue
+        tokens.append((kind, text, line, match.start(), match.end()))
+        if kind == 'docstring':
+            line += text.count('\n')
+    return tokens
+
+
+class JacParser:
+    """
+    Brace-aware parser that builds Jac constructs from a token stream.
+    
+    Walks the tokens of `tokenize_jac` exactly once, keeping a stack of
+    open scopes so walkers, nodes, edges and abilities get correct
+    nesting, docstrings and start/end lines even when bodies contain
+    nested braces.
+    """
+
+    def __init__(self, content: str, file_path: str):
+        """Initialize empty data structures for collected information."""
+        self.content = content
+        self.file_path = file_path
+        self.tokens = tokenize_jac(content)
+        self.walkers: List[Dict[str, Any]] = []
+        self.nodes: List[Dict[str, Any]] = []
+        self.edges: List[Dict[str, Any]] = []
+        self.abilities: List[Dict[str, Any]] = []
+        self.imports: List[Dict[str, Any]] = []
+        # Each scope is (kind, record); kind is None for plain blocks
+        self.scopes: List[tuple] = []
+
+    def parse(self) -> 'JacParser':
+        """Run the single pass over the token stream."""
+        tokens = self.tokens
+        i = 0
+        prev = None
+        pending_doc = None
+        while i < len(tokens):
+            kind, text, line, start, end = tokens[i]
+            at_statement_start = prev in _JAC_STATEMENT_BOUNDARIES
+
+            if kind == 'docstring' and at_statement_start:
+                pending_doc = _clean_jac_docstring(text)
+                i += 1
+                continue
+
+            if at_statement_start and kind == 'name':
+                if text in JAC_ARCHETYPE_KEYWORDS and self._peek_name(i + 1):
+                    i = self._parse_archetype(i, pending_doc)
+                    prev, pending_doc = ';', None
+                    continue
+                if text in JAC_ABILITY_KEYWORDS and self._peek_name(i + 1):
+                    i = self._parse_ability(i, pending_doc)
+                    prev, pending_doc = ';', None
+                    continue
+                if text == 'has' and self._current_archetype() is not None:
+                    i = self._parse_has(i + 1)
+                    prev, pending_doc = ';', None
+                    continue
+                if text in ('import', 'include', 'from'):
+                    next_i = self._parse_import(i)
+                    if next_i is not None:
+                        i = next_i
+                        prev, pending_doc = ';', None
+                        continue
+
+            if text == '{':
+                self.scopes.append((None, None))
+            elif text == '}':
+                self._close_scope(line)
+
+            pending_doc = None
+            prev = text if kind == 'op' else kind
+            i += 1
+        return self
+
+    # --- Construct Handlers ---
+
+    def _parse_archetype(self, i: int, docstring: Optional[str]) -> int:
+        """Parse `walker|node|edge NAME ... {` or a bodiless declaration."""
+        keyword = self.tokens[i][1]
+        line = self.tokens[i][2]
+        name_i = self._skip_access_modifier(i + 1)
+        name = self.tokens[name_i][1]
+        record: Dict[str, Any] = {
+            'name': name,
+            'docstring': docstring,
+            'attributes': [],
+            'line': line,
+            'line_end': line,
+            'file_path': self.file_path
+        }
+        if keyword == 'walker':
+            self.walkers.append(record)
+        else:
+            record['kind'] = keyword
+            (self.nodes if keyword == 'node' else self.edges).append(record)
+
+        j, terminator = self._scan_to_body(name_i + 1)
+        if terminator == '{':
+            self.scopes.append((keyword, record))
+            return self._take_body_docstring(j + 1, record)
+        return j + 1
+
+    def _parse_ability(self, i: int, docstring: Optional[str]) -> int:
+        """Parse `can|test NAME ... {` (or `;` for a bodiless declaration)."""
+        ability_type = self.tokens[i][1]
+        line = self.tokens[i][2]
+        name_i = self._skip_access_modifier(i + 1)
+        j, terminator = self._scan_to_body(name_i + 1)
+        sig_end = self.tokens[j][3] if j < len(self.tokens) else len(self.content)
+        signature = ' '.join(self.content[self.tokens[i][3]:sig_end].split())
+
+        walker = self._enclosing('walker')
+        record: Dict[str, Any] = {
+            'name': self.tokens[name_i][1],
+            'signature': signature,
+            'ability_type': ability_type,
+            'parent_walker': walker['name'] if walker else None,
+            'docstring': docstring,
+            'line': line,
+            'line_end': line,
+            'file_path': self.file_path
+        }
+        self.abilities.append(record)
+
+        if terminator == '{':
+            self.scopes.append(('ability', record))
+            return self._take_body_docstring(j + 1, record)
+        return j + 1
+
+    def _parse_has(self, i: int) -> int:
+        """Parse `has a: T = v, b: T;` into 'name: type' attribute strings."""
+        record = self._current_archetype()
+        tokens = self.tokens
+        # Skip an optional access modifier such as `has :pub x: int;`
+        if i < len(tokens) and tokens[i][1] == ':':
+            i += 2
+        while i < len(tokens):
+            if tokens[i][0] != 'name':
+                break
+            var_name = tokens[i][1]
+            type_start = None
+            type_end = None
+            depth = 0
+            j = i + 1
+            if j < len(tokens) and tokens[j][1] == ':':
+                j += 1
+                type_start = tokens[j][3] if j < len(tokens) else None
+            in_default = False
+            while j < len(tokens):
+                text = tokens[j][1]
+                if text in _JAC_OPENERS:
+                    depth += 1
+                elif text in _JAC_CLOSERS:
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif depth == 0 and text in (',', ';'):
+                    break
+                elif depth == 0 and text == '=' and not in_default:
+                    in_default = True
+                    type_end = tokens[j][3]
+                j += 1
+            if type_start is not None:
+                if type_end is None:
+                    type_end = tokens[j][3] if j < len(tokens) else len(self.content)
+                var_type = ' '.join(self.content[type_start:type_end].split())
+                record['attributes'].append(f"{var_name}: {var_type}")
+            else:
+                record['attributes'].append(var_name)
+            if j >= len(tokens) or tokens[j][1] != ',':
+                return j + 1 if j < len(tokens) and tokens[j][1] == ';' else j
+            i = j + 1
+        return i
+
+    def _parse_import(self, i: int) -> Optional[int]:
+        """
+        Parse the Jac import forms:
+        `import:jac from mod { a, b };`, `import:py mod;`,
+        `from "mod.jac" import a, b;` and `include mod;`.
+        Returns None if the tokens do not form an import statement.
+        """
+        tokens = self.tokens
+        line = tokens[i][2]
+        keyword = tokens[i][1]
+        j = i + 1
+        module = None
+        items: List[tuple] = []
+
+        if keyword == 'from':
+            module, j = self._read_module(j)
+            if module is None or j >= len(tokens) or tokens[j][1] != 'import':
+                return None
+            j += 1
+        else:
+            # Optional language tag, e.g. import:py / import:jac
+            if j + 1 < len(tokens) and tokens[j][1] == ':' and tokens[j + 1][0] == 'name':
+                j += 2
+            if j < len(tokens) and tokens[j][1] == 'from':
+                module, j = self._read_module(j + 1)
+            else:
+                module, j = self._read_module(j)
+            if module is None:
+                return None
+
+        braced = j < len(tokens) and tokens[j][1] == '{'
+        if braced:
+            j += 1
+        # Item list: name [as alias] (, name [as alias])*
+        while j < len(tokens) and tokens[j][1] not in (';', '}'):
+            if tokens[j][0] == 'name' and keyword != 'include':
+                item = tokens[j][1]
+                alias = None
+                if j + 2 < len(tokens) and tokens[j + 1][1] == 'as':
+                    alias = tokens[j + 2][1]
+                    j += 2
+                items.append((item, alias))
+            elif not braced and tokens[j][1] != ',':
+                break
+            j += 1
+        if braced and j < len(tokens) and tokens[j][1] == '}':
+            j += 1
+        if j < len(tokens) and tokens[j][1] == ';':
+            j += 1
+
+        if items:
+            for item, alias in items:
+                self.imports.append({
+                    'module': f"{module}.{item}",
+                    'alias': alias,
+                    'line': line
+                })
+        else:
+            self.imports.append({'module': module, 'alias': None, 'line': line})
+        return j
+
+    # --- Token Helpers ---
+
+    def _read_module(self, j: int) -> tuple:
+        """Read a dotted module name or a quoted module path."""
+        tokens = self.tokens
+        if j >= len(tokens):
+            return None, j
+        kind, text = tokens[j][0], tokens[j][1]
+        if kind == 'string':
+            module = text[1:-1]
+            if module.endswith('.jac'):
+                module = module[:-4]
+            return module.replace('/', '.'), j + 1
+        if kind != 'name':
+            return None, j
+        parts = [text]
+        j += 1
+        while j + 1 < len(tokens) and tokens[j][1] == '.' and tokens[j + 1][0] == 'name':
+            parts.append(tokens[j + 1][1])
+            j += 2
+        return '.'.join(parts), j
+
+    def _scan_to_body(self, j: int) -> tuple:
+        """Advance to the `{` or `;` that ends a construct header."""
+        tokens = self.tokens
+        depth = 0
+        while j < len(tokens):
+            text = tokens[j][1]
+            if text in ('(', '['):
+                depth += 1
+            elif text in (')', ']'):
+                depth -= 1
+            elif depth <= 0 and text in ('{', ';'):
+                return j, text
+            j += 1
+        return j, None
+
+    def _take_body_docstring(self, j: int, record: Dict[str, Any]) -> int:
+        """Use a string that opens a body as the construct's docstring."""
+        if j < len(self.tokens) and self.tokens[j][0] == 'docstring':
+            if not record.get('docstring'):
+                record['docstring'] = _clean_jac_docstring(self.tokens[j][1])
+            return j + 1
+        return j
+
+    def _skip_access_modifier(self, j: int) -> int:
+        """Skip `:pub`/`:priv` style modifiers before a construct name."""
+        if self.tokens[j][1] == ':' and j + 2 < len(self.tokens):
+            return j + 2
+        return j
+
+    def _peek_name(self, j: int) -> bool:
+        """True if token j is a construct name (or an access modifier)."""
+        if j >= len(self.tokens):
+            return False
+        kind, text = self.tokens[j][0], self.tokens[j][1]
+        if kind == 'name':
+            # `node::file` style references are not declarations
+            return not (j + 1 < len(self.tokens) and self.tokens[j + 1][1] == '::')
+        return text == ':' and j + 1 < len(self.tokens) and self.tokens[j + 1][0] == 'name' \
+            and j + 2 < len(self.tokens) and self.tokens[j + 2][0] == 'name'
+
+    def _close_scope(self, line: int):
+        """Pop the innermost scope and record where its construct ends."""
+        if not self.scopes:
+            return
+        kind, record = self.scopes.pop()
+        if record is not None:
+            record['line_end'] = line
+
+    def _current_archetype(self) -> Optional[Dict[str, Any]]:
+        """The walker/node/edge whose body is the innermost scope, if any."""
+        if self.scopes and self.scopes[-1][0] in JAC_ARCHETYPE_KEYWORDS:
+            return self.scopes[-1][1]
+        return None
+
+    def _enclosing(self, kind: str) -> Optional[Dict[str, Any]]:
+        """The innermost enclosing construct of the given kind, if any."""
+        for scope_kind, record in reversed(self.scopes):
+            if scope_kind == kind:
+                return record
+        return None
+
+
+def _clean_jac_docstring(text: str) -> str:
+    """Strip the triple quotes and common indentation from a docstring."""
+    return inspect.cleandoc(text[3:-3])
+
+
+# --- Line-Scan Outline ---
+
+def _scan_python_outline(content: str, path: str) -> Dict[str, Any]:
+    """
+    Extract classes and functions from def/class header lines only.
+    
+    Used for files too large to hand to ast.parse. Methods are attached
+    to the closest enclosing class by indentation; nested functions are
+    ignored. Docstrings, return types and calls are not collected.
+    """
+    functions: List[Dict[str, Any]] = []
+    classes: List[Dict[str, Any]] = []
+    class_stack: List[tuple] = []  # (indent, class_info)
+    # Lines are counted incrementally from the previous match, so the
+    # scan stays linear in the file size
+    line, last_offset = 1, 0
+
+    for match in _OUTLINE_SCAN_PATTERN.finditer(content):
+        indent = len(match.group(1).expandtabs())
+        keyword, name, args = match.group(2), match.group(3), match.group(4) or ''
+        line += content.count('\n', last_offset, match.start())
+        last_offset = match.start()
+        while class_stack and class_stack[-1][0] >= indent:
+            class_stack.pop()
+        parent = class_stack[-1][1] if class_stack else None
+
+        if keyword == 'class':
+            bases = [b.strip() for b in args.split(',') if b.strip() and '=' not in b]
+            class_info = {
+                'name': name, 'bases': bases, 'methods': [], 'attributes': [],
+                'docstring': None, 'line': line, 'file_path': path
+            }
+            classes.append(class_info)
+            class_stack.append((indent, class_info))
+        elif indent == 0 or parent is not None:
+            params = [p.split(':')[0].split('=')[0].strip() for p in args.split(',')]
+            func_info = {
+                'name': name,
+                'params': [p for p in params if p.isidentifier()],
+                'returns': None, 'docstring': None, 'line': line, 'file_path': path,
+                'calls': [], 'call_lines': [], 'decorators': []
+            }
+            if parent is not None:
+                func_info['parent_class'] = parent['name']
+                parent['methods'].append(name)
+            functions.append(func_info)
 
-# Regex patterns for Jac constructs
-# We use re.DOTALL so '.' matches newlines, and re.MULTILINE for '^'
-JAC_WALKER_PATTERN = re.compile(r'^\s*walker\s+([\w_]+)\s*\{([^}]+)\}', re.MULTILINE | re.DOTALL)
-JAC_NODE_PATTERN = re.compile(r'^\s*node\s+([\w_]+)\s*\{([^}]+)\}', re.MULTILINE | re.DOTALL)
-JAC_EDGE_PATTERN = re.compile(r'^\s*edge\s+([\w_]+)\s*\{([^}]+)\}', re.MULTILINE | re.DOTALL)
-JAC_ABILITY_PATTERN = re.compile(r'^\s*(can\s+[\w_]+|test\s+[\w_]+)\s*(\(.*\))?\s*(->\s*[\w_:\.\[\]]+)?\s*\{', re.MULTILINE)
-JAC_HAS_PATTERN = re.compile(r'^\s*has\s+([\w_]+)\s*:\s*([^;=]+)', re.MULTILINE)
-JAC_IMPORT_PATTERN = re.compile(r'^\s*import:jac\s+from\s+([\w\._]+)\s*\{([^}]+)\}', re.MULTILINE | re.DOTALL)
+    relationships = [
+        {'from': cls['name'], 'to': base, 'type': 'inherits', 'line': cls['line']}
+        for cls in classes for base in cls['bases']
+    ]
+    return {'functions': functions, 'classes': classes, 'imports': [], 'relationships': relationships}
 
 
 # --- Jac-Exportable Functions ---
 
-def parse_python_file(path: str) -> Dict[str, Any]:
+def parse_python_file(path: str, mode: str = PARSE_MODE_FULL) -> Dict[str, Any]:
     """
     Parse a Python file and return extracted code structure.
     
+    Generated, minified and oversized files (see classify_source), and
+    files that exceed PARSE_TIME_BUDGET or PARSE_NODE_BUDGET during a
+    full parse, fall back to an outline; the reason is reported under
+    'fallback'. Binary files are rejected. The time budget is checked
+    after ast.parse and while the tree is visited; ast.parse itself
+    cannot be interrupted, and its cost is bounded only by
+    MAX_SOURCE_BYTES (larger files are line-scanned without calling it).
+    
     Args:
         path: Path to the Python file
+        mode: PARSE_MODE_FULL, or PARSE_MODE_OUTLINE to skip function
+              bodies (no calls or call relationships are collected)
         
     Returns:
-        Dictionary containing extracted data and relationships.
+        Dictionary containing extracted data and relationships, or
+        {'error': message} if the file could not be parsed.
     """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-            tree = ast.parse(content, filename=path)
+        source = read_file_content(path)
+        fallback = classify_source(source.data)
+        if fallback == 'binary':
+            return {'error': 'Skipped binary file'}
+        content = source.text
         
-        visitor = CodeVisitor(file_path=path)
-        visitor.visit(tree)
+        # Oversized files are never handed to ast
+        if fallback == 'oversized':
+            result = _scan_python_outline(content, path)
+        else:
+            deadline = time.perf_counter() + PARSE_TIME_BUDGET
+            tree = ast.parse(content, filename=path)
+            outline = mode == PARSE_MODE_OUTLINE or fallback is not None
+            if not outline and time.perf_counter() > deadline:
+                fallback, outline = 'time budget exceeded', True
+            
+            visitor = CodeVisitor(file_path=path, outline=outline)
+            if not outline:
+                visitor.node_budget, visitor.deadline = PARSE_NODE_BUDGET, deadline
+            try:
+                visitor.visit(tree)
+            except ParseBudgetExceeded as e:
+                fallback = str(e)
+                visitor = CodeVisitor(file_path=path, outline=True)
+                visitor.visit(tree)
+            result = {
+                'functions': visitor.functions,
+                'classes': visitor.classes,
+                'imports': visitor.imports,
+                'relationships': visitor.relationships
+            }
         
-        return {
-            'functions': visitor.functions,
-            'classes': visitor.classes,
-            'imports': visitor.imports,
-            'relationships': visitor.relationships,
-            'walkers': [], 'nodes': [], 'edges': [], 'abilities': [], 'error': None
-        }
+        result.update({
+            'file_path': path,
+            'mode': PARSE_MODE_OUTLINE if fallback else mode,
+            'lines': source.lines,
+            'walkers': [], 'nodes': [], 'edges': [], 'abilities': []
+        })
+        if fallback:
+            result['fallback'] = fallback
+        return result
     except Exception as e:
         return {'error': str(e)}
 
 
-def parse_jac_file(path: str) -> Dict[str, Any]:
+def parse_jac_file(path: str, mode: str = PARSE_MODE_FULL) -> Dict[str, Any]:
     """
-    Basic parser for Jac files using regex.
+    Parse a Jac file with the single-pass, brace-aware JacParser.
+    
+    The lexer never looks inside ability bodies, so both modes produce
+    the same outline-level result.
     
     Args:
         path: Path to the Jac file
+        mode: Accepted for symmetry with parse_python_file
         
     Returns:
-        Dictionary containing extracted data.
+        Dictionary containing extracted data, or {'error': message}.
     """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-            
-        walkers, abilities, walker_has_vars = _parse_jac_walkers(content, path)
-        nodes, node_has_vars = _parse_jac_nodes_edges(content, path, JAC_NODE_PATTERN, 'node')
-        edges, edge_has_vars = _parse_jac_nodes_edges(content, path, JAC_EDGE_PATTERN, 'edge')
-        imports = _parse_jac_imports(content, path)
-        
-        # Combine all extracted abilities
-        all_abilities = abilities + _parse_jac_abilities(content, path)
+        source = read_file_content(path)
+        parser = JacParser(source.text, file_path=path).parse()
         
         return {
-            'walkers': walkers,
-            'nodes': nodes,
-            'edges': edges,
-            'abilities': all_abilities,
-            'imports': imports,
-            'functions': [], 'classes': [], 'relationships': [], 'error': None
+            'file_path': path,
+            'mode': mode,
+            'lines': source.lines,
+            'walkers': parser.walkers,
+            'nodes': parser.nodes,
+            'edges': parser.edges,
+            'abilities': parser.abilities,
+            'imports': parser.imports,
+            'functions': [], 'classes': [], 'relationships': []
         }
     
     except Exception as e:
         return {'error': str(e)}
 
-def parse_file_by_extension(path: str) -> Dict[str, Any]:
+def parse_file_by_extension(path: str, mode: str = PARSE_MODE_FULL) -> Dict[str, Any]:
     """
     Parse a file based on its extension (.py or .jac).
     
     Args:
         path: Path to the file
+        mode: PARSE_MODE_FULL or PARSE_MODE_OUTLINE
         
     Returns:
         Parsed data dictionary
     """
+    if mode not in PARSE_MODES:
+        return {'error': f'Unknown parse mode: {mode}'}
     if path.endswith('.py'):
-        return parse_python_file(path)
+        return parse_python_file(path, mode)
     elif path.endswith('.jac'):
-        return parse_jac_file(path)
+        return parse_jac_file(path, mode)
     else:
         return {'error': f'Unsupported file type: {path}'}
 
-# --- Internal Helper Functions for Jac Parsing ---
-
-def _parse_jac_walkers(content: str, path: str) -> tuple:
-    """Extract walkers, their abilities, and their 'has' variables."""
-    walkers = []
-    abilities = []
-    has_vars = []
+def build_code_context_graph(parsed_files: List[Dict[str, Any]]) -> ColumnarCCG:
+    """
+    Merge per-file parse results into a linked Code Context Graph.
     
-    for match in JAC_WALKER_PATTERN.finditer(content):
-        name = match.group(1)
-        body = match.group(2)
-        line = content[:match.start()].count('\n') + 1
-        
-        # Find abilities within this walker
-        for ab_match in JAC_ABILITY_PATTERN.finditer(body):
-            sig = ab_match.group(0).replace('{', '').strip()
-            ab_name = sig.split('(')[0].replace('can ', '').replace('test ', '').strip()
-            ab_line = line + body[:ab_match.start()].count('\n') + 1
-            abilities.append({
-                'name': ab_name,
-                'signature': sig,
-                'ability_type': 'can' if 'can' in sig else 'test',
-                'parent_walker': name,
-                'docstring': None, # Note: regex doesn't easily get docstrings
-                'line': ab_line,
-                'file_path': path
-            })
-            
-        # Find 'has' variables
-        walker_has = []
-        for has_match in JAC_HAS_PATTERN.finditer(body):
-            has_sig = has_match.group(0).replace('has ', '').strip()
-            walker_has.append(has_sig)
-            
-        walkers.append({
-            'name': name,
-            'docstring': None,
-            'attributes': walker_has,
-            'line': line,
-            'file_path': path
-        })
-        has_vars.extend(walker_has)
-        
-    return walkers, abilities, has_vars
-
-def _parse_jac_nodes_edges(content: str, path: str, pattern: re.Pattern, kind: str) -> tuple:
-    """Extract nodes or edges and their 'has' variables."""
-    elements = []
-    has_vars = []
+    All symbols go into one columnar symbol table, then calls, inherits
+    and defines relationships are resolved to symbol IDs and stored as a
+    CSR adjacency on `ccg.graph`.
     
-    for match in pattern.finditer(content):
-        name = match.group(1)
-        body = match.group(2)
-        line = content[:match.start()].count('\n') + 1
-        
-        element_has = []
-        for has_match in JAC_HAS_PATTERN.finditer(body):
-            has_sig = has_match.group(0).replace('has ', '').strip()
-            element_has.append(has_sig)
-            
-        elements.append({
-            'name': name,
-            'kind': kind,
-            'attributes': element_has,
-            'line': line,
-            'file_path': path
-        })
-        has_vars.extend(element_has)
-        
-    return elements, has_vars
-
-def _parse_jac_abilities(content: str, path: str) -> list:
-    """Extract standalone abilities (not inside a walker)."""
-    # This is a simplification; we're just finding *all* abilities
-    # and the walker parser finds the ones *inside* walkers.
-    # A more robust parser would differentiate.
-    abilities = []
-    for ab_match in JAC_ABILITY_PATTERN.finditer(content):
-        sig = ab_match.group(0).replace('{', '').strip()
-        ab_name = sig.split('(')[0].replace('can ', '').replace('test ', '').strip()
-        ab_line = content[:ab_match.start()].count('\n') + 1
-        abilities.append({
-            'name': ab_name,
-            'signature': sig,
-            'ability_type': 'can' if 'can' in sig else 'test',
-            'parent_walker': None, # Standalone
-            'docstring': None,
-            'line': ab_line,
-            'file_path': path
-        })
-    return abilities
-
-def _parse_jac_imports(content: str, path: str) -> list:
-    """Extract Jac imports."""
-    imports = []
-    for match in JAC_IMPORT_PATTERN.finditer(content):
-        module = match.group(1)
-        items = [item.strip() for item in match.group(2).split(',')]
-        line = content[:match.start()].count('\n') + 1
+    Args:
+        parsed_files: Results of parse_file_by_extension; failed parses
+            are skipped.
         
-        for item in items:
-            imports.append({
-                'module': f"{module}.{item}",
-                'alias': None,
-                'line': line
-            })
-    return imports
-
+    Returns:
+        A ColumnarCCG. It supports the dict interface of a parse result
+        (ccg['functions'], ccg.get('relationships', []), ...).
+    """
+    ccg = build_columnar_ccg(parsed_files)
+    link_ccg(ccg)
+    return ccg
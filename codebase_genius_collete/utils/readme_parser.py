@@ -14,12 +14,18 @@ import os
 import re
 from typing import Dict, Any, Optional
 
-def find_readme(repo_path: str) -> Optional[str]:
+from utils.file_content import read_file_content
+from utils.file_tree import vendored_dir_reason
+from utils.ignore_matcher import IgnoreMatcher
+
+def find_readme(repo_path: str, index=None) -> Optional[str]:
     """
     Find the main README file in the repository root.
     
     Args:
         repo_path: The local path to the cloned repository.
+        index: The job's RepoIndex (utils/repo_index) of repo_path; it
+            is searched instead of the filesystem when given.
         
     Returns:
         The full path to the README file, or None if not found.
@@ -29,18 +35,34 @@ def find_readme(repo_path: str) -> Optional[str]:
         'README.md', 'README.MD', 'Readme.md', 'readme.md', 
         'README.rst', 'README.txt', 'README'
     ]
+
+    # The index already excludes ignored and vendored folders
+    if index is not None:
+        return index.find_file(readme_names, max_depth=2)
     
+    # One directory listing instead of a stat per candidate name
+    try:
+        root_files = {entry.name for entry in os.scandir(repo_path) if entry.is_file()}
+    except OSError:
+        root_files = set()
     for name in readme_names:
-        readme_path = os.path.join(repo_path, name)
-        if os.path.exists(readme_path):
-            return readme_path
+        if name in root_files:
+            return os.path.join(repo_path, name)
             
     # Check one level deeper (e.g., in a 'docs' folder or src folder)
+    matcher = IgnoreMatcher(repo_path)
     for root, dirs, files in os.walk(repo_path):
         # Prune search depth
         if root.count(os.sep) - repo_path.count(os.sep) > 2:
             dirs[:] = [] # Don't go deeper than 2 levels
             continue
+        # Never pick a README out of an ignored folder, a virtualenv or
+        # an installed package
+        dirs[:] = [
+            d for d in dirs
+            if not matcher.is_ignored(os.path.join(root, d), True)
+            and not vendored_dir_reason(os.path.join(root, d), d)
+        ]
             
         for name in readme_names:
             if name in files:
@@ -67,8 +89,7 @@ def summarize_readme(readme_path: str, max_sentences=5) -> Dict[str, Any]:
         }
     
     try:
-        with open(readme_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        content = read_file_content(readme_path).decode('ignore')
         
         # --- Extract Title ---
         # Look for the first H1 heading
@@ -0,0 +1,303 @@
+"""
+Repository File Index.
+
+One listing of a checkout, built in a single pass and shared by every
+stage of a job (repo_mapper, the statistics engine, the structure
+writer, the README search, the frontend) instead of each walking the
+filesystem again:
+- Folders and files come from the parallel, ignore-aware repo walker
+  (vendored trees are pruned and listed under `skipped`)
+- Each file is read once to record its line count, SHA-1 and whether it
+  is binary or generated; large files are memory-mapped
+- The index is saved next to the analysis state and reloaded when the
+  same commit is processed again
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+from utils.file_content import MMAP_THRESHOLD, count_newlines
+from utils.ignore_matcher import IgnoreMatcher
+from utils.python_parser import classify_source
+from utils.repo_walker import iter_repo_batches, DEFAULT_BATCH_SIZE, DEFAULT_MAX_WORKERS
+
+# --- Constants ---
+
+REPO_INDEX_VERSION = 1
+REPO_INDEX_FILENAME = "repo_index.json"
+
+# Extension -> language; files with other extensions are "Other"
+LANGUAGE_BY_EXTENSION = {
+    '.py': 'Python', '.pyi': 'Python', '.jac': 'Jac',
+    '.js': 'JavaScript', '.jsx': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript',
+    '.java': 'Java', '.kt': 'Kotlin', '.scala': 'Scala', '.go': 'Go', '.rs': 'Rust',
+    '.c': 'C', '.h': 'C', '.cc': 'C++', '.cpp': 'C++', '.cxx': 'C++', '.hpp': 'C++',
+    '.cs': 'C#', '.rb': 'Ruby', '.php': 'PHP', '.swift': 'Swift', '.r': 'R', '.lua': 'Lua',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell', '.ps1': 'PowerShell',
+    '.html': 'HTML', '.htm': 'HTML', '.css': 'CSS', '.scss': 'CSS', '.sql': 'SQL',
+    '.md': 'Markdown', '.rst': 'reStructuredText', '.txt': 'Text',
+    '.json': 'JSON', '.yaml': 'YAML', '.yml': 'YAML', '.toml': 'TOML', '.ini': 'INI', '.cfg': 'INI',
+    '.xml': 'XML', '.ipynb': 'Jupyter Notebook',
+}
+OTHER_LANGUAGE = "Other"
+
+# Per-file columns written to disk (name, parent, extension and
+# language are derived from the path)
+_FILE_COLUMNS = ('size', 'mtime_ns', 'lines', 'digest', 'binary', 'generated')
+
+
+# --- File Inspection ---
+
+def inspect_file(path: str, size: int) -> Tuple[int, Optional[str], bool, bool]:
+    """
+    Read one file once and derive its content facts.
+
+    Returns:
+        (lines, sha1, binary, generated). Lines follow the
+        FileContent.lines convention and are 0 for binary files;
+        'generated' also covers minified files. Unreadable files give
+        (0, None, False, False).
+    """
+    try:
+        with open(path, 'rb') as f:
+            if size >= MMAP_THRESHOLD:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+    except (OSError, ValueError) as e:
+        print(f"  ! Warning: Could not index {path}. Error: {e}")
+        return 0, None, False, False
+    try:
+        kind = classify_source(data)
+        binary = kind == 'binary'
+        lines = 0 if binary else count_newlines(data) + 1
+        return lines, hashlib.sha1(data).hexdigest(), binary, kind in ('generated', 'minified')
+    finally:
+        if not isinstance(data, bytes):
+            data.close()
+
+
+# --- Index ---
+
+class RepoIndex:
+    """
+    Every folder and file of a checkout, in walk order.
+
+    Entries are dicts shaped like repo_walker records ('kind', 'name',
+    'path', 'parent', plus 'extension', 'size', 'mtime_ns' for files),
+    extended for files with 'language', 'lines', 'digest', 'binary' and
+    'generated'. Folders always come before anything inside them.
+    """
+
+    def __init__(self, root: str, commit: Optional[str] = None):
+        """Create an empty index of the checkout at `root`."""
+        self.root = root
+        self.commit = commit
+        self.folders: List[Dict[str, Any]] = []
+        self.files: List[Dict[str, Any]] = []
+        self.skipped: Dict[str, str] = {}
+        self._by_path: Optional[Dict[str, Dict[str, Any]]] = None
+        self._children: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+    # --- Building ---
+
+    @classmethod
+    def build(cls, root: str, read_contents: bool = True, max_workers: int = DEFAULT_MAX_WORKERS,
+              matcher: Optional[IgnoreMatcher] = None, commit: Optional[str] = None) -> 'RepoIndex':
+        """
+        Walk a checkout once and index it.
+
+        Args:
+            root: The repository checkout.
+            read_contents: Read every file for lines, hash and flags;
+                without it only walk data (path, size, mtime) is kept.
+            max_workers: Threads for the walk and the file reads.
+            matcher: Ignore rules; defaults to an IgnoreMatcher for root.
+            commit: The commit the checkout is at, stored with the index.
+        """
+        index = cls(root, commit)
+        skipped: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch in iter_repo_batches(root, max_workers=max_workers, skipped=skipped, matcher=matcher):
+                files = []
+                for record in batch:
+                    if record['kind'] == 'folder':
+                        index.folders.append(record)
+                    else:
+                        record['language'] = LANGUAGE_BY_EXTENSION.get(record['extension'].lower(), OTHER_LANGUAGE)
+                        files.append(record)
+                if read_contents:
+                    facts = executor.map(inspect_file, [r['path'] for r in files], [r['size'] for r in files])
+                else:
+                    facts = ((0, None, False, False) for _ in files)
+                for record, (lines, digest, binary, generated) in zip(files, facts):
+                    record.update(lines=lines, digest=digest, binary=binary, generated=generated)
+                    index.files.append(record)
+        index.skipped = {index.relative(path): reason for path, reason in sorted(skipped.items())}
+        return index
+
+    # --- Queries ---
+
+    def relative(self, path: str) -> str:
+        """A path below the root, relative to it."""
+        return os.path.relpath(path, self.root)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """The entry for a full path, or None."""
+        if self._by_path is None:
+            self._by_path = {e['path']: e for e in self.folders}
+            self._by_path.update((e['path'], e) for e in self.files)
+        return self._by_path.get(path)
+
+    def iter_files(self, extensions: Optional[Iterable[str]] = None,
+                   language: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Files, optionally only those with given extensions or language."""
+        wanted = set(extensions) if extensions is not None else None
+        for entry in self.files:
+            if wanted is not None and entry['extension'] not in wanted:
+                continue
+            if language is not None and entry['language'] != language:
+                continue
+            yield entry
+
+    def batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Entries in batches, parents first (a drop-in for iter_repo_batches)."""
+        entries = self.folders + self.files
+        for start in range(0, len(entries), batch_size):
+            yield entries[start:start + batch_size]
+
+    def children(self, path: str) -> List[Dict[str, Any]]:
+        """Entries directly inside a folder (or the root), sorted by name."""
+        if self._children is None:
+            self._children = {}
+            for entry in self.folders + self.files:
+                self._children.setdefault(entry['parent'], []).append(entry)
+            for entries in self._children.values():
+                entries.sort(key=lambda e: e['name'])
+        return self._children.get(path, [])
+
+    def iter_tree(self) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Depth-first (entry, depth) pairs, each folder's entries sorted by name."""
+        stack = [iter(self.children(self.root))]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                continue
+            yield entry, len(stack) - 1
+            if entry['kind'] == 'folder':
+                stack.append(iter(self.children(entry['path'])))
+
+    def find_file(self, names: List[str], max_depth: int = 0) -> Optional[str]:
+        """
+        The path of the shallowest file with one of `names`.
+
+        Ties at one depth go to the earlier name in `names`, then to the
+        path that sorts first.
+
+        Args:
+            names: Candidate file names, most preferred first.
+            max_depth: How many folder levels below the root to search.
+        """
+        rank = {name: i for i, name in enumerate(names)}
+        best = None
+        for entry in self.files:
+            if entry['name'] not in rank:
+                continue
+            depth = self.relative(entry['path']).count(os.sep)
+            if depth > max_depth:
+                continue
+            key = (depth, rank[entry['name']], entry['path'])
+            if best is None or key < best:
+                best = key
+        return best[2] if best else None
+
+    # --- Persistence ---
+
+    def save(self, path: str) -> None:
+        """Write the index (with paths relative to the root) as JSON."""
+        data = {
+            'version': REPO_INDEX_VERSION,
+            'commit': self.commit,
+            'skipped': self.skipped,
+            'folders': [self.relative(e['path']) for e in self.folders],
+            'files': {'path': [self.relative(e['path']) for e in self.files]}
+        }
+        for column in _FILE_COLUMNS:
+            data['files'][column] = [e[column] for e in self.files]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str, root: str) -> 'RepoIndex':
+        """
+        Read a saved index and re-anchor its paths at `root`.
+
+        Raises:
+            ValueError: If the file is not an index of this version.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != REPO_INDEX_VERSION:
+            raise ValueError(f"Unsupported repository index version: {data.get('version')}")
+        index = cls(root, data['commit'])
+        index.skipped = data['skipped']
+        for rel in data['folders']:
+            full = os.path.join(root, rel)
+            index.folders.append({'kind': 'folder', 'name': os.path.basename(rel), 'path': full,
+                                  'parent': os.path.dirname(full)})
+        files = data['files']
+        for i, rel in enumerate(files['path']):
+            full = os.path.join(root, rel)
+            name = os.path.basename(rel)
+            extension = Path(name).suffix
+            entry = {'kind': 'file', 'name': name, 'path': full, 'parent': os.path.dirname(full),
+                     'extension': extension,
+                     'language': LANGUAGE_BY_EXTENSION.get(extension.lower(), OTHER_LANGUAGE)}
+            for column in _FILE_COLUMNS:
+                entry[column] = files[column][i]
+            index.files.append(entry)
+        return index
+
+
+def load_repo_index(path: str, root: str, commit: Optional[str] = None) -> Optional[RepoIndex]:
+    """
+    Load a saved index if it exists and was built at the given commit.
+
+    Returns:
+        The index, or None if it is missing, unreadable or stale.
+    """
+    if not commit or not os.path.exists(path):
+        return None
+    try:
+        index = RepoIndex.load(path, root)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"  ! Ignoring unreadable repository index: {e}")
+        return None
+    return index if index.commit == commit else None
+
+
+def get_repo_index(root: str, state_dir: Optional[str] = None, commit: Optional[str] = None) -> RepoIndex:
+    """
+    The index of a checkout: reloaded for a known commit, else built.
+
+    Args:
+        root: The repository checkout.
+        state_dir: Where the index is kept (e.g. the analysis state
+            folder); without one the index is built and not saved.
+        commit: The checkout's commit; without one nothing is reused.
+    """
+    path = os.path.join(state_dir, REPO_INDEX_FILENAME) if state_dir else None
+    index = load_repo_index(path, root, commit) if path else None
+    if index is None:
+        index = RepoIndex.build(root, commit=commit)
+        if path and commit:
+            os.makedirs(state_dir, exist_ok=True)
+            index.save(path)
+    return index
@@ -0,0 +1,93 @@
+"""
+Repository Statistics Engine.
+
+Computes the file, byte and line totals shown in the generated
+documentation from the repository index (utils/repo_index), without
+parsing anything:
+- The index lists the checkout once with the parallel scandir walker
+  and reads each file once, counting lines with C-level newline scans
+  (large files are memory-mapped)
+- Languages come from the index's extension table; binary files count
+  by size only
+- Vendored trees (virtualenvs, site-packages, ...) are pruned by the
+  walk and listed under 'skipped' instead of being counted
+"""
+
+import os
+from typing import Dict, Any, Optional
+
+from utils.repo_index import RepoIndex, OTHER_LANGUAGE
+from utils.repo_walker import DEFAULT_MAX_WORKERS
+
+# --- Constants ---
+
+# Bucket in 'structure' for files at the repository root
+ROOT_BUCKET = "."
+
+
+# --- Statistics ---
+
+def compute_repo_stats(root_path: str, max_workers: int = DEFAULT_MAX_WORKERS,
+                       index: Optional[RepoIndex] = None) -> Dict[str, Any]:
+    """
+    Total a checkout by language and top-level folder.
+
+    Args:
+        root_path: The repository checkout.
+        max_workers: Threads for building the index.
+        index: An index of root_path already built for this job; one is
+            built if omitted.
+
+    Returns:
+        {'file_count', 'folder_count', 'total_bytes', 'total_lines',
+         'file_types': {language: files},
+         'languages': {language: {'files', 'bytes', 'lines'}},
+         'structure': {top-level folder (or '.'): {'files', 'bytes', 'lines'}},
+         'skipped': {relative path: reason} for pruned vendored trees,
+         'component_summary': str}
+    """
+    if index is None:
+        index = RepoIndex.build(root_path, max_workers=max_workers)
+    stats: Dict[str, Any] = {'file_count': 0, 'folder_count': len(index.folders), 'total_bytes': 0, 'total_lines': 0}
+    languages: Dict[str, Dict[str, int]] = {}
+    structure: Dict[str, Dict[str, int]] = {}
+
+    def add(totals: Dict[str, Dict[str, int]], key: str, size: int, lines: int) -> None:
+        bucket = totals.get(key)
+        if bucket is None:
+            bucket = totals[key] = {'files': 0, 'bytes': 0, 'lines': 0}
+        bucket['files'] += 1
+        bucket['bytes'] += size
+        bucket['lines'] += lines
+
+    for entry in index.files:
+        relative = index.relative(entry['path'])
+        top = relative.split(os.sep, 1)[0] if os.sep in relative else ROOT_BUCKET
+        add(languages, entry['language'], entry['size'], entry['lines'])
+        add(structure, top, entry['size'], entry['lines'])
+        stats['file_count'] += 1
+        stats['total_bytes'] += entry['size']
+        stats['total_lines'] += entry['lines']
+
+    stats['languages'] = dict(sorted(languages.items(), key=lambda item: item[1]['files'], reverse=True))
+    stats['file_types'] = {language: totals['files'] for language, totals in stats['languages'].items()}
+    stats['structure'] = dict(sorted(structure.items()))
+    stats['skipped'] = dict(index.skipped)
+    stats['component_summary'] = summarize_repo_stats(stats)
+    return stats
+
+
+def summarize_repo_stats(stats: Dict[str, Any]) -> str:
+    """One-sentence summary of compute_repo_stats results."""
+    if not stats['file_count']:
+        return "The repository contains no files."
+    code = {k: v for k, v in stats['languages'].items() if k != OTHER_LANGUAGE}
+    main_language: Optional[str] = max(code, key=lambda k: code[k]['lines']) if code else None
+    summary = (f"{stats['file_count']:,} files in {stats['folder_count']:,} folders "
+               f"({stats['total_lines']:,} lines, {stats['total_bytes']:,} bytes)")
+    if main_language:
+        share = code[main_language]['lines'] * 100 // max(stats['total_lines'], 1)
+        summary += f"; mostly {main_language} ({share}% of lines)"
+    if stats.get('skipped'):
+        summary += f"; {len(stats['skipped'])} vendored directories skipped"
+    return summary + "."
@@ -0,0 +1,122 @@
+"""
+Repository Walker Utilities.
+
+Walks a checked-out repository with `os.scandir` and yields folder/file
+records in batches for repo_mapper to spawn in bulk:
+- Iterative (a work queue, not recursion), so deep trees cannot hit
+  the recursion limit
+- Reuses each DirEntry's cached type information instead of calling
+  isdir()/isfile() on every path
+- Scans directories concurrently on a thread pool, which hides the
+  per-directory latency of network and overlay filesystems
+- Skips what the shared IgnoreMatcher ignores (built-in sets and the
+  repository's .gitignore files) and prunes vendored trees
+  (virtualenvs, site-packages, ...), reporting what it skipped
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Tuple, Optional
+
+from utils.file_tree import vendored_dir_reason
+from utils.ignore_matcher import IgnoreMatcher
+
+# --- Constants ---
+
+# Records yielded per batch
+DEFAULT_BATCH_SIZE = 512
+
+# Directories scanned concurrently
+DEFAULT_MAX_WORKERS = 8
+
+
+# --- Directory Scanning ---
+
+def _scan_directory(dir_path: str, matcher: IgnoreMatcher) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, str]]:
+    """
+    List one directory.
+
+    Returns:
+        (records, subdirectories, skipped): folder/file records for the
+        entries (sorted by name), the folder paths still to be scanned,
+        and {path: reason} for vendored folders that were pruned.
+    """
+    records = []
+    subdirs = []
+    skipped = {}
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                try:
+                    # Symlinked directories are not followed, so link
+                    # cycles cannot make the walk run forever
+                    if entry.is_dir(follow_symlinks=False):
+                        if matcher.is_ignored(entry.path, True):
+                            continue
+                        reason = vendored_dir_reason(entry.path, entry.name)
+                        if reason:
+                            skipped[entry.path] = reason
+                            continue
+                        records.append({'kind': 'folder', 'name': entry.name, 'path': entry.path, 'parent': dir_path})
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        if matcher.is_ignored(entry.path, False):
+                            continue
+                        st = entry.stat()
+                        records.append({
+                            'kind': 'file', 'name': entry.name, 'path': entry.path, 'parent': dir_path,
+                            'extension': Path(entry.name).suffix, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns
+                        })
+                except OSError as e:
+                    print(f"  ! Warning: Could not read entry {entry.path}. Error: {e}")
+    except OSError as e:
+        print(f"  ! Warning: Could not map directory {dir_path}. Error: {e}")
+    return records, subdirs, skipped
+
+
+def iter_repo_batches(root_path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                      max_workers: int = DEFAULT_MAX_WORKERS,
+                      skipped: Optional[Dict[str, str]] = None,
+                      matcher: Optional[IgnoreMatcher] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Walk a repository and yield its folders and files in batches.
+
+    A folder's record is always yielded before the records of anything
+    inside it, so a consumer can spawn each record under an already
+    spawned parent.
+
+    Args:
+        root_path: Directory to walk (the repository checkout).
+        batch_size: Maximum records per batch.
+        max_workers: Directories scanned concurrently.
+        skipped: If given, filled with {path: reason} for every vendored
+            tree that was pruned (see file_tree.vendored_dir_reason).
+        matcher: Ignore rules to apply; defaults to an IgnoreMatcher for
+            root_path (built-in sets plus the repository's .gitignore).
+
+    Yields:
+        Lists of records: {'kind': 'folder' | 'file', 'name', 'path',
+        'parent'} plus 'extension', 'size' (bytes) and 'mtime_ns' for files.
+        'parent' is the path of the containing directory (root_path for
+        top-level entries).
+    """
+    if matcher is None:
+        matcher = IgnoreMatcher(root_path)
+    batch: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, root_path, matcher)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                records, subdirs, pruned = future.result()
+                if skipped is not None:
+                    skipped.update(pruned)
+                for subdir in subdirs:
+                    pending.add(executor.submit(_scan_directory, subdir, matcher))
+                batch.extend(records)
+                while len(batch) >= batch_size:
+                    yield batch[:batch_size]
+                    batch = batch[batch_size:]
+    if batch:
+        yield batch